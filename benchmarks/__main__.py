@@ -0,0 +1,101 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _suites() -> Dict[str, Callable[[bool], Dict[str, Any]]]:
+    from benchmarks import chunk_overhead, pipeline, schedule, startup, stores
+
+    return {
+        "pipeline": pipeline.run,
+        "chunks": lambda quick: chunk_overhead.run(20_000 if quick else 100_000, 5 if quick else 15),
+        "stores": stores.run,
+        "schedule": schedule.run,
+        "startup": startup.run,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return completed.stdout.strip()
+    except Exception:
+        return ""
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix] = float(data)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    new = _flatten(current.get("results") or {})
+    old = _flatten(baseline.get("results") or {})
+    diff: Dict[str, Dict[str, float]] = {}
+    for key in sorted(new.keys() & old.keys()):
+        if old[key] == 0:
+            continue
+        diff[key] = {"baseline": old[key], "current": new[key], "ratio": round(new[key] / old[key], 3)}
+    return diff
+
+
+def main() -> None:
+    suites = _suites()
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Бенчмарки конвейера чата")
+    parser.add_argument("--only", nargs="+", choices=sorted(suites.keys()), help="Запустить только указанные наборы")
+    parser.add_argument("--quick", action="store_true", help="Уменьшенные размеры для быстрой проверки")
+    parser.add_argument("--output", help="Путь для сохранения JSON с результатами")
+    parser.add_argument("--compare", help="JSON предыдущего запуска для сравнения")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "quick": bool(args.quick),
+        },
+        "results": {},
+    }
+
+    for name in args.only or list(suites.keys()):
+        print(f"[benchmarks] {name}...", file=sys.stderr)
+        report["results"][name] = suites[name](args.quick)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["comparison"] = {
+            "baseline_commit": (baseline.get("meta") or {}).get("commit", ""),
+            "metrics": compare(report, baseline),
+        }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
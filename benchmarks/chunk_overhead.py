@@ -0,0 +1,145 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from core.general.agent.ToolCallAccumulator import ToolCallAccumulator
+from core.providers import OpenAIProvider
+from core.types.ai import AIChunk
+
+
+def build_events(count: int, tool_every: int = 50) -> List[Any]:
+    events: List[Any] = []
+    for i in range(count):
+        if tool_every and i % tool_every == tool_every - 1:
+            events.append(
+                SimpleNamespace(
+                    type="response.function_call_arguments.delta",
+                    delta='{"q": ',
+                    output_index=1,
+                    item_id="fc_1",
+                )
+            )
+        else:
+            events.append(SimpleNamespace(type="response.output_text.delta", delta="токен "))
+    return events
+
+
+def build_legacy_chunk(event: Any) -> Dict[str, Any]:
+    _get_field = OpenAIProvider._get_field
+    event_type = _get_field(event, "type") or ""
+
+    chunk: Dict[str, Any] = {"event": event, "event_type": str(event_type)}
+    if event_type == "response.output_text.delta":
+        delta = _get_field(event, "delta")
+        if isinstance(delta, str) and delta:
+            chunk["ai_content_part"] = delta
+    elif event_type == "response.function_call_arguments.delta":
+        delta = _get_field(event, "delta")
+        if isinstance(delta, str) and delta:
+            chunk["tool_call_arguments_delta"] = delta
+        output_index = _get_field(event, "output_index")
+        if isinstance(output_index, int):
+            chunk["tool_call_index"] = output_index
+        item_id = _get_field(event, "item_id")
+        if isinstance(item_id, str) and item_id:
+            chunk["tool_call_id"] = item_id
+    return chunk
+
+
+def accumulate_legacy(tool_calls_acc: Dict[int, Dict[str, Any]], chunk: Dict[str, Any]) -> None:
+    tool_call = chunk.get("tool_call")
+    tool_call_index = chunk.get("tool_call_index")
+    if isinstance(tool_call_index, int) and isinstance(tool_call, dict):
+        tool_calls_acc.setdefault(tool_call_index, dict(tool_call))
+
+    delta = chunk.get("tool_call_arguments_delta")
+    if isinstance(delta, str) and delta:
+        idx = chunk.get("tool_call_index")
+        if isinstance(idx, int):
+            current = tool_calls_acc.setdefault(idx, {"index": idx, "arguments": ""})
+            current["arguments"] = (current.get("arguments") or "") + delta
+
+    done_args = chunk.get("tool_call_arguments")
+    if isinstance(done_args, str):
+        idx = chunk.get("tool_call_index")
+        if isinstance(idx, int):
+            tool_calls_acc.setdefault(idx, {"index": idx})["arguments"] = done_args
+
+
+def consume_legacy(chunk: Dict[str, Any], parts: List[str], tool_calls_acc: Dict[int, Dict[str, Any]]) -> None:
+    if chunk.get("ai_content_part"):
+        parts.append(str(chunk.get("ai_content_part") or ""))
+    accumulate_legacy(tool_calls_acc, chunk)
+
+
+def consume_slotted(chunk: AIChunk, parts: List[str], tool_calls_acc: ToolCallAccumulator) -> None:
+    if chunk.kind == AIChunk.KIND_CONTENT:
+        if chunk.ai_content_part:
+            parts.append(chunk.ai_content_part)
+        return
+    if chunk.kind not in AIChunk.TOOL_CALL_KINDS:
+        return
+    tool_calls_acc.feed(chunk)
+
+
+def measure_time(events: List[Any], build: Callable[[Any], Any], consume: Callable[..., None], accumulator: Callable[[], Any]) -> float:
+    parts: List[str] = []
+    tool_calls_acc = accumulator()
+    started = time.perf_counter()
+    for event in events:
+        chunk = build(event)
+        consume(chunk, parts, tool_calls_acc)
+    return (time.perf_counter() - started) / len(events) * 1e9
+
+
+def measure_memory(events: List[Any], build: Callable[[Any], Any]) -> float:
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    chunks = [build(event) for event in events]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del chunks
+    return retained / len(events)
+
+
+def run(count: int = 100_000, rounds: int = 15) -> Dict[str, Any]:
+    events = build_events(count)
+
+    variants = {
+        "dict": (build_legacy_chunk, consume_legacy, dict),
+        "slotted": (OpenAIProvider._build_chunk, consume_slotted, ToolCallAccumulator),
+        "slotted_raw": (lambda event: OpenAIProvider._build_chunk(event, True), consume_slotted, ToolCallAccumulator),
+    }
+
+    best = {name: float("inf") for name in variants}
+    for _ in range(rounds):
+        for name, (build, consume, accumulator) in variants.items():
+            best[name] = min(best[name], measure_time(events, build, consume, accumulator))
+
+    results: Dict[str, Any] = {"chunks": count, "rounds": rounds}
+    for name, (build, _, _) in variants.items():
+        results[name] = {
+            "ns_per_chunk": round(best[name], 1),
+            "bytes_per_chunk": round(measure_memory(events, build), 1),
+        }
+
+    results["speedup"] = round(results["dict"]["ns_per_chunk"] / results["slotted"]["ns_per_chunk"], 2)
+    results["memory_ratio"] = round(results["slotted"]["bytes_per_chunk"] / results["dict"]["bytes_per_chunk"], 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Накладные расходы на чанк потока: dict против __slots__")
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=15)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.chunks, args.rounds), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import statistics
+import time
+
+from typing import Any, Callable, Dict, List
+
+
+def time_call(fn: Callable[[], Any], rounds: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize_ms(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[p95_index] * 1000, 4),
+    }
@@ -0,0 +1,102 @@
+from typing import Any, Dict, Generator, List
+
+from openai.types.responses import ResponseInputParam
+
+from core.general.agent.ToolBuilder import ToolBuilder
+from core.interfaces import ITool
+from core.providers import AsyncBaseAIProvider, BaseAIProvider
+from core.types.ai import AIChunk
+
+
+class ScriptedProvider(BaseAIProvider):
+    REQUIRES_API_KEY = False
+    REQUIRES_API_BASE = False
+
+    def __init__(self):
+        self.script: List[List[Dict[str, Any]]] = []
+        self._position = 0
+        super().__init__(api_key='', api_base='')
+
+    def provider_setup(self):
+        self.client = self
+
+    def set_script(self, turns: List[List[Dict[str, Any]]]):
+        self.script = turns
+        self._position = 0
+        return self
+
+    def _next_turn(self) -> List[Dict[str, Any]]:
+        turn = self.script[self._position % len(self.script)]
+        self._position += 1
+        return turn
+
+    def generate_response(self, messages: ResponseInputParam, **kwargs) -> Generator[AIChunk, None, None]:
+        for record in self._next_turn():
+            yield AIChunk.from_record(record)
+
+    def add_tool_result_message(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        tool_name: str,
+        tool_call: dict[str, Any],
+        output: str,
+    ) -> None:
+        messages.append({"role": "tool", "tool_name": tool_name, "content": output})
+
+
+class AsyncScriptedProvider(AsyncBaseAIProvider, ScriptedProvider):
+
+    async def generate_response(self, messages: ResponseInputParam, **kwargs): # type: ignore[override]
+        for record in self._next_turn():
+            yield AIChunk.from_record(record)
+
+
+def text_turn(tokens: int, token: str = "токен ") -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = [
+        {"kind": AIChunk.KIND_CONTENT, "event_type": "response.output_text.delta", "ai_content_part": token}
+        for _ in range(tokens)
+    ]
+    records.append({"kind": AIChunk.KIND_DONE, "event_type": "response.completed"})
+    return records
+
+
+def tool_turn(tool_names: List[str]) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    for index, name in enumerate(tool_names):
+        records.append({
+            "kind": AIChunk.KIND_TOOL_CALL,
+            "event_type": "response.output_item.added",
+            "tool_call_index": index,
+            "tool_call": {"type": "function_call", "id": f"fc_{index}", "call_id": f"call_{index}", "name": name, "arguments": ""},
+        })
+        records.append({
+            "kind": AIChunk.KIND_TOOL_ARGUMENTS,
+            "event_type": "response.function_call_arguments.done",
+            "tool_call_index": index,
+            "tool_call_arguments": '{"value": %d}' % index,
+        })
+    records.append({"kind": AIChunk.KIND_DONE, "event_type": "response.completed"})
+    return records
+
+
+class StubTool(ITool):
+    name = "Benchmark Stub Tools Pack"
+
+    @staticmethod
+    def echo_handler(value: Any = None, **kwargs) -> Dict[str, Any]:
+        return {"echo": value}
+
+
+StubTool.commands = [
+    {
+        "name": "echo_tool",
+        "handler": StubTool.echo_handler,
+        "tool": ToolBuilder()
+            .set_name("echo_tool")
+            .set_description("Returns its argument")
+            .add_property("value", "integer", description="Value to echo")
+            .set_read_only()
+            .set_keywords(["echo"])
+    },
+]
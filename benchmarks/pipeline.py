@@ -0,0 +1,85 @@
+import asyncio
+import statistics
+import time
+
+from typing import Any, Dict, List
+
+from benchmarks.common import summarize_ms, time_call
+from benchmarks.fakes import AsyncScriptedProvider, ScriptedProvider, StubTool, text_turn, tool_turn
+from core.general.agent.Assistant import Assistant
+from core.general.agent.AsyncAssistant import AsyncAssistant
+
+
+def build_assistant(script: List[List[Dict[str, Any]]]) -> Assistant:
+    assistant = Assistant().with_tools([StubTool])
+    assistant.providers["scripted"] = ("ScriptedProvider", ScriptedProvider, 'flat')  # type: ignore[index]
+    assistant.with_provider("scripted")  # type: ignore[arg-type]
+    assistant.provider.set_script(script)
+    return assistant
+
+
+def build_async_assistant(script: List[List[Dict[str, Any]]]) -> AsyncAssistant:
+    assistant = AsyncAssistant().with_tools([StubTool])
+    assistant.providers["scripted"] = ("AsyncScriptedProvider", AsyncScriptedProvider, 'flat')  # type: ignore[index]
+    assistant.with_provider("scripted")  # type: ignore[arg-type]
+    assistant.provider.set_script(script)
+    return assistant
+
+
+def consume(assistant: Assistant) -> int:
+    count = 0
+    for _ in assistant.generate_response(user_text="benchmark echo"):
+        count += 1
+    return count
+
+
+async def aconsume(assistant: AsyncAssistant) -> int:
+    count = 0
+    async for _ in assistant.generate_response(user_text="benchmark echo"):
+        count += 1
+    return count
+
+
+def bench_tokens_per_second(tokens: int, rounds: int) -> Dict[str, Any]:
+    assistant = build_assistant([text_turn(tokens)])
+    samples = time_call(lambda: consume(assistant), rounds)
+
+    async_assistant = build_async_assistant([text_turn(tokens)])
+    async_samples = time_call(lambda: asyncio.run(aconsume(async_assistant)), rounds)
+
+    return {
+        "tokens": tokens,
+        "tokens_per_second": round(tokens / min(samples), 1),
+        "async_tokens_per_second": round(tokens / min(async_samples), 1),
+        **summarize_ms(samples),
+    }
+
+
+def bench_tool_round_trip(iterations: int, tools_per_turn: int) -> Dict[str, Any]:
+    baseline = build_assistant([text_turn(1)])
+    with_tools = build_assistant([tool_turn(["echo_tool"] * tools_per_turn), text_turn(1)])
+    with_tools.with_tool_cache(None)
+
+    baseline_samples = time_call(lambda: consume(baseline), iterations)
+    tool_samples = time_call(lambda: consume(with_tools), iterations)
+
+    overhead = statistics.median(tool_samples) - statistics.median(baseline_samples)
+    return {
+        "iterations": iterations,
+        "tools_per_turn": tools_per_turn,
+        "baseline": summarize_ms(baseline_samples),
+        "with_tools": summarize_ms(tool_samples),
+        "overhead_per_round_trip_ms": round(overhead * 1000, 4),
+        "overhead_per_tool_ms": round(overhead * 1000 / tools_per_turn, 4),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results = {
+        "tokens_per_second": bench_tokens_per_second(2_000 if quick else 20_000, 3 if quick else 5),
+        "tool_round_trip": bench_tool_round_trip(20 if quick else 200, 1),
+        "tool_round_trip_parallel": bench_tool_round_trip(20 if quick else 200, 4),
+    }
+    results["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return results
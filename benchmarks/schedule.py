@@ -0,0 +1,69 @@
+import tempfile
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.common import summarize_ms, time_call
+from core.general.agent.services import MIREAScheduleService
+from core.stores import CacheStore
+
+
+def build_calendar(weekly_events: int, single_events: int, start: datetime) -> str:
+    lines: List[str] = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//benchmark//RU"]
+    until = (start + timedelta(days=200)).strftime("%Y%m%dT000000Z")
+
+    for i in range(weekly_events):
+        day = start + timedelta(days=i % 6, hours=9 + (i % 5) * 2)
+        excluded = day + timedelta(weeks=3)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:weekly-{i}@benchmark",
+            f"SUMMARY:ПР Дисциплина {i}",
+            f"DTSTART;TZID=Europe/Moscow:{day.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND;TZID=Europe/Moscow:{(day + timedelta(minutes=90)).strftime('%Y%m%dT%H%M%S')}",
+            f"RRULE:FREQ=WEEKLY;INTERVAL={1 + i % 2};UNTIL={until}",
+            f"EXDATE;TZID=Europe/Moscow:{excluded.strftime('%Y%m%dT%H%M%S')}",
+            f"LOCATION:А-{100 + i}",
+            "DESCRIPTION:Преподаватель Иванов И.И.",
+            "END:VEVENT",
+        ]
+
+    for i in range(single_events):
+        day = start + timedelta(days=i % 180, hours=10)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:single-{i}@benchmark",
+            f"SUMMARY:Консультация {i}",
+            f"DTSTART;TZID=Europe/Moscow:{day.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND;TZID=Europe/Moscow:{(day + timedelta(hours=1)).strftime('%Y%m%dT%H%M%S')}",
+            "END:VEVENT",
+        ]
+
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines)
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    weekly, single = (40, 100) if quick else (200, 500)
+    calendar = build_calendar(weekly, single, start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = MIREAScheduleService(cache=CacheStore(str(Path(tmp) / "cache.json")))
+        end = start + timedelta(days=180)
+        events: List[Any] = []
+        samples = time_call(lambda: events.append(len(service._parse_ical_events(calendar, start, end))), 3 if quick else 5)
+        index = service._build_index(calendar)
+        days = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(30)]
+        lookups = time_call(lambda: [service._select_days(index, day, day) for day in days], 20 if quick else 100)
+
+    return {
+        "weekly_events": weekly,
+        "single_events": single,
+        "calendar_bytes": len(calendar.encode("utf-8")),
+        "occurrences": events[-1] if events else 0,
+        "indexed_days": len(index["days"]),
+        **summarize_ms(samples),
+        "lookup_30_days": summarize_ms(lookups),
+    }
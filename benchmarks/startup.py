@@ -0,0 +1,60 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+IGNORED_PACKAGES = {"core", "site", "encodings"}
+
+TARGETS = {
+    "assistant": "import core.general.agent.Assistant",
+    "bootstrap": "import core.bootstrap",
+}
+
+
+def measure_import(statement: str, runs: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True, capture_output=True)
+        samples.append(time.perf_counter() - started)
+
+    return {
+        "min_ms": round(min(samples) * 1000, 2),
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "top_imports_ms": top_imports(statement),
+    }
+
+
+def top_imports(statement: str, limit: int = 8) -> Dict[str, float]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    by_package: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        package = fields[2].strip().split(".")[0]
+        if package in IGNORED_PACKAGES:
+            continue
+        by_package[package] = max(by_package.get(package, 0.0), int(fields[1]) / 1000)
+
+    ordered = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return {name: round(ms, 2) for name, ms in ordered}
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    runs = 3 if quick else 7
+    return {name: measure_import(statement, runs) for name, statement in TARGETS.items()}
@@ -0,0 +1,55 @@
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Dict
+
+from benchmarks.common import summarize_ms, time_call
+from core.stores import CacheStore, DialogStore
+
+
+def build_dialog(turns: int) -> tuple[DialogStore, str]:
+    store = DialogStore()
+    dialog_id = store.create_dialog(title="benchmark", make_active=True)["id"]
+    store.append_entry(dialog_id, store.make_entry(role="system", content="Системный промпт"), build_to_llm=True)
+    for i in range(turns):
+        store.append_entry(dialog_id, store.make_entry(role="user", content=f"Вопрос номер {i}"), build_to_llm=True)
+        store.append_entry(dialog_id, store.make_entry(role="assistant", content=f"Ответ номер {i} " * 20), build_to_llm=True)
+    return store, dialog_id
+
+
+def bench_build_llm_messages(rounds: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for turns in (10, 100, 1000):
+        store, dialog_id = build_dialog(turns)
+        samples = time_call(lambda: store.build_llm_messages(dialog_id), rounds)
+        results[str(turns)] = summarize_ms(samples)
+    return results
+
+
+def bench_cache_set(sizes: tuple[int, ...], writes: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    payload = {"title": "значение", "items": list(range(20))}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache.json"
+            store = CacheStore(str(path))
+            for i in range(size):
+                store.set_with_ttl(f"bench::{i}", payload, 3600)
+
+            samples = []
+            for i in range(writes):
+                started = time.perf_counter()
+                store.set_with_ttl(f"bench::{i % max(1, size)}", payload, 3600)
+                samples.append(time.perf_counter() - started)
+
+            file_bytes = sum(p.stat().st_size for p in Path(tmp).rglob("*") if p.is_file())
+            results[str(size)] = {"entries": size, "file_bytes": file_bytes, **summarize_ms(samples)}
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    return {
+        "dialog_build_llm_messages": bench_build_llm_messages(20 if quick else 200),
+        "cache_set": bench_cache_set((10, 100, 1000) if quick else (10, 100, 1000, 3000), 20 if quick else 100),
+    }
@@ -1,5 +1,5 @@
-from core.commands import SkillsInfoCommand
-from core.general.agent.Assistant import Assistant
+from core.commands import ContextInfoCommand, DialogSearchCommand, SkillsInfoCommand
+from core.general.agent.AsyncAssistant import AsyncAssistant
 
 from core.general.agent.tools import (
     SystemManagementTool,
@@ -7,22 +7,26 @@ from core.general.agent.tools import (
     MIREAScheduleTool,
     TelegramTool,
     WebSearchTool,
-    RulesHelperTool
+    RulesHelperTool,
+    DialogSearchTool
 )
 
 
 assistant = (
-    Assistant()
+    AsyncAssistant()
     .with_tools([
         SystemManagementTool,
         DockerTool,
         MIREAScheduleTool,
         TelegramTool,
         WebSearchTool,
-        RulesHelperTool
+        RulesHelperTool,
+        DialogSearchTool
     ])
     .with_commands({
         "skills": SkillsInfoCommand(),
+        "context": ContextInfoCommand(),
+        "search": DialogSearchCommand(),
     })
     .with_provider('ollama')
     .with_model('gpt-oss:20b')
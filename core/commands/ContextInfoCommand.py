@@ -0,0 +1,26 @@
+from typing import Any
+
+from core.interfaces import ICommand
+
+
+class ContextInfoCommand(ICommand):
+    description = "Размер контекста диалога и бюджет токенов"
+
+    def execute(self, *, app: Any, assistant: Any, dialog_id: str, args: str):
+        context = app._store.build_context(
+            dialog_id,
+            provider=assistant.provider_id,
+            model=assistant.provider.model_name,
+        )
+        budget = f"{context.budget}" if context.budget > 0 else "без ограничений"
+        lines = [
+            f"**Контекст:** ~{context.tokens} токенов, сообщений: {len(context.messages)}",
+            f"**Бюджет:** {budget}",
+        ]
+        if context.trimmed:
+            lines.append(
+                f"**Отброшено:** ~{context.dropped_tokens} токенов ({context.dropped_messages} сообщений)"
+            )
+        if context.summary_tokens:
+            lines.append(f"**Краткое содержание:** ~{context.summary_tokens} токенов")
+        return "\n\n".join(lines)
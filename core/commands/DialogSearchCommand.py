@@ -0,0 +1,27 @@
+from typing import Any
+
+from core.interfaces import ICommand
+
+
+class DialogSearchCommand(ICommand):
+    description = "Поиск по сохранённым диалогам"
+
+    ROLE_LABELS = {"user": "Вы", "assistant": "Ассистент"}
+    LIMIT = 10
+
+    def execute(self, *, app: Any, assistant: Any, dialog_id: str, args: str):
+        query = (args or "").strip()
+        if not query:
+            return "Укажите запрос: **@search** <текст>"
+
+        hits = app._store.search(query, limit=self.LIMIT)
+        if not hits:
+            return f"По запросу «{query}» ничего не найдено"
+
+        lines = [f"**Найдено по запросу «{query}»:** {len(hits)}"]
+        for i, hit in enumerate(hits, start=1):
+            meta = " · ".join(
+                part for part in (hit.dialog_title, self.ROLE_LABELS.get(hit.role, hit.role), hit.timestamp) if part
+            )
+            lines.append(f"{i}. **{meta}** — {hit.snippet}")
+        return "\n\n".join(lines)
@@ -1,5 +1,9 @@
 from core.commands.SkillsInfoCommand import SkillsInfoCommand
+from core.commands.ContextInfoCommand import ContextInfoCommand
+from core.commands.DialogSearchCommand import DialogSearchCommand
 
 __all__ = [
     "SkillsInfoCommand",
+    "ContextInfoCommand",
+    "DialogSearchCommand",
 ]
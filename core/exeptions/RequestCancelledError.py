@@ -0,0 +1,5 @@
+class RequestCancelledError(Exception):
+    
+    def __init__(self, url: str):
+        self.message = f"Запрос к {url} был отменён"
+        super().__init__(self.message)
@@ -1,9 +1,11 @@
 from core.exeptions.NoClientError import NoClientError
 from core.exeptions.NoModelError import NoModelError
 from core.exeptions.NoPortError import NoPortError
+from core.exeptions.RequestCancelledError import RequestCancelledError
 
 __all__ = [
     "NoClientError",
     "NoModelError",
     "NoPortError",
+    "RequestCancelledError",
 ]
\ No newline at end of file
@@ -14,11 +14,69 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_SECRET_TOKEN", '')
     OPENAI_API_BASE = os.getenv("OPENAI_BASE_HOST", 'https://openrouter.ai/api/v1')
 
+    OPENAI_CONTINUATION = os.getenv("OPENAI_CONTINUATION", "false").lower() in {"1", "true", "yes"}
+
     OLLAMA_API_KEY = os.getenv("OLLAMA_SECRET_TOKEN", '')
     OLLAMA_API_BASE = os.getenv("OLLAMA_BASE_HOST", 'https://ollama.com')
     
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", '')
     TELEGRAM_USER_ID = os.getenv("TELEGRAM_USER_ID", '')
 
+    PROVIDERS_KEEP_RAW_EVENTS = os.getenv("PROVIDERS_KEEP_RAW_EVENTS", "false").lower() in {"1", "true", "yes"}
+    PROVIDERS_RECORD_PATH = os.getenv("PROVIDERS_RECORD_PATH", '')
+
+    REPLAY_PATH = os.getenv("REPLAY_PATH", 'data/replay/session.jsonl')
+    REPLAY_REALTIME = os.getenv("REPLAY_REALTIME", "false").lower() in {"1", "true", "yes"}
+
+    # ----------------- TRACING SETTINGS -------------------
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in {"1", "true", "yes"}
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "jsonl").lower()
+    TRACING_PATH = os.getenv("TRACING_PATH", "data/traces/spans.jsonl")
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "charlie")
+
+    # ------------------ TOOLS SETTINGS --------------------
+    TOOLS_MAX_WORKERS = int(os.getenv("TOOLS_MAX_WORKERS", "4"))
+    TOOLS_DEFAULT_TIMEOUT = os.getenv("TOOLS_DEFAULT_TIMEOUT", "2m")
+    TOOLS_ISOLATED_WORKERS = int(os.getenv("TOOLS_ISOLATED_WORKERS", "1"))
+    TOOLS_PROGRESS_INTERVAL = float(os.getenv("TOOLS_PROGRESS_INTERVAL", "0.5"))
+    TOOLS_SPECULATIVE = os.getenv("TOOLS_SPECULATIVE", "false").lower() in {"1", "true", "yes"}
+    TOOLS_CACHE_MAX_ENTRIES = int(os.getenv("TOOLS_CACHE_MAX_ENTRIES", "256"))
+    TOOLS_CACHE_SPILL = os.getenv("TOOLS_CACHE_SPILL", "false").lower() in {"1", "true", "yes"}
+    TOOLS_ROUTING = os.getenv("TOOLS_ROUTING", "true").lower() in {"1", "true", "yes"}
+    TOOLS_ROUTING_ALWAYS_INCLUDE = [
+        name.strip()
+        for name in os.getenv("TOOLS_ROUTING_ALWAYS_INCLUDE", "get_time_tool,get_charlie_tools_guide_tool").split(",")
+        if name.strip()
+    ]
+    TOOLS_ROUTING_RECENT_TURNS = int(os.getenv("TOOLS_ROUTING_RECENT_TURNS", "3"))
+
+    # ------------------ CONTEXT SETTINGS ------------------
+    CONTEXT_DEFAULT_BUDGET = int(os.getenv("CONTEXT_DEFAULT_BUDGET", "32000"))
+    CONTEXT_BUDGETS = {
+        key.strip().lower(): int(value)
+        for key, _, value in (
+            item.partition("=") for item in os.getenv("CONTEXT_BUDGETS", "ollama=8000").split(",")
+        )
+        if key.strip() and value.strip().isdigit()
+    }
+    CONTEXT_KEEP_RECENT = int(os.getenv("CONTEXT_KEEP_RECENT", "6"))
+    CONTEXT_STRATEGY = os.getenv("CONTEXT_STRATEGY", "summarize").lower()
+    CONTEXT_SUMMARY_RATIO = float(os.getenv("CONTEXT_SUMMARY_RATIO", "0.1"))
+
+    # ---------------- DIALOG STORE SETTINGS ---------------
+    DIALOG_STORE = os.getenv("DIALOG_STORE", "memory").lower()
+    DIALOG_STORE_PATH = os.getenv("DIALOG_STORE_PATH", "data/dialogs/dialogs.sqlite3")
+    DIALOG_STORE_PAGE_SIZE = int(os.getenv("DIALOG_STORE_PAGE_SIZE", "200"))
+
     # ------------------ CACHE SETTINGS --------------------
-    CACHE_TTL_SCHEDULE = os.getenv("CACHE_TTL_SCHEDULE", '6h')
\ No newline at end of file
+    CACHE_TTL_SCHEDULE = os.getenv("CACHE_TTL_SCHEDULE", '6h')
+    CACHE_STALE_SCHEDULE = os.getenv("CACHE_STALE_SCHEDULE", '3d')
+    CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "2"))
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "log").lower()
+    CACHE_PATH = os.getenv("CACHE_PATH", "data/cache/cache.log")
+    CACHE_COMPACT_RATIO = float(os.getenv("CACHE_COMPACT_RATIO", "0.5"))
+    CACHE_FSYNC = os.getenv("CACHE_FSYNC", "false").lower() in {"1", "true", "yes"}
+    CACHE_MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "512"))
+    CACHE_MEMORY_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(16 * 1024 * 1024)))
+    CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib").lower()
+    CACHE_COMPRESS_THRESHOLD = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "16384"))
\ No newline at end of file
@@ -1,18 +1,33 @@
+import itertools
 import json
-
 import time
 
-from typing import Any, Callable, Dict, Generator, List, Type, cast
+from concurrent.futures import Future
+from typing import Any, Callable, ContextManager, Dict, Generator, List, Type, cast
 
 from openai.types.responses import ResponseInputParam 
 
-from core.providers import OpenAIProvider, OllamaAIProvider
+from core.general import Config
+from core.general.tracing import Span, Tracer, get_tracer
+from core.general.agent.ToolCallAccumulator import ToolCallAccumulator
+from core.general.agent.ToolExecutor import ToolEvent, ToolExecutor, ToolInvocation, ToolOutcome
+from core.general.agent.ToolResultCache import ToolResultCache
+from core.general.agent.ToolRegistry import ToolRegistry
+from core.general.agent.ToolRouter import ToolRouter
+from core.stores import CacheStore
+from core.utils.time import parse_time_from_string
+from core.providers import OpenAIProvider, OllamaAIProvider, ReplayProvider
 from core.types.ai import (
+    AIChunk,
     AIResponseChunk,
     AIRequest,
     ToolClassProtocol,
     ToolObject,
     FlatToolObject,
+    ToolOptions,
+    ToolSet,
+    ToolSpec,
+    ResponseChain,
     AllowedAIToolTypes,
     AIProviders
 )
@@ -22,22 +37,50 @@ from core.types.ai.AIAssistant import AllowedAIProviders
 from core.interfaces import ICommand
 
 class Assistant:
+    TOKEN_KINDS = AIChunk.TOOL_CALL_KINDS | {AIChunk.KIND_CONTENT}
+
     def __init__(self) -> None:
         self.providers: AIProviders = {
             'openrouter': ("OpenAIProvider", OpenAIProvider, 'flat'),
             'ollama': ("OllamaAIProvider", OllamaAIProvider, 'normal'),
+            'replay': ("ReplayProvider", ReplayProvider, 'normal'),
         }
 
         self.request_params: AIRequest = {
             "stream": True,
         }
 
+        self.provider_id: str = ""
+
         self.tools: List[ToolObject | FlatToolObject] = []
 
         self.commands: Dict[str, ICommand] = {}
 
         self.tools_classes: List[Type[ToolClassProtocol]] = []
         self._tool_handlers: Dict[str, Callable[..., Any]] = {}
+        self._tool_options: Dict[str, ToolOptions] = {}
+        self._tool_specs: Dict[str, ToolSpec] = {}
+        self._tool_registry = ToolRegistry()
+
+        self._tool_executor = ToolExecutor(
+            max_workers=Config.TOOLS_MAX_WORKERS,
+            progress_interval=Config.TOOLS_PROGRESS_INTERVAL,
+            isolated_workers=Config.TOOLS_ISOLATED_WORKERS,
+        )
+        self._tool_default_timeout = parse_time_from_string(Config.TOOLS_DEFAULT_TIMEOUT)
+        self._tool_run_ids = itertools.count(1)
+        self.speculative_tools: bool = Config.TOOLS_SPECULATIVE
+        self._tool_cache: ToolResultCache | None = ToolResultCache(
+            max_entries=Config.TOOLS_CACHE_MAX_ENTRIES,
+            spill_store=CacheStore.default() if Config.TOOLS_CACHE_SPILL else None,
+        )
+        self.tracer: Tracer = get_tracer()
+        self._tool_router: ToolRouter | None = None
+        if Config.TOOLS_ROUTING:
+            self._tool_router = ToolRouter(
+                always_include=Config.TOOLS_ROUTING_ALWAYS_INCLUDE,
+                recent_turns=Config.TOOLS_ROUTING_RECENT_TURNS,
+            )
 
     def with_tools(self, tools_classes: List[Type[ToolClassProtocol]]):
         self.tools_classes = tools_classes
@@ -49,7 +92,9 @@ class Assistant:
     
     def with_provider(self, provider_id: AllowedAIProviders):
         selected_provider_meta = self.providers[provider_id]
+        self.provider_id = provider_id
         self.provider = selected_provider_meta[1]() # type: ignore
+        self.provider.set_tracer(self.tracer)
 
         self.load_tools(selected_provider_meta[2])
 
@@ -58,9 +103,50 @@ class Assistant:
     def with_model(self, model_name):
         self.provider.set_model(model_name)
         return self
+
+    def with_max_parallel_tools(self, max_workers: int):
+        self._tool_executor.shutdown()
+        self._tool_executor = ToolExecutor(
+            max_workers=max_workers,
+            progress_interval=Config.TOOLS_PROGRESS_INTERVAL,
+            isolated_workers=Config.TOOLS_ISOLATED_WORKERS,
+        )
+        return self
+
+    def with_default_tool_timeout(self, timeout: str | int):
+        self._tool_default_timeout = parse_time_from_string(timeout) if isinstance(timeout, str) else int(timeout)
+        return self
+
+    def cancel_tools(self) -> None:
+        self._tool_executor.cancel_all()
+
+    def with_speculative_tools(self, enabled: bool = True):
+        self.speculative_tools = bool(enabled)
+        return self
+
+    def with_tool_cache(self, tool_cache: ToolResultCache | None):
+        self._tool_cache = tool_cache
+        return self
+
+    def with_tool_router(self, tool_router: ToolRouter | None):
+        self._tool_router = tool_router
+        return self
+
+    def with_tracer(self, tracer: Tracer):
+        self.tracer = tracer
+        if getattr(self, "provider", None) is not None:
+            self.provider.set_tracer(tracer)
+        return self
     
-    def generate_response(self, *, messages: ResponseInputParam | None = None, user_text: str = "", **kwargs) -> Any:
-        return self._generate_with_tool_loop(messages=messages, user_text=user_text, include_tools=True, **kwargs)
+    def generate_response(
+        self,
+        *,
+        messages: ResponseInputParam | None = None,
+        user_text: str = "",
+        chain: ResponseChain | None = None,
+        **kwargs,
+    ) -> Any:
+        return self._generate_with_tool_loop(messages=messages, user_text=user_text, include_tools=True, chain=chain, **kwargs)
 
     def _generate_with_tool_loop(
         self,
@@ -68,181 +154,414 @@ class Assistant:
         messages: ResponseInputParam | None = None,
         user_text: str = "",
         include_tools: bool = True,
+        chain: ResponseChain | None = None,
         **kwargs,
     ) -> Generator[AIResponseChunk, None, None]:
 
+        chain = self._resolve_chain(chain)
+        self._tool_executor.reset_cancel()
+        with self._start_turn_span() as turn_span:
+            with self.tracer.span("assistant.build_messages") as build_span:
+                base_messages = self._build_base_messages(messages, user_text)
+                tools = self._select_tools(base_messages)
+                build_span.set_attributes(messages=len(base_messages), tools=len(tools))
+            used_tools: set[str] = set()
+
+            for iteration in itertools.count(1):
+                assistant_content_parts: List[str] = []
+                tool_calls_acc = ToolCallAccumulator()
+                speculative: Dict[int, tuple[ToolInvocation, Future]] = {}
+
+                with self.tracer.span("llm.iteration", iteration=iteration, tools=len(tools)) as iteration_span:
+                    chunks = 0
+                    awaiting_token = iteration_span.recording
+                    for chunk in self.provider.generate_response(
+                        messages=cast(Any, base_messages),
+                        **self._build_request_kwargs(include_tools, kwargs, tools, chain),
+                    ):
+                        chunk = AIChunk.coerce(chunk)
+                        chunks += 1
+                        if awaiting_token and chunk.kind in self.TOKEN_KINDS:
+                            awaiting_token = False
+                            self._mark_first_token(turn_span, iteration_span)
+                        yield chunk
+
+                        if chunk.kind == AIChunk.KIND_CONTENT:
+                            if chunk.ai_content_part:
+                                assistant_content_parts.append(chunk.ai_content_part)
+                            continue
+                        if chunk.kind not in AIChunk.TOOL_CALL_KINDS:
+                            continue
+
+                        idx = tool_calls_acc.feed(chunk)
+
+                        invocation = self._speculative_invocation(tool_calls_acc, idx, speculative)
+                        if invocation is not None and not self._tool_executor.cancel_requested:
+                            invocation.started_at = time.monotonic()
+                            speculative[invocation.index] = (
+                                invocation,
+                                self._tool_executor.submit(self._execute_cached, invocation),
+                            )
+
+                    tool_calls = self._finish_turn(base_messages, assistant_content_parts, tool_calls_acc)
+                    iteration_span.set_attributes(chunks=chunks, tool_calls=len(tool_calls))
+
+                if not tool_calls:
+                    self._record_tool_usage(used_tools)
+                    turn_span.set_attribute("iterations", iteration)
+                    break
+
+                tools = self._widen_tools(tools, tool_calls, used_tools)
+                invocations = [self._build_invocation(i, tc) for i, tc in enumerate(tool_calls)]
+                with self.tracer.span("assistant.tools", iteration=iteration, tools=len(invocations)):
+                    outcomes = yield from self._iter_tool_phase(invocations, speculative)
+                for outcome in outcomes:
+                    self._append_tool_outcome(base_messages, outcome)
+                if self._tool_executor.cancel_requested:
+                    self._stop_cancelled_turn(chain, used_tools, turn_span, iteration)
+                    break
+
+    def _resolve_chain(self, chain: ResponseChain | None) -> ResponseChain | None:
+        if not self.provider.continuation:
+            return None
+        return chain if chain is not None else ResponseChain()
+
+    def _start_turn_span(self) -> ContextManager[Span]:
+        return self.tracer.span(
+            "assistant.turn",
+            assistant=type(self).__name__,
+            provider=type(self.provider).__name__,
+            model=self.provider.model_name,
+        )
+
+    @staticmethod
+    def _mark_first_token(turn_span: Span, iteration_span: Span) -> None:
+        iteration_span.set_attribute("ttft_ms", round(iteration_span.elapsed_ms(), 3))
+        if "ttft_ms" not in turn_span.attributes:
+            turn_span.set_attribute("ttft_ms", round(turn_span.elapsed_ms(), 3))
+
+    @staticmethod
+    def _build_base_messages(messages: ResponseInputParam | None, user_text: str) -> list[dict[str, Any]]:
         if messages is not None:
-            base_messages: list[dict[str, Any]] = [
-                cast(dict[str, Any], m) for m in list(messages) if isinstance(m, dict)
-            ]
-        else:
-            base_messages = [{"role": "user", "content": user_text}]
-
-        def _emit(ev: dict) -> None:
-            yield_chunk: AIResponseChunk = {
-                "event": ev,
-                "event_type": str(ev.get("type") or "tool_event"),
-                "tool_event": ev,
-            }
-            nonlocal_yields.append(yield_chunk)
+            return [cast(dict[str, Any], m) for m in list(messages) if isinstance(m, dict)]
+        return [{"role": "user", "content": user_text}]
 
-        nonlocal_yields: List[AIResponseChunk] = []
+    def _build_request_kwargs(
+        self,
+        include_tools: bool,
+        kwargs: dict[str, Any],
+        tools: List[ToolObject | FlatToolObject] | None = None,
+        chain: ResponseChain | None = None,
+    ) -> dict[str, Any]:
+        request_kwargs: dict[str, Any] = {
+            **self.request_params,
+            **kwargs,
+        }
+        if chain is not None:
+            request_kwargs["chain"] = chain
+        if include_tools:
+            selected = self.tools if tools is None else tools
+            if selected or tools is None:
+                request_kwargs["tools"] = self._build_tool_set(selected)
+        return request_kwargs
+
+    def _build_tool_set(self, tools: List[ToolObject | FlatToolObject]) -> ToolSet | List[ToolObject | FlatToolObject]:
+        specs: List[ToolSpec] = []
+        for tool_def in tools:
+            spec = self._tool_specs.get(ToolRouter.get_tool_name(tool_def))
+            if spec is None or spec.definition is not tool_def:
+                return tools
+            specs.append(spec)
+        return self._tool_registry.build_set(specs)
+
+    def _select_tools(self, messages: list[dict[str, Any]]) -> List[ToolObject | FlatToolObject]:
+        if self._tool_router is None:
+            return self.tools
+        return self._tool_router.select(messages, self.tools, self._tool_options)
+
+    def _widen_tools(
+        self,
+        tools: List[ToolObject | FlatToolObject],
+        tool_calls: list[dict[str, Any]],
+        used_tools: set[str],
+    ) -> List[ToolObject | FlatToolObject]:
+        called = {str((tc.get("name") or "")).strip() for tc in tool_calls}
+        used_tools.update(called)
+        if tools is self.tools:
+            return tools
+
+        offered = {ToolRouter.get_tool_name(tool_def) for tool_def in tools}
+        if called - offered:
+            return self.tools
+        return tools
+
+    def _stop_cancelled_turn(self, chain: ResponseChain | None, used_tools: set[str], turn_span: Span, iteration: int) -> None:
+        if chain is not None:
+            chain.reset()
+        self._record_tool_usage(used_tools)
+        turn_span.set_attributes(iterations=iteration, cancelled=True)
+
+    def _record_tool_usage(self, used_tools: set[str]) -> None:
+        if self._tool_router is not None:
+            self._tool_router.record_usage(used_tools)
+
+    @staticmethod
+    def _build_tool_event_chunk(ev: dict) -> AIResponseChunk:
+        return AIChunk.from_tool_event(ev)
+
+    def _finish_turn(
+        self,
+        base_messages: list[dict[str, Any]],
+        assistant_content_parts: List[str],
+        tool_calls_acc: ToolCallAccumulator,
+    ) -> list[dict[str, Any]]:
+        assistant_content = "".join(assistant_content_parts)
+        tool_calls = tool_calls_acc.finish()
+
+        self.provider.add_assistant_message(
+            base_messages,
+            content=assistant_content,
+            tool_calls=tool_calls,
+        )
+        return tool_calls
+
+    def _iter_tool_phase(
+        self,
+        invocations: List[ToolInvocation],
+        speculative: Dict[int, tuple[ToolInvocation, Future]],
+    ) -> Generator[AIResponseChunk, None, List[ToolOutcome]]:
+        claimed, pending, outcomes, ready_events = self._prepare_tool_phase(invocations, speculative)
+        for event in ready_events:
+            yield self._build_tool_event_chunk(self._build_tool_lifecycle_event(event))
+
+        claimed_indices = {invocation.index for invocation, _ in claimed}
+        for event in self._tool_executor.iter_events(pending, attached=claimed):
+            yield self._handle_tool_event(event, claimed_indices, outcomes)
 
-        while True:
-            assistant_content_parts: List[str] = []
-            tool_calls_acc: Dict[int, Dict[str, Any]] = {}
+        return [outcomes[inv.index] for inv in invocations]
+
+    def _prepare_tool_phase(
+        self,
+        invocations: List[ToolInvocation],
+        speculative: Dict[int, Any],
+    ) -> tuple[List[tuple[ToolInvocation, Any]], List[ToolInvocation], Dict[int, ToolOutcome], List[ToolEvent]]:
+        claimed, remaining = self._claim_speculative(invocations, speculative)
+        outcomes, pending = self._take_cached_outcomes(remaining)
+        return claimed, pending, outcomes, self._build_ready_events(invocations, outcomes)
+
+    @staticmethod
+    def _build_ready_events(invocations: List[ToolInvocation], outcomes: Dict[int, ToolOutcome]) -> List[ToolEvent]:
+        ready_events: List[ToolEvent] = []
+        for invocation in invocations:
+            outcome = outcomes.get(invocation.index)
+            if outcome is None:
+                continue
+            invocation.started_at = time.monotonic()
+            ready_events.append(ToolEvent(kind="start", invocation=invocation, at=invocation.started_at))
+            ready_events.append(ToolEvent(kind="finish", invocation=invocation, outcome=outcome))
+        return ready_events
+
+    def _handle_tool_event(self, event: ToolEvent, claimed_indices: set[int], outcomes: Dict[int, ToolOutcome]) -> AIResponseChunk:
+        if event.outcome is not None and event.invocation.index not in claimed_indices:
+            self._store_cached_outcome(event.outcome)
+        return self._collect_tool_event(event, claimed_indices, outcomes)
+
+    def _collect_tool_event(self, event: ToolEvent, claimed_indices: set[int], outcomes: Dict[int, ToolOutcome]) -> AIResponseChunk:
+        speculative = event.invocation.index in claimed_indices
+        if event.outcome is not None:
+            outcomes[event.invocation.index] = event.outcome
+        return self._build_tool_event_chunk(self._build_tool_lifecycle_event(event, speculative=speculative))
+
+    def _speculative_invocation(
+        self,
+        tool_calls_acc: ToolCallAccumulator,
+        idx: int | None,
+        speculative: Dict[int, Any],
+    ) -> ToolInvocation | None:
+        if not self.speculative_tools or idx is None or idx in speculative:
+            return None
+        if not tool_calls_acc.is_complete(idx):
+            return None
+
+        tc = tool_calls_acc.get(idx)
+        if tc is None:
+            return None
+
+        tool_name = str((tc.get("name") or "")).strip()
+        if not (self._tool_options.get(tool_name) or {}).get("read_only"):
+            return None
+
+        try:
+            parsed = json.loads(tc.get("arguments") or "")
+        except Exception:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+
+        return self._build_invocation(idx, tc)
+
+    @staticmethod
+    def _claim_speculative(
+        invocations: List[ToolInvocation],
+        speculative: Dict[int, Any] | None,
+    ) -> tuple[List[tuple[ToolInvocation, Any]], List[ToolInvocation]]:
+        claimed: List[tuple[ToolInvocation, Any]] = []
+        remaining: List[ToolInvocation] = []
+        for invocation in invocations:
+            started = (speculative or {}).get(invocation.tool_call.get("index"))
+            if started is not None:
+                started_invocation, pending_result = started
+                if (
+                    started_invocation.name == invocation.name
+                    and started_invocation.raw_arguments == invocation.raw_arguments
+                ):
+                    invocation.started_at = started_invocation.started_at
+                    claimed.append((invocation, pending_result))
+                    continue
+            remaining.append(invocation)
+        return claimed, remaining
+
+    def _execute_cached(self, invocation: ToolInvocation) -> ToolOutcome:
+        outcomes, pending = self._take_cached_outcomes([invocation])
+        if not pending:
+            return outcomes[invocation.index]
+
+        outcome = self._tool_executor.run_invocation(invocation)
+        self._store_cached_outcome(outcome)
+        return outcome
+
+    def _take_cached_outcomes(self, invocations: List[ToolInvocation]) -> tuple[Dict[int, ToolOutcome], List[ToolInvocation]]:
+        outcomes: Dict[int, ToolOutcome] = {}
+        pending: List[ToolInvocation] = []
+        for invocation in invocations:
+            if self._tool_cache is None or invocation.cache_key is None:
+                pending.append(invocation)
+                continue
+
+            cached = self._tool_cache.get(invocation.cache_key, invocation.name, invocation.cache_ttl_seconds)
+            if self._tool_cache.is_missing(cached):
+                pending.append(invocation)
+                continue
+
+            outcomes[invocation.index] = ToolOutcome(invocation=invocation, result=cached, extra={"cache_hit": True})
+        return outcomes, pending
+
+    def _store_cached_outcome(self, outcome: ToolOutcome) -> None:
+        invocation = outcome.invocation
+        if self._tool_cache is None or invocation.cache_key is None or outcome.failed:
+            return
+        if isinstance(outcome.result, dict) and "error" in outcome.result:
+            return
+        self._tool_cache.set(invocation.cache_key, outcome.result, invocation.cache_ttl_seconds)
+
+    def _build_tool_lifecycle_event(self, event: ToolEvent, *, speculative: bool = False) -> dict[str, Any]:
+        invocation = event.invocation
+        ev: dict[str, Any] = {
+            "name": invocation.name,
+            "id": invocation.call_id,
+            "run_id": invocation.run_id,
+            "started_at": invocation.started_at,
+        }
 
-            request_kwargs: dict[str, Any] = {
-                **self.request_params,
-                **kwargs,
+        if event.kind == "start":
+            ev["type"] = "tool_call"
+            ev["arguments"] = invocation.raw_arguments
+            if speculative:
+                ev["speculative"] = True
+            return ev
+
+        if event.kind == "progress" or event.outcome is None:
+            ev["type"] = "tool_progress"
+            ev["at"] = event.at
+            ev["elapsed_ms"] = int((event.at - invocation.started_at) * 1000)
+            return ev
+
+        outcome = event.outcome
+        self._record_tool_span(event, outcome, speculative)
+        ev["type"] = "tool_error" if outcome.failed else "tool_result"
+        ev["result"] = outcome.result
+        ev["finished_at"] = event.at
+        ev["duration_ms"] = outcome.duration_ms
+        if speculative:
+            ev["speculative"] = True
+        if self._tool_cache is not None and invocation.cache_key is not None:
+            ev["cache"] = {
+                "hit": bool(outcome.extra.get("cache_hit")),
+                **self._tool_cache.stats(invocation.name),
             }
-            if include_tools:
-                request_kwargs["tools"] = self.tools
-
-            for chunk in self.provider.generate_response(
-                messages=cast(Any, base_messages),
-                **request_kwargs,
-            ):
-                if nonlocal_yields:
-                    for y in nonlocal_yields:
-                        yield y
-                    nonlocal_yields.clear()
-
-                yield chunk
-
-                if chunk.get("ai_content_part"):
-                    assistant_content_parts.append(str(chunk.get("ai_content_part") or ""))
-
-                tool_call = chunk.get("tool_call")
-                tool_call_index = chunk.get("tool_call_index")
-                if isinstance(tool_call_index, int) and isinstance(tool_call, dict):
-                    current = tool_calls_acc.get(tool_call_index)
-                    if current is None:
-                        current = {
-                            "index": tool_call_index,
-                            "type": tool_call.get("type") or "function_call",
-                            "id": tool_call.get("id") or (chunk.get("tool_call_id") or ""),
-                            "call_id": tool_call.get("call_id") or "",
-                            "name": tool_call.get("name") or "",
-                            "arguments": tool_call.get("arguments") or "",
-                        }
-                        tool_calls_acc[tool_call_index] = current
-                    else:
-                        for k in ("type", "id", "call_id", "name", "arguments"):
-                            v = tool_call.get(k)
-                            if isinstance(v, str) and v:
-                                current[k] = v
-
-                delta = chunk.get("tool_call_arguments_delta")
-                if isinstance(delta, str) and delta:
-                    idx = chunk.get("tool_call_index")
-                    if isinstance(idx, int):
-                        current = tool_calls_acc.get(idx)
-                        if current is None:
-                            current = {
-                                "index": idx,
-                                "type": "function_call",
-                                "id": chunk.get("tool_call_id") or "",
-                                "call_id": "",
-                                "name": "",
-                                "arguments": "",
-                            }
-                            tool_calls_acc[idx] = current
-                        current["arguments"] = (current.get("arguments") or "") + delta
-
-                done_args = chunk.get("tool_call_arguments")
-                if isinstance(done_args, str):
-                    idx = chunk.get("tool_call_index")
-                    if isinstance(idx, int):
-                        current = tool_calls_acc.get(idx)
-                        if current is None:
-                            current = {
-                                "index": idx,
-                                "type": "function_call",
-                                "id": chunk.get("tool_call_id") or "",
-                                "call_id": "",
-                                "name": "",
-                                "arguments": done_args,
-                            }
-                            tool_calls_acc[idx] = current
-                        else:
-                            current["arguments"] = done_args
-
-            if nonlocal_yields:
-                for y in nonlocal_yields:
-                    yield y
-                nonlocal_yields.clear()
-
-            assistant_content = "".join(assistant_content_parts)
-            tool_calls = [tool_calls_acc[i] for i in sorted(tool_calls_acc.keys())]
-
-            self.provider.add_assistant_message(
-                base_messages,
-                content=assistant_content,
-                tool_calls=tool_calls,
-            )
+        return ev
+
+    def _record_tool_span(self, event: ToolEvent, outcome: ToolOutcome, speculative: bool) -> None:
+        invocation = event.invocation
+        span = self.tracer.start_span(
+            "tool.execute",
+            start_at=invocation.started_at or None,
+            tool=invocation.name,
+            run_id=invocation.run_id,
+            speculative=speculative,
+            cache_hit=bool(outcome.extra.get("cache_hit")),
+            isolated=invocation.isolated,
+        )
+        if not span.recording:
+            return
+        if outcome.failed:
+            error = outcome.result.get("error") if isinstance(outcome.result, dict) else outcome.result
+            span.set_error(str(error))
+        span.end(at=event.at)
+
+    def _append_tool_outcome(self, base_messages: list[dict[str, Any]], outcome: ToolOutcome) -> None:
+        invocation = outcome.invocation
+        self.provider.add_tool_call_message(base_messages, tool_call=invocation.tool_call)
+
+        try:
+            tool_output = json.dumps(outcome.result, ensure_ascii=False)
+        except Exception:
+            tool_output = str(outcome.result)
+
+        self.provider.add_tool_result_message(
+            base_messages,
+            tool_name=invocation.name,
+            tool_call=invocation.tool_call,
+            output=tool_output,
+        )
+
+    def _build_invocation(self, index: int, tc: Dict[str, Any]) -> ToolInvocation:
+        tool_name = str((tc.get("name") or "")).strip()
+        raw_args = tc.get("arguments") or "{}"
+
+        call_args: dict[str, Any]
+        try:
+            parsed = json.loads(raw_args) if isinstance(raw_args, str) and raw_args.strip() else {}
+            call_args = parsed if isinstance(parsed, dict) else {}
+        except Exception:
+            call_args = {}
+
+        options = self._tool_options.get(tool_name) or {}
+        cache_key = None
+        if self._tool_cache is not None:
+            cache_key = self._tool_cache.build_key(tool_name, call_args, options)
+
+        return ToolInvocation(
+            index=index,
+            name=tool_name,
+            call_id=str((tc.get("call_id") or tc.get("id") or "")).strip(),
+            raw_arguments=raw_args,
+            arguments=call_args,
+            tool_call=tc,
+            handler=self._tool_handlers.get(tool_name),
+            parallel=bool(options.get("parallel", True)),
+            cache_key=cache_key,
+            cache_ttl_seconds=int(options.get("cache_ttl_seconds") or 0),
+            run_id=next(self._tool_run_ids),
+            timeout_seconds=float(options.get("timeout_seconds") or self._tool_default_timeout),
+            isolated=bool(options.get("isolated", False)),
+        )
 
-            if not tool_calls:
-                break
-
-            for tc in tool_calls:
-                tool_name = str((tc.get("name") or "")).strip()
-                raw_args = tc.get("arguments") or "{}"
-
-                self.provider.add_tool_call_message(base_messages, tool_call=tc)
-
-                call_args: dict[str, Any]
-                try:
-                    parsed = json.loads(raw_args) if isinstance(raw_args, str) and raw_args.strip() else {}
-                    call_args = parsed if isinstance(parsed, dict) else {}
-                except Exception:
-                    call_args = {}
-
-                call_id = str((tc.get("call_id") or tc.get("id") or "")).strip()
-                _emit({"type": "tool_call", "name": tool_name, "arguments": raw_args, "id": call_id})
-
-                handler = self._tool_handlers.get(tool_name)
-                result_obj: Any
-                duration_ms = 0
-                if handler is None:
-                    result_obj = {"error": f"Unknown tool: {tool_name}"}
-                else:
-                    t0 = time.perf_counter()
-                    try:
-                        result_obj = handler(**call_args)
-                    except Exception as exc:
-                        result_obj = {"error": f"{type(exc).__name__}: {exc}"}
-                    duration_ms = int((time.perf_counter() - t0) * 1000)
-
-                _emit({"type": "tool_result", "name": tool_name, "result": result_obj, "id": call_id, "duration_ms": duration_ms})
-
-                try:
-                    tool_output = json.dumps(result_obj, ensure_ascii=False)
-                except Exception:
-                    tool_output = str(result_obj)
-
-                self.provider.add_tool_result_message(
-                    base_messages,
-                    tool_name=tool_name,
-                    tool_call=tc,
-                    output=tool_output,
-                )
-    
     def load_tools(self, mode: AllowedAIToolTypes) -> None:
         for tool_class in self.tools_classes:
-            tool_object = tool_class.get_commands()
-
-            for tool in tool_object:
-                tool_def = tool['tool'].build_flat() if mode == 'flat' else tool['tool'].build()
-                handler = tool.get("handler")
-
-                tool_name = ""
-                if isinstance(tool_def.get("function"), dict):
-                    tool_name = str((tool_def.get("function") or {}).get("name") or "")
-                elif isinstance(tool_def.get("name"), str):
-                    tool_name = cast(str, tool_def.get("name") or "")
-
-                if tool_name:
-                    if callable(handler):
-                        self._tool_handlers[tool_name] = cast(Callable[..., Any], handler)
-                    self.tools.append(tool_def)
\ No newline at end of file
+            for spec in self._tool_registry.get_specs(tool_class, mode):
+                if spec.handler is not None:
+                    self._tool_handlers[spec.name] = spec.handler
+                self._tool_options[spec.name] = spec.options
+                self._tool_specs[spec.name] = spec
+                self.tools.append(cast(ToolObject | FlatToolObject, spec.definition))
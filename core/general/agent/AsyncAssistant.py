@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+import time
+
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, cast
+
+from openai.types.responses import ResponseInputParam
+
+from core.general.agent.Assistant import Assistant
+from core.general.agent.ToolCallAccumulator import ToolCallAccumulator
+from core.general.agent.ToolExecutor import ToolInvocation, ToolOutcome
+from core.providers import AsyncOpenAIProvider, AsyncOllamaAIProvider, AsyncReplayProvider
+from core.types.ai import AIChunk, AIResponseChunk, ResponseChain
+
+
+class AsyncAssistant(Assistant):
+    def __init__(self) -> None:
+        super().__init__()
+        self.providers = {
+            'openrouter': ("AsyncOpenAIProvider", AsyncOpenAIProvider, 'flat'),
+            'ollama': ("AsyncOllamaAIProvider", AsyncOllamaAIProvider, 'normal'),
+            'replay': ("AsyncReplayProvider", AsyncReplayProvider, 'normal'),
+        }
+
+    def generate_response(
+        self,
+        *,
+        messages: ResponseInputParam | None = None,
+        user_text: str = "",
+        chain: ResponseChain | None = None,
+        **kwargs,
+    ) -> AsyncIterator[AIResponseChunk]:
+        return self._agenerate_with_tool_loop(messages=messages, user_text=user_text, include_tools=True, chain=chain, **kwargs)
+
+    async def _agenerate_with_tool_loop(
+        self,
+        *,
+        messages: ResponseInputParam | None = None,
+        user_text: str = "",
+        include_tools: bool = True,
+        chain: ResponseChain | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[AIResponseChunk, None]:
+
+        chain = self._resolve_chain(chain)
+        self._tool_executor.reset_cancel()
+        with self._start_turn_span() as turn_span:
+            with self.tracer.span("assistant.build_messages") as build_span:
+                base_messages = self._build_base_messages(messages, user_text)
+                tools = self._select_tools(base_messages)
+                build_span.set_attributes(messages=len(base_messages), tools=len(tools))
+            used_tools: set[str] = set()
+
+            for iteration in itertools.count(1):
+                assistant_content_parts: List[str] = []
+                tool_calls_acc = ToolCallAccumulator()
+                speculative: Dict[int, tuple[ToolInvocation, asyncio.Task]] = {}
+
+                with self.tracer.span("llm.iteration", iteration=iteration, tools=len(tools)) as iteration_span:
+                    chunks = 0
+                    awaiting_token = iteration_span.recording
+                    async for chunk in self.provider.generate_response(
+                        messages=cast(Any, base_messages),
+                        **self._build_request_kwargs(include_tools, kwargs, tools, chain),
+                    ):
+                        chunk = AIChunk.coerce(chunk)
+                        chunks += 1
+                        if awaiting_token and chunk.kind in self.TOKEN_KINDS:
+                            awaiting_token = False
+                            self._mark_first_token(turn_span, iteration_span)
+                        yield chunk
+
+                        if chunk.kind == AIChunk.KIND_CONTENT:
+                            if chunk.ai_content_part:
+                                assistant_content_parts.append(chunk.ai_content_part)
+                            continue
+                        if chunk.kind not in AIChunk.TOOL_CALL_KINDS:
+                            continue
+
+                        idx = tool_calls_acc.feed(chunk)
+
+                        invocation = self._speculative_invocation(tool_calls_acc, idx, speculative)
+                        if invocation is not None and not self._tool_executor.cancel_requested:
+                            invocation.started_at = time.monotonic()
+                            speculative[invocation.index] = (
+                                invocation,
+                                asyncio.ensure_future(self._aexecute_cached(invocation)),
+                            )
+
+                    tool_calls = self._finish_turn(base_messages, assistant_content_parts, tool_calls_acc)
+                    iteration_span.set_attributes(chunks=chunks, tool_calls=len(tool_calls))
+
+                if not tool_calls:
+                    self._record_tool_usage(used_tools)
+                    turn_span.set_attribute("iterations", iteration)
+                    break
+
+                tools = self._widen_tools(tools, tool_calls, used_tools)
+                invocations = [self._build_invocation(i, tc) for i, tc in enumerate(tool_calls)]
+                with self.tracer.span("assistant.tools", iteration=iteration, tools=len(invocations)):
+                    claimed, remaining = self._claim_speculative(invocations, speculative)
+                    outcomes, pending = await self._run_cache_io(self._take_cached_outcomes, remaining)
+                    for event in self._build_ready_events(invocations, outcomes):
+                        yield self._build_tool_event_chunk(self._build_tool_lifecycle_event(event))
+
+                    claimed_indices = {invocation.index for invocation, _ in claimed}
+                    async for event in self._tool_executor.aiter_events(pending, attached=claimed):
+                        if event.outcome is not None and event.invocation.index not in claimed_indices:
+                            await self._run_cache_io(self._store_cached_outcome, event.outcome)
+                        yield self._collect_tool_event(event, claimed_indices, outcomes)
+
+                for invocation in invocations:
+                    self._append_tool_outcome(base_messages, outcomes[invocation.index])
+                if self._tool_executor.cancel_requested:
+                    self._stop_cancelled_turn(chain, used_tools, turn_span, iteration)
+                    break
+
+    async def _aexecute_cached(self, invocation: ToolInvocation) -> ToolOutcome:
+        outcomes, pending = await self._run_cache_io(self._take_cached_outcomes, [invocation])
+        if not pending:
+            return outcomes[invocation.index]
+
+        outcome = await self._tool_executor.arun_invocation(invocation)
+        await self._run_cache_io(self._store_cached_outcome, outcome)
+        return outcome
+
+    async def _run_cache_io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._tool_cache is None or not self._tool_cache.spills:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
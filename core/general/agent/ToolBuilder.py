@@ -1,4 +1,5 @@
-from core.types.ai import ToolObject, FlatToolObject
+from core.types.ai import ToolObject, FlatToolObject, ToolOptions
+from core.utils.time import parse_time_from_string
 
 
 class ToolBuilder:
@@ -15,6 +16,12 @@ class ToolBuilder:
                 },
             }
         }
+        self.options: ToolOptions = {
+            "parallel": True,
+            "read_only": False,
+            "isolated": False,
+            "cacheable": False,
+        }
 
     def set_name(self, name: str) -> 'ToolBuilder':
         self.tool["function"]["name"] = name
@@ -49,6 +56,43 @@ class ToolBuilder:
         self.tool["function"]["parameters"]["required"].extend(reqs)
         return self
 
+    def set_parallel(self, parallel: bool) -> 'ToolBuilder':
+        self.options["parallel"] = bool(parallel)
+        return self
+
+    def set_read_only(self, read_only: bool = True) -> 'ToolBuilder':
+        self.options["read_only"] = bool(read_only)
+        return self
+
+    def set_timeout(self, timeout: str | int) -> 'ToolBuilder':
+        timeout_seconds = parse_time_from_string(timeout) if isinstance(timeout, str) else int(timeout)
+        if timeout_seconds <= 0:
+            raise ValueError(f"Недопустимое время ожидания инструмента: {timeout}")
+
+        self.options["timeout_seconds"] = timeout_seconds
+        return self
+
+    def set_isolated(self, isolated: bool = True) -> 'ToolBuilder':
+        self.options["isolated"] = bool(isolated)
+        return self
+
+    def set_cache(self, ttl: str | int, key_args: list[str] | None = None) -> 'ToolBuilder':
+        ttl_seconds = parse_time_from_string(ttl) if isinstance(ttl, str) else int(ttl)
+        if ttl_seconds <= 0:
+            raise ValueError(f"Недопустимое время жизни кэша инструмента: {ttl}")
+
+        self.options["cacheable"] = True
+        self.options["cache_ttl_seconds"] = ttl_seconds
+        self.options["cache_key_args"] = list(key_args) if key_args is not None else None
+        return self
+
+    def set_keywords(self, keywords: list[str]) -> 'ToolBuilder':
+        self.options["keywords"] = [k for k in keywords if isinstance(k, str) and k.strip()]
+        return self
+
+    def get_options(self) -> ToolOptions:
+        return self.options
+
     def build(self) -> ToolObject:
         return self.tool
 
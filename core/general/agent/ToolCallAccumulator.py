@@ -0,0 +1,186 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.types.ai import AIChunk
+
+
+@dataclass(slots=True)
+class JsonScanner:
+    depth: int = 0
+    started: bool = False
+    complete: bool = False
+    invalid: bool = False
+    in_string: bool = False
+    escaped: bool = False
+    _closers: List[str] = field(default_factory=list)
+
+    def feed(self, fragment: str) -> None:
+        if self.invalid:
+            return
+
+        for ch in fragment:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch in " \t\r\n":
+                continue
+
+            if self.complete:
+                self.invalid = True
+                return
+
+            if ch == '"':
+                if not self.started:
+                    self.invalid = True
+                    return
+                self.in_string = True
+            elif ch == "{" or ch == "[":
+                self.started = True
+                self._closers.append("}" if ch == "{" else "]")
+                self.depth += 1
+            elif ch == "}" or ch == "]":
+                if not self._closers or self._closers.pop() != ch:
+                    self.invalid = True
+                    return
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+            elif not self.started:
+                self.invalid = True
+                return
+
+    def reset(self) -> None:
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self.invalid = False
+        self.in_string = False
+        self.escaped = False
+        self._closers.clear()
+
+
+@dataclass(slots=True)
+class PendingToolCall:
+    index: int
+    type: str = "function_call"
+    id: str = ""
+    call_id: str = ""
+    name: str = ""
+    parts: List[str] = field(default_factory=list)
+    scanner: JsonScanner = field(default_factory=JsonScanner)
+    _joined: Optional[str] = None
+
+    @property
+    def arguments(self) -> str:
+        if self._joined is None:
+            self._joined = "".join(self.parts)
+            self.parts = [self._joined] if self._joined else []
+        return self._joined
+
+    def append_arguments(self, fragment: str) -> None:
+        self.parts.append(fragment)
+        self._joined = None
+        self.scanner.feed(fragment)
+
+    def replace_arguments(self, arguments: str) -> None:
+        self.parts = [arguments] if arguments else []
+        self._joined = arguments
+        self.scanner.reset()
+        self.scanner.feed(arguments)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "type": self.type,
+            "id": self.id,
+            "call_id": self.call_id,
+            "name": self.name,
+            "arguments": self.arguments,
+        }
+
+
+class ToolCallAccumulator:
+    def __init__(self) -> None:
+        self._calls: Dict[int, PendingToolCall] = {}
+
+    def feed(self, chunk: AIChunk) -> Optional[int]:
+        idx = chunk.tool_call_index
+        if not isinstance(idx, int):
+            return None
+
+        kind = chunk.kind
+        if kind == AIChunk.KIND_TOOL_ARGUMENTS_DELTA:
+            delta = chunk.tool_call_arguments_delta
+            if not delta:
+                return None
+            self._get_or_create(idx, chunk.tool_call_id).append_arguments(delta)
+            return idx
+
+        if kind == AIChunk.KIND_TOOL_ARGUMENTS:
+            arguments = chunk.tool_call_arguments
+            if not isinstance(arguments, str):
+                return None
+            self._get_or_create(idx, chunk.tool_call_id).replace_arguments(arguments)
+            return idx
+
+        if kind == AIChunk.KIND_TOOL_CALL:
+            tool_call = chunk.tool_call
+            if not isinstance(tool_call, dict):
+                return None
+            self._merge_tool_call(idx, tool_call, chunk.tool_call_id)
+            return idx
+
+        return None
+
+    def is_complete(self, index: int) -> bool:
+        call = self._calls.get(index)
+        if call is None or not call.name:
+            return False
+        return call.scanner.complete and not call.scanner.invalid
+
+    def get(self, index: int) -> Optional[Dict[str, Any]]:
+        call = self._calls.get(index)
+        return call.to_dict() if call is not None else None
+
+    def finish(self) -> List[Dict[str, Any]]:
+        return [self._calls[i].to_dict() for i in sorted(self._calls.keys())]
+
+    def __contains__(self, index: object) -> bool:
+        return index in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _get_or_create(self, index: int, item_id: Optional[str]) -> PendingToolCall:
+        call = self._calls.get(index)
+        if call is None:
+            call = PendingToolCall(index=index, id=item_id or "")
+            self._calls[index] = call
+        return call
+
+    def _merge_tool_call(self, index: int, tool_call: Dict[str, Any], item_id: Optional[str]) -> None:
+        call = self._calls.get(index)
+        if call is None:
+            call = PendingToolCall(
+                index=index,
+                type=tool_call.get("type") or "function_call",
+                id=tool_call.get("id") or item_id or "",
+                call_id=tool_call.get("call_id") or "",
+                name=tool_call.get("name") or "",
+            )
+            self._calls[index] = call
+        else:
+            for key in ("type", "id", "call_id", "name"):
+                value = tool_call.get(key)
+                if isinstance(value, str) and value:
+                    setattr(call, key, value)
+
+        arguments = tool_call.get("arguments")
+        if isinstance(arguments, str) and arguments:
+            call.replace_arguments(arguments)
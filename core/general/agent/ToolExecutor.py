@@ -0,0 +1,458 @@
+import asyncio
+import inspect
+import multiprocessing
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Iterable, List, Literal, Optional, Sequence
+
+
+@dataclass(slots=True)
+class ToolInvocation:
+    index: int
+    name: str
+    call_id: str
+    raw_arguments: str
+    arguments: Dict[str, Any]
+    tool_call: Dict[str, Any]
+    handler: Optional[Callable[..., Any]] = None
+    parallel: bool = True
+    cache_key: Optional[str] = None
+    cache_ttl_seconds: int = 0
+    run_id: int = 0
+    started_at: float = 0.0
+    running_since: float = 0.0
+    timeout_seconds: float = 0.0
+    isolated: bool = False
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass(slots=True)
+class ToolOutcome:
+    invocation: ToolInvocation
+    result: Any = None
+    duration_ms: int = 0
+    failed: bool = False
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ToolEvent:
+    kind: Literal["start", "progress", "finish"]
+    invocation: ToolInvocation
+    outcome: Optional[ToolOutcome] = None
+    at: float = field(default_factory=time.monotonic)
+
+
+def _run_isolated_handler(handler: Callable[..., Any], arguments: Dict[str, Any]) -> tuple[Any, bool]:
+    try:
+        result = handler(**arguments)
+        if inspect.isawaitable(result):
+            result = asyncio.run(ToolExecutor._await_result(result))
+        return result, False
+    except Exception as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}, True
+
+
+def _isolated_worker_main(conn: Any) -> None:
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        result = _run_isolated_handler(*task)
+        try:
+            conn.send(result)
+        except Exception as exc:
+            conn.send(({"error": f"{type(exc).__name__}: {exc}"}, True))
+
+
+@dataclass(slots=True)
+class _IsolatedWorker:
+    process: Any
+    conn: Any
+
+
+class ToolExecutor:
+    CANCEL_ARGUMENT = "cancel_event"
+
+    def __init__(self, max_workers: int = 4, progress_interval: float = 0.5, isolated_workers: int = 1) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.progress_interval = max(0.05, float(progress_interval))
+        self.isolated_workers = max(1, int(isolated_workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._abandoned: Dict[int, ToolInvocation] = {}
+        self._idle_workers: List[_IsolatedWorker] = []
+        self._busy_workers: Dict[int, _IsolatedWorker] = {}
+        self._isolated_slots = threading.BoundedSemaphore(self.isolated_workers)
+        self._lock = threading.Lock()
+        self._cancel_requested = threading.Event()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is not None and len(self._abandoned) >= self.max_workers:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+                self._abandoned.clear()
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="charlie-tool")
+            return self._pool
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._get_pool().submit(fn, *args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            workers = self._idle_workers + list(self._busy_workers.values())
+            self._idle_workers = []
+            self._busy_workers = {}
+        for worker in workers:
+            worker.process.kill()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def cancel_all(self) -> None:
+        self._cancel_requested.set()
+
+    def reset_cancel(self) -> None:
+        self._cancel_requested.clear()
+
+    def _abandon(self, invocation: ToolInvocation) -> None:
+        with self._lock:
+            self._abandoned[id(invocation)] = invocation
+
+    def _acquire_worker(self, invocation: ToolInvocation) -> _IsolatedWorker:
+        with self._lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.process.is_alive():
+                    self._busy_workers[id(invocation)] = worker
+                    return worker
+                worker.conn.close()
+
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_isolated_worker_main,
+            args=(child_conn,),
+            name="charlie-tool-isolated",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _IsolatedWorker(process=process, conn=parent_conn)
+        with self._lock:
+            self._busy_workers[id(invocation)] = worker
+        return worker
+
+    def _release_worker(self, invocation: ToolInvocation, worker: _IsolatedWorker, healthy: bool) -> None:
+        with self._lock:
+            owned = self._busy_workers.pop(id(invocation), None) is worker
+            if healthy and owned:
+                self._idle_workers.append(worker)
+                return
+        worker.process.kill()
+        worker.conn.close()
+
+    def _kill_worker(self, invocation: ToolInvocation) -> None:
+        with self._lock:
+            worker = self._busy_workers.get(id(invocation))
+        if worker is not None:
+            worker.process.kill()
+
+    def _run_isolated(self, invocation: ToolInvocation) -> tuple[Any, bool]:
+        with self._isolated_slots:
+            if invocation.cancel_event.is_set():
+                return {"error": "cancelled", "tool": invocation.name}, True
+            invocation.running_since = time.monotonic()
+            try:
+                worker = self._acquire_worker(invocation)
+            except Exception as exc:
+                return {"error": f"{type(exc).__name__}: {exc}"}, True
+            try:
+                worker.conn.send((invocation.handler, invocation.arguments))
+                result, failed = worker.conn.recv()
+            except Exception as exc:
+                self._release_worker(invocation, worker, healthy=False)
+                return {"error": f"{type(exc).__name__}: {exc}"}, True
+            self._release_worker(invocation, worker, healthy=True)
+            return result, failed
+
+    def run_invocation(self, invocation: ToolInvocation) -> ToolOutcome:
+        handler = invocation.handler
+        if handler is None:
+            return ToolOutcome(
+                invocation=invocation,
+                result={"error": f"Unknown tool: {invocation.name}"},
+                failed=True,
+            )
+
+        t0 = time.perf_counter()
+        try:
+            if invocation.isolated:
+                result, failed = self._run_isolated(invocation)
+            elif invocation.cancel_event.is_set():
+                result, failed = {"error": "cancelled", "tool": invocation.name}, True
+            else:
+                invocation.running_since = time.monotonic()
+                result, failed = self._call_handler(handler, invocation)
+        finally:
+            with self._lock:
+                if self._abandoned.get(id(invocation)) is invocation:
+                    del self._abandoned[id(invocation)]
+        duration_ms = int((time.perf_counter() - t0) * 1000)
+
+        return ToolOutcome(invocation=invocation, result=result, duration_ms=duration_ms, failed=failed)
+
+    @classmethod
+    def _call_handler(cls, handler: Callable[..., Any], invocation: ToolInvocation) -> tuple[Any, bool]:
+        try:
+            result = handler(**cls._build_call_arguments(handler, invocation))
+            if inspect.isawaitable(result):
+                result = asyncio.run(cls._await_result(result))
+            return result, False
+        except Exception as exc:
+            return {"error": f"{type(exc).__name__}: {exc}"}, True
+
+    @classmethod
+    def _build_call_arguments(cls, handler: Callable[..., Any], invocation: ToolInvocation) -> Dict[str, Any]:
+        try:
+            accepts_cancel = cls.CANCEL_ARGUMENT in inspect.signature(handler).parameters
+        except (TypeError, ValueError):
+            accepts_cancel = False
+        if not accepts_cancel:
+            return invocation.arguments
+        return {**invocation.arguments, cls.CANCEL_ARGUMENT: invocation.cancel_event}
+
+    @staticmethod
+    def _deadline(invocation: ToolInvocation) -> Optional[float]:
+        if invocation.timeout_seconds <= 0:
+            return None
+        return (invocation.running_since or invocation.started_at) + invocation.timeout_seconds
+
+    def _wait_timeout(self, invocations: Iterable[ToolInvocation]) -> float:
+        timeout = self.progress_interval
+        now = time.monotonic()
+        for invocation in invocations:
+            deadline = self._deadline(invocation)
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - now))
+        return timeout
+
+    @staticmethod
+    def _cancelled(invocation: ToolInvocation) -> ToolOutcome:
+        return ToolOutcome(
+            invocation=invocation,
+            result={"error": "cancelled", "tool": invocation.name},
+            failed=True,
+        )
+
+    def _expired(self, running: Dict[Any, ToolInvocation]) -> List[tuple[Any, ToolOutcome]]:
+        now = time.monotonic()
+        cancelled = self._cancel_requested.is_set()
+
+        expired: List[tuple[Any, ToolOutcome]] = []
+        for handle, invocation in running.items():
+            deadline = self._deadline(invocation)
+            if cancelled:
+                result = {"error": "cancelled", "tool": invocation.name}
+            elif deadline is not None and now >= deadline:
+                reason = "timeout" if invocation.running_since else "queue_timeout"
+                result = {"error": reason, "tool": invocation.name, "timeout_seconds": invocation.timeout_seconds}
+            else:
+                continue
+
+            invocation.cancel_event.set()
+            dequeued = handle.cancel() and isinstance(handle, Future)
+            if invocation.isolated:
+                self._kill_worker(invocation)
+            elif not dequeued and (isinstance(handle, Future) or not inspect.iscoroutinefunction(invocation.handler)):
+                self._abandon(invocation)
+
+            expired.append((handle, ToolOutcome(
+                invocation=invocation,
+                result=result,
+                duration_ms=int((now - invocation.started_at) * 1000),
+                failed=True,
+            )))
+        return expired
+
+    @staticmethod
+    async def _await_result(awaitable: Any) -> Any:
+        return await awaitable
+
+    async def arun_invocation(self, invocation: ToolInvocation) -> ToolOutcome:
+        handler = invocation.handler
+        if handler is None or invocation.isolated or not inspect.iscoroutinefunction(handler):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), self.run_invocation, invocation)
+
+        t0 = time.perf_counter()
+        failed = False
+        invocation.running_since = time.monotonic()
+        try:
+            result = await handler(**self._build_call_arguments(handler, invocation))
+        except Exception as exc:
+            result = {"error": f"{type(exc).__name__}: {exc}"}
+            failed = True
+        duration_ms = int((time.perf_counter() - t0) * 1000)
+
+        return ToolOutcome(invocation=invocation, result=result, duration_ms=duration_ms, failed=failed)
+
+    @staticmethod
+    def split_batches(invocations: List[ToolInvocation]) -> List[List[ToolInvocation]]:
+        batches: List[List[ToolInvocation]] = []
+        current: List[ToolInvocation] = []
+        for invocation in invocations:
+            if invocation.parallel:
+                current.append(invocation)
+                continue
+            if current:
+                batches.append(current)
+                current = []
+            batches.append([invocation])
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _mark_started(invocation: ToolInvocation) -> ToolEvent:
+        if not invocation.started_at:
+            invocation.started_at = time.monotonic()
+        return ToolEvent(kind="start", invocation=invocation, at=invocation.started_at)
+
+    @staticmethod
+    def _adopt(invocation: ToolInvocation, outcome: ToolOutcome) -> ToolEvent:
+        outcome.invocation = invocation
+        return ToolEvent(kind="finish", invocation=invocation, outcome=outcome)
+
+    def iter_events(
+        self,
+        invocations: List[ToolInvocation],
+        *,
+        attached: Sequence[tuple[ToolInvocation, Future]] = (),
+    ) -> Generator[ToolEvent, None, None]:
+        running: Dict[Future, ToolInvocation] = {}
+        for invocation, future in attached:
+            running[future] = invocation
+            yield self._mark_started(invocation)
+
+        def _wait(until_done: set[Future]) -> Generator[ToolEvent, None, None]:
+            while until_done & running.keys():
+                done, _ = wait(
+                    set(running.keys()),
+                    timeout=self._wait_timeout(running.values()),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    yield self._adopt(running.pop(future), future.result())
+
+                expired = self._expired(running)
+                for future, outcome in expired:
+                    yield self._adopt(running.pop(future), outcome)
+
+                if not done and not expired:
+                    now = time.monotonic()
+                    for invocation in running.values():
+                        yield ToolEvent(kind="progress", invocation=invocation, at=now)
+
+        for batch in self.split_batches(invocations):
+            pool = self._get_pool()
+            submitted: set[Future] = set()
+            for invocation in batch:
+                event = self._mark_started(invocation)
+                if self._cancel_requested.is_set():
+                    yield event
+                    yield self._adopt(invocation, self._cancelled(invocation))
+                    continue
+                future = pool.submit(self.run_invocation, invocation)
+                running[future] = invocation
+                submitted.add(future)
+                yield event
+            yield from _wait(submitted)
+
+        yield from _wait(set(running.keys()))
+
+    async def aiter_events(
+        self,
+        invocations: List[ToolInvocation],
+        *,
+        attached: Sequence[tuple[ToolInvocation, "asyncio.Future[ToolOutcome]"]] = (),
+    ) -> AsyncGenerator[ToolEvent, None]:
+        running: Dict[asyncio.Future, ToolInvocation] = {}
+        for invocation, task in attached:
+            running[task] = invocation
+            yield self._mark_started(invocation)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def _run_bounded(invocation: ToolInvocation) -> ToolOutcome:
+            async with semaphore:
+                return await self.arun_invocation(invocation)
+
+        try:
+            for batch in self.split_batches(invocations):
+                submitted: set[asyncio.Future] = set()
+                for invocation in batch:
+                    event = self._mark_started(invocation)
+                    if self._cancel_requested.is_set():
+                        yield event
+                        yield self._adopt(invocation, self._cancelled(invocation))
+                        continue
+                    task = asyncio.ensure_future(_run_bounded(invocation))
+                    running[task] = invocation
+                    submitted.add(task)
+                    yield event
+
+                while submitted & running.keys():
+                    async for event in self._await_next(running):
+                        yield event
+
+            while running:
+                async for event in self._await_next(running):
+                    yield event
+        finally:
+            for task in running:
+                if not task.done():
+                    task.cancel()
+
+    async def _await_next(self, running: Dict[asyncio.Future, ToolInvocation]) -> AsyncGenerator[ToolEvent, None]:
+        done, _ = await asyncio.wait(
+            set(running.keys()),
+            timeout=self._wait_timeout(running.values()),
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in done:
+            yield self._adopt(running.pop(task), task.result())
+
+        expired = self._expired(running)
+        for task, outcome in expired:
+            yield self._adopt(running.pop(task), outcome)
+
+        if not done and not expired:
+            now = time.monotonic()
+            for invocation in running.values():
+                yield ToolEvent(kind="progress", invocation=invocation, at=now)
+
+    def execute(self, invocations: List[ToolInvocation]) -> List[ToolOutcome]:
+        outcomes: Dict[int, ToolOutcome] = {}
+        for event in self.iter_events(invocations):
+            if event.outcome is not None:
+                outcomes[event.invocation.index] = event.outcome
+        return [outcomes[inv.index] for inv in invocations]
+
+    async def aexecute(self, invocations: List[ToolInvocation]) -> List[ToolOutcome]:
+        outcomes: Dict[int, ToolOutcome] = {}
+        async for event in self.aiter_events(invocations):
+            if event.outcome is not None:
+                outcomes[event.invocation.index] = event.outcome
+        return [outcomes[inv.index] for inv in invocations]
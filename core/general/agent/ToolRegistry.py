@@ -0,0 +1,80 @@
+import hashlib
+import json
+import threading
+
+from typing import Any, Callable, Dict, List, Sequence, Type, cast
+
+from core.types.ai import AllowedAIToolTypes, ToolClassProtocol, ToolOptions, ToolSet, ToolSpec
+
+
+class ToolRegistry:
+    HASH_LENGTH = 16
+
+    def __init__(self) -> None:
+        self._specs: Dict[tuple[Type[ToolClassProtocol], AllowedAIToolTypes], tuple[ToolSpec, ...]] = {}
+        self._sets: Dict[tuple[str, ...], ToolSet] = {}
+        self._lock = threading.Lock()
+
+    def get_specs(self, tool_class: Type[ToolClassProtocol], flavor: AllowedAIToolTypes) -> tuple[ToolSpec, ...]:
+        key = (tool_class, flavor)
+        specs = self._specs.get(key)
+        if specs is None:
+            specs = tuple(self._freeze_commands(tool_class, flavor))
+            with self._lock:
+                self._specs[key] = specs
+        return specs
+
+    def build_set(self, specs: Sequence[ToolSpec]) -> ToolSet:
+        key = tuple(spec.content_hash for spec in specs)
+        tool_set = self._sets.get(key)
+        if tool_set is not None:
+            return tool_set
+
+        flavor = specs[0].flavor if specs else "normal"
+        tool_set = ToolSet(
+            flavor=flavor,
+            specs=tuple(specs),
+            definitions=tuple(spec.definition for spec in specs),
+        )
+        with self._lock:
+            self._sets[key] = tool_set
+        return tool_set
+
+    def clear(self) -> None:
+        with self._lock:
+            self._specs.clear()
+            self._sets.clear()
+
+    def _freeze_commands(self, tool_class: Type[ToolClassProtocol], flavor: AllowedAIToolTypes) -> List[ToolSpec]:
+        get_commands = getattr(tool_class, "get_commands_view", None) or tool_class.get_commands
+
+        specs: List[ToolSpec] = []
+        for command in get_commands():
+            builder = command["tool"]
+            raw_definition = builder.build_flat() if flavor == 'flat' else builder.build()
+
+            name = ""
+            if isinstance(raw_definition.get("function"), dict):
+                name = str((raw_definition.get("function") or {}).get("name") or "")
+            elif isinstance(raw_definition.get("name"), str):
+                name = cast(str, raw_definition.get("name") or "")
+            if not name:
+                continue
+
+            payload = json.dumps(raw_definition, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+            handler = command.get("handler")
+            specs.append(
+                ToolSpec(
+                    name=name,
+                    flavor=flavor,
+                    definition=json.loads(payload),
+                    content_hash=self._hash(payload),
+                    options=cast(ToolOptions, json.loads(json.dumps(builder.get_options()))),
+                    handler=cast(Callable[..., Any], handler) if callable(handler) else None,
+                )
+            )
+        return specs
+
+    @classmethod
+    def _hash(cls, payload: str) -> str:
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[: cls.HASH_LENGTH]
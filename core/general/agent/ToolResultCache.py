@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.stores import CacheStore
+from core.types.ai import ToolOptions
+
+
+class ToolResultCache:
+    KEY_PREFIX = "tool_result"
+
+    _MISSING = object()
+
+    def __init__(self, max_entries: int = 256, spill_store: CacheStore | None = None) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._spill_store = spill_store
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self._tool_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def spills(self) -> bool:
+        return self._spill_store is not None
+
+    def build_key(self, tool_name: str, arguments: Dict[str, Any], options: ToolOptions) -> Optional[str]:
+        if not options.get("cacheable"):
+            return None
+
+        key_args = options.get("cache_key_args")
+        if key_args is None:
+            key_payload = arguments
+        else:
+            key_payload = {name: arguments.get(name) for name in key_args}
+
+        try:
+            serialized = json.dumps(key_payload, ensure_ascii=False, sort_keys=True, default=str)
+        except Exception:
+            return None
+        return f"{self.KEY_PREFIX}::{tool_name}::{serialized}"
+
+    def get(self, key: str, tool_name: str, ttl_seconds: int) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                expires_at, value = cached
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self._count(tool_name, hit=True)
+                    return value
+                del self._entries[key]
+
+        if self._spill_store is not None:
+            value, fresh_for = self._spill_store.get_fresh(key, ttl_seconds)
+            if value is not None:
+                self._put(key, value, min(fresh_for, ttl_seconds))
+                with self._lock:
+                    self._count(tool_name, hit=True)
+                return value
+
+        with self._lock:
+            self._count(tool_name, hit=False)
+        return self._MISSING
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._put(key, value, ttl_seconds)
+        if self._spill_store is not None:
+            try:
+                json.dumps(value, ensure_ascii=False)
+            except Exception:
+                return
+            self._spill_store.set_with_ttl(key, value, ttl_seconds)
+
+    def is_missing(self, value: Any) -> bool:
+        return value is self._MISSING
+
+    def stats(self, tool_name: str | None = None) -> Dict[str, int]:
+        with self._lock:
+            if tool_name is not None:
+                return dict(self._tool_stats.get(tool_name) or {"hits": 0, "misses": 0})
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        expires_at = time.monotonic() + ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, tool_name: str, *, hit: bool) -> None:
+        stats = self._tool_stats.setdefault(tool_name, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            stats["hits"] += 1
+        else:
+            self.misses += 1
+            stats["misses"] += 1
@@ -0,0 +1,128 @@
+import re
+import threading
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+from core.types.ai import FlatToolObject, ToolObject, ToolOptions
+
+
+class ToolRouter:
+    WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+    STEM_SUFFIX = "аеёиоуыэюяйьaeiouy"
+    MIN_STEM_LENGTH = 3
+
+    STOP_WORDS = frozenset({
+        "tool", "tools", "that", "this", "the", "and", "for", "use", "with", "from", "about",
+        "returns", "retrieves", "information", "available", "client", "specific", "relevant",
+        "data", "open", "app", "all", "try", "not", "only", "optional", "default",
+        "get", "set", "run", "list", "make", "new", "check", "perform", "performs", "you", "your",
+        "what", "which", "when", "how", "can", "are", "was", "has", "have", "will", "into", "via",
+        "как", "что", "где", "когда", "это", "для", "мне", "меня", "есть", "или", "так", "там",
+        "какой", "какая", "какие", "пожалуйста", "можно", "нужно", "сейчас",
+    })
+
+    def __init__(self, always_include: Iterable[str] = (), recent_turns: int = 3) -> None:
+        self.always_include = {name for name in always_include if name}
+        self._recent: deque[set[str]] = deque(maxlen=max(0, int(recent_turns)))
+        self._index: Dict[str, frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    def select(
+        self,
+        messages: Sequence[Mapping[str, Any]],
+        tools: List[ToolObject | FlatToolObject],
+        options: Mapping[str, ToolOptions],
+    ) -> List[ToolObject | FlatToolObject]:
+        query = self._latest_user_text(messages)
+        if not query.strip():
+            return tools
+
+        query_stems = self._query_stems(query)
+        wanted = set(self.always_include) | self._used_in(messages)
+        with self._lock:
+            for used in self._recent:
+                wanted |= used
+
+        selected: List[ToolObject | FlatToolObject] = []
+        for tool_def in tools:
+            name = self.get_tool_name(tool_def)
+            if name in wanted or not query_stems.isdisjoint(self._get_terms(name, tool_def, options.get(name) or {})):
+                selected.append(tool_def)
+        return selected
+
+    def record_usage(self, tool_names: Iterable[str]) -> None:
+        used = {name for name in tool_names if name}
+        with self._lock:
+            self._recent.append(used)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._index.clear()
+
+    @staticmethod
+    def get_tool_name(tool_def: Mapping[str, Any]) -> str:
+        function = tool_def.get("function")
+        if isinstance(function, dict):
+            return str(function.get("name") or "")
+        return str(tool_def.get("name") or "")
+
+    @staticmethod
+    def _get_description(tool_def: Mapping[str, Any]) -> str:
+        function = tool_def.get("function")
+        if isinstance(function, dict):
+            return str(function.get("description") or "")
+        return str(tool_def.get("description") or "")
+
+    def _get_terms(self, name: str, tool_def: Mapping[str, Any], options: ToolOptions) -> frozenset[str]:
+        terms = self._index.get(name)
+        if terms is not None:
+            return terms
+
+        words = [*name.split("_"), *self.WORD_PATTERN.findall(self._get_description(tool_def))]
+        for keyword in options.get("keywords") or []:
+            words.extend(self.WORD_PATTERN.findall(keyword))
+
+        terms = frozenset(
+            stem
+            for stem in (self._stem(word) for word in words if word.lower() not in self.STOP_WORDS)
+            if len(stem) >= self.MIN_STEM_LENGTH
+        )
+        with self._lock:
+            self._index[name] = terms
+        return terms
+
+    @classmethod
+    def _stem(cls, word: str) -> str:
+        return word.lower().rstrip(cls.STEM_SUFFIX)
+
+    @classmethod
+    def _query_stems(cls, text: str) -> set[str]:
+        return {
+            stem
+            for stem in (cls._stem(word) for word in cls.WORD_PATTERN.findall(text) if word.lower() not in cls.STOP_WORDS)
+            if len(stem) >= cls.MIN_STEM_LENGTH
+        }
+
+    @staticmethod
+    def _latest_user_text(messages: Sequence[Mapping[str, Any]]) -> str:
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                content = message.get("content")
+                return content if isinstance(content, str) else str(content or "")
+        return ""
+
+    @classmethod
+    def _used_in(cls, messages: Sequence[Mapping[str, Any]]) -> set[str]:
+        used: set[str] = set()
+        for message in messages:
+            if message.get("type") == "function_call":
+                used.add(str(message.get("name") or ""))
+            elif message.get("role") == "tool":
+                used.add(str(message.get("tool_name") or message.get("name") or ""))
+            elif message.get("role") == "assistant":
+                for tool_call in message.get("tool_calls") or []:
+                    used.add(str(((tool_call or {}).get("function") or {}).get("name") or ""))
+        used.discard("")
+        return used
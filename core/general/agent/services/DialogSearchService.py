@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from core.stores import DialogStore
+
+
+class DialogSearchService:
+    _store: Optional["DialogStore"] = None
+
+    @classmethod
+    def bind(cls, store: "DialogStore") -> None:
+        cls._store = store
+
+    @classmethod
+    def search(cls, query: str, limit: int = 10, dialog_id: str | None = None) -> Dict[str, Any]:
+        store = cls._store
+        if store is None:
+            return {"success": False, "error": "store_unavailable", "message": "Dialog store is not bound"}
+        if not (query or "").strip():
+            return {"success": False, "error": "empty_query", "message": "Search query is empty"}
+
+        hits = store.search(query, limit=max(1, min(int(limit), 50)), dialog_id=dialog_id)
+        return {"success": True, "query": query, "results": [hit.to_dict() for hit in hits]}
@@ -1,8 +1,10 @@
+import hashlib
 import json
 import re
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from icalendar import Calendar
 from dateutil.rrule import rrulestr
@@ -10,6 +12,8 @@ from dateutil import tz
 
 from core.stores import CacheStore
 from core.general.Config import Config
+from core.utils.http import read_url
+from core.utils.time import parse_time_from_string
 
 
 WEEKDAYS_RU = {
@@ -24,35 +28,126 @@ WEEKDAYS_RU = {
 
 
 class MIREAScheduleService:
-    def __init__(self) -> None:
-        self._cache = CacheStore()
+    SCHEDULE_URL = "https://schedule-of.mirea.ru/"
+    INDEX_VERSION = 2
+    INDEX_WINDOW_DAYS = 200
+    MAX_RANGE_FETCHES = 4
+
+    def __init__(self, cache: CacheStore | None = None) -> None:
+        self._cache = cache if cache is not None else CacheStore.default()
         self._local_tz = tz.gettz(Config.ASSISTANT_TIMEZONE)
 
-    def fetch_schedule(self, *, url: str, ttl_seconds: int, target_date: str | None = None) -> dict[str, Any]:
-        key = self._build_cache_key(url=url, target_date=target_date)
-        cached = self._cache.get_valid(key, ttl_seconds)
-        if cached is not None:
-            return cached
+    def fetch_schedule(
+        self,
+        *,
+        group: str,
+        ttl_seconds: int,
+        target_date: str | None = None,
+        end_date: str | None = None,
+        stale_seconds: int | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> dict[str, Any]:
+        if stale_seconds is None:
+            stale_seconds = parse_time_from_string(Config.CACHE_STALE_SCHEDULE)
 
         try:
-            html = self._fetch_html(url)
-            ical_content = self._extract_ical_from_html(html)
-            grouped = self._parse_schedule(ical_content, target_date=target_date)
-            self._cache.set_with_ttl(key, grouped, ttl_seconds)
-            return grouped
+            start = self._as_day(target_date) if target_date else datetime.now().strftime("%Y-%m-%d")
+            if end_date:
+                end = self._as_day(end_date)
+            else:
+                end = start if target_date else None
+
+            selected: dict[str, Any] = {}
+            cursor, anchor = start, None
+            for _ in range(self.MAX_RANGE_FETCHES):
+                index = self._get_index(
+                    group=group,
+                    ttl_seconds=ttl_seconds,
+                    stale_seconds=stale_seconds,
+                    anchor_date=anchor,
+                    cancel_event=cancel_event,
+                )
+                if self._covers(index, cursor):
+                    selected.update(self._select_days(index, cursor, end))
+                    if end is None or end <= index["end"]:
+                        break
+                    cursor = (datetime.strptime(index["end"], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+                anchor = self._anchor_for(cursor)
+            return selected
         except Exception as e:
-            cached = self._cache.get_valid(key, ttl_seconds)
-            if cached is not None:
-                return cached
             return {"error": "schedule_fetch_failed with exception: " + str(e)}
 
-    def _build_cache_key(self, *, url: str, target_date: str | None) -> str:
-        return f"mirea_schedule::{url}::{target_date or 'all'}"
-
-    def _fetch_html(self, url: str) -> str:
+    def _get_index(
+        self,
+        *,
+        group: str,
+        ttl_seconds: int,
+        stale_seconds: int,
+        anchor_date: str | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> dict[str, Any]:
+        url = self._build_url(group=group, anchor_date=anchor_date)
+        source = self._cache.get_or_refresh(
+            self._build_source_key(group=group, anchor_date=anchor_date),
+            ttl_seconds,
+            lambda: self._load_source(url, cancel_event=cancel_event),
+            stale_seconds=stale_seconds,
+        )
+        return self._cache.get_or_refresh(
+            f"mirea_schedule::index::v{self.INDEX_VERSION}::{source['digest']}::{anchor_date or 'current'}",
+            ttl_seconds + stale_seconds,
+            lambda: self._build_index(source["ical"], anchor_date=anchor_date),
+        )
+
+    def _load_source(self, url: str, cancel_event: threading.Event | None = None) -> dict[str, Any]:
+        html = self._fetch_html(url, cancel_event=cancel_event)
+        ical_content = self._extract_ical_from_html(html)
+        digest = hashlib.sha256(ical_content.encode("utf-8")).hexdigest()
+        return {"digest": digest, "ical": ical_content}
+
+    def _build_url(self, *, group: str, anchor_date: str | None) -> str:
+        if anchor_date:
+            return f"{self.SCHEDULE_URL}?date={anchor_date}&s={group}"
+        return f"{self.SCHEDULE_URL}?s={group}"
+
+    def _build_source_key(self, *, group: str, anchor_date: str | None) -> str:
+        return f"mirea_schedule::ical::{group}::{anchor_date or 'current'}"
+
+    def _build_index(self, ical_content: str, anchor_date: str | None = None) -> dict[str, Any]:
+        center = datetime.strptime(anchor_date, "%Y-%m-%d") if anchor_date else datetime.now()
+        center = center.replace(hour=0, minute=0, second=0, microsecond=0)
+        window = timedelta(days=self.INDEX_WINDOW_DAYS)
+        start_dt, end_dt = center - window, center + window + timedelta(days=1)
+        events = self._parse_ical_events(ical_content, start_dt, end_dt)
+        days = {
+            day: lessons
+            for day, lessons in sorted(self._group_events_by_day(events).items())
+            if start_dt.strftime("%Y-%m-%d") <= day <= (center + window).strftime("%Y-%m-%d")
+        }
+        return {
+            "start": start_dt.strftime("%Y-%m-%d"),
+            "end": (center + window).strftime("%Y-%m-%d"),
+            "days": days,
+        }
+
+    def _covers(self, index: dict[str, Any], day: str) -> bool:
+        return index["start"] <= day <= index["end"]
+
+    def _select_days(self, index: dict[str, Any], start: str, end: str | None) -> dict[str, Any]:
+        days = index["days"]
+        if start == end:
+            return {start: days[start]} if start in days else {}
+        return {day: lessons for day, lessons in days.items() if day >= start and (end is None or day <= end)}
+
+    def _anchor_for(self, day: str) -> str:
+        return f"{day[:7]}-01"
+
+    def _as_day(self, value: str) -> str:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+    def _fetch_html(self, url: str, cancel_event: threading.Event | None = None) -> str:
         req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=30) as resp:
-            return resp.read().decode("utf-8", errors="ignore")
+        return read_url(req, timeout=30, cancel_event=cancel_event).decode("utf-8", errors="ignore")
 
     def _extract_ical_from_html(self, html_content: str) -> str:
         match = re.search(r"<script id=\"__NEXT_DATA__\".*?>(.*?)</script>", html_content, re.DOTALL)
@@ -61,21 +156,6 @@ class MIREAScheduleService:
         data = json.loads(match.group(1))
         return data["props"]["pageProps"]["scheduleLoadInfo"][0]["iCalContent"]
 
-    def _parse_schedule(self, ical_content: str, target_date: str | None = None) -> dict[str, Any]:
-        if target_date:
-            start_dt = datetime.strptime(target_date, "%Y-%m-%d")
-            end_dt = start_dt + timedelta(days=1)
-        else:
-            start_dt = datetime.now()
-            end_dt = start_dt + timedelta(days=180)
-
-        events = self._parse_ical_events(ical_content, start_dt, end_dt)
-        grouped = self._group_events_by_day(events)
-
-        if target_date and target_date in grouped:
-            return {target_date: grouped[target_date]}
-        return grouped
-
     def _parse_ical_events(self, ical_content: str, start_date: datetime, end_date: datetime) -> list[dict[str, Any]]:
         ical_content = ical_content.replace("\\r\\n", "\r\n").replace("\\n", "\n")
         cal = Calendar.from_ical(ical_content)
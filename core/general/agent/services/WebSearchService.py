@@ -1,30 +1,30 @@
 import json
-from urllib.request import Request, urlopen
+import threading
+from urllib.request import Request
 
 from core.general import Config
+from core.utils.http import read_url
 
 
 class WebSearchService:
     @staticmethod
-    def web_search(request: str):
+    def web_search(request: str, cancel_event: threading.Event | None = None):
         payload = json.dumps({"query": request}).encode("utf-8")
         headers = {
             "Authorization": f"Bearer {Config.OLLAMA_API_KEY}",
             "Content-Type": "application/json",
         }
         req = Request("https://ollama.com/api/web_search", data=payload, headers=headers, method="POST")
-        with urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
+        raw = read_url(req, timeout=30, cancel_event=cancel_event).decode("utf-8", errors="ignore")
         return json.loads(raw) if raw else {}
 
     @staticmethod
-    def web_fetch(url: str):
+    def web_fetch(url: str, cancel_event: threading.Event | None = None):
         payload = json.dumps({"url": url}).encode("utf-8")
         headers = {
             "Authorization": f"Bearer {Config.OLLAMA_API_KEY}",
             "Content-Type": "application/json",
         }
         req = Request("https://ollama.com/api/web_fetch", data=payload, headers=headers, method="POST")
-        with urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
+        raw = read_url(req, timeout=30, cancel_event=cancel_event).decode("utf-8", errors="ignore")
         return json.loads(raw) if raw else {}
\ No newline at end of file
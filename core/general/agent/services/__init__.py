@@ -4,6 +4,7 @@ from core.general.agent.services.MIREAScheduleService import MIREAScheduleServic
 from core.general.agent.services.TelegramService import TelegramService
 from core.general.agent.services.WebSearchService import WebSearchService
 from core.general.agent.services.RulesHelperService import RulesHelperService
+from core.general.agent.services.DialogSearchService import DialogSearchService
 
 __all__ = [
     "SystemService",
@@ -11,5 +12,6 @@ __all__ = [
     "MIREAScheduleService",
     "TelegramService",
     "WebSearchService",
-    "RulesHelperService"
+    "RulesHelperService",
+    "DialogSearchService",
 ]
\ No newline at end of file
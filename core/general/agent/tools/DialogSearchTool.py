@@ -0,0 +1,39 @@
+from typing import Any, Dict
+
+from core.interfaces import ITool
+
+from core.types.ai import ToolClassSetupObject
+from core.general.agent.services import DialogSearchService
+from core.general.agent.ToolBuilder import ToolBuilder
+
+
+class DialogSearchTool(ITool):
+    name = "Dialog Search Tools Pack"
+
+    @staticmethod
+    def setup_dialog_search_tool() -> ToolClassSetupObject:
+        return {
+            "name": "dialog_search_tool",
+            "handler": DialogSearchTool.dialog_search_handler,
+            "tool": ToolBuilder()
+                .set_name("dialog_search_tool")
+                .set_description(
+                    "Full-text search over the user's saved dialogs with the assistant. "
+                    "Use this to recall earlier questions and answers. Results are ranked by relevance."
+                )
+                .add_property("query", "string", description="Words to search for")
+                .add_property("limit", "integer", description="Maximum number of results, 10 by default")
+                .add_requirements(['query'])
+                .set_read_only()
+                .set_timeout("10s")
+                .set_keywords(["вспомни", "помнишь", "обсуждали", "раньше", "переписка", "диалог", "история"])
+        }
+
+    @staticmethod
+    def dialog_search_handler(query: str, limit: int = 10, **kwargs) -> Dict[str, Any]:
+        return DialogSearchService.search(query, limit=limit)
+
+
+DialogSearchTool.commands = [
+    DialogSearchTool.setup_dialog_search_tool(),
+]
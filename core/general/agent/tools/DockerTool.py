@@ -16,6 +16,10 @@ class DockerTool(ITool):
             "tool": ToolBuilder()
                 .set_name("get_all_images_tool")
                 .set_description("Tool that retrieves information about all Docker images on the system | If Docker client is not available, try to open Docker Desktop app")
+                .set_read_only()
+                .set_cache("30s")
+                .set_timeout("30s")
+                .set_keywords(["docker", "докер", "образ", "image"])
         }
     
     @staticmethod
@@ -31,6 +35,9 @@ class DockerTool(ITool):
                 .set_name("get_all_containers_tool")
                 .set_description("Tool that retrieves information about all Docker containers (running and stopped) | If Docker client is not available, try to open Docker Desktop app")
                 .add_property("show_all", "boolean", description="Show all containers including stopped ones (default: true)")
+                .set_read_only()
+                .set_timeout("30s")
+                .set_keywords(["docker", "докер", "контейнер", "container"])
         }
 
     @staticmethod
@@ -55,6 +62,10 @@ class DockerTool(ITool):
                 .add_property("remove", "boolean", description="Automatically remove container when it exits (default: false)")
                 .add_property("network", "string", description="Network to connect the container to")
                 .add_requirements(['image'])
+                .set_parallel(False)
+                .set_isolated()
+                .set_timeout("2m")
+                .set_keywords(["docker", "докер", "контейнер", "запусти", "container"])
         }
 
     @staticmethod
@@ -83,6 +94,10 @@ class DockerTool(ITool):
                 .set_description("Tool that starts a stopped Docker container | If Docker client is not available, try to open Docker Desktop app")
                 .add_property("container_id", "string", description="Container ID or name to start")
                 .add_requirements(['container_id'])
+                .set_parallel(False)
+                .set_isolated()
+                .set_timeout("1m")
+                .set_keywords(["docker", "докер", "контейнер", "запусти", "container"])
         }
 
     @staticmethod
@@ -100,6 +115,10 @@ class DockerTool(ITool):
                 .add_property("container_id", "string", description="Container ID or name to stop")
                 .add_property("timeout", "integer", description="Seconds to wait for stop before killing (default: 10)")
                 .add_requirements(['container_id'])
+                .set_parallel(False)
+                .set_isolated()
+                .set_timeout("1m")
+                .set_keywords(["docker", "докер", "контейнер", "останови", "container"])
         }
 
     @staticmethod
@@ -1,4 +1,5 @@
 import re
+import threading
 from datetime import datetime
 from typing import Any, Dict
 
@@ -13,6 +14,7 @@ from core.utils.time import parse_time_from_string
 class MIREAScheduleTool(ITool):
     name = "MIREA Schedule Tools Pack"
     CACHE_TTL = Config.CACHE_TTL_SCHEDULE
+    SCHEDULE_GROUP = "1_778"
 
     @staticmethod
     def setup_get_schedule_tool() -> ToolClassSetupObject:
@@ -23,15 +25,29 @@ class MIREAScheduleTool(ITool):
                 .set_name("mirea_schedule_tool")
                 .set_description("Fetch and parse RTU MIREA schedule")
                 .add_property("target_date", "string", description="Optional date YYYY-MM-DD, if not provided - today is used")
+                .add_property("end_date", "string", description="Optional end date YYYY-MM-DD to get all days from target_date to end_date inclusive")
+                .set_read_only()
+                .set_timeout("45s")
+                .set_keywords(["расписание", "пара", "занятие", "лекция", "семинар", "мирэа", "университет", "schedule"])
         }
 
     @staticmethod
-    def get_schedule_handler(target_date: str | None = None, **kwargs) -> Dict[str, Any]:
+    def get_schedule_handler(
+        target_date: str | None = None,
+        end_date: str | None = None,
+        cancel_event: threading.Event | None = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         ttl_seconds = parse_time_from_string(MIREAScheduleTool.CACHE_TTL)
         service = MIREAScheduleService()
         date_value = target_date if target_date else datetime.now().strftime("%Y-%m-%d")
-        target_url = f"https://schedule-of.mirea.ru/?date={date_value}&s=1_778"
-        return service.fetch_schedule(url=target_url, target_date=date_value, ttl_seconds=ttl_seconds)
+        return service.fetch_schedule(
+            group=MIREAScheduleTool.SCHEDULE_GROUP,
+            target_date=date_value,
+            end_date=end_date or None,
+            ttl_seconds=ttl_seconds,
+            cancel_event=cancel_event,
+        )
 
 
 MIREAScheduleTool.commands = [
@@ -16,6 +16,9 @@ class RulesHelperTool(ITool):
             "tool": ToolBuilder()
                 .set_name("get_docs_gost_design_rules_tool")
                 .set_description("Returns design rules from GOST 7.32 – 2017;")
+                .set_read_only()
+                .set_cache("1h")
+                .set_keywords(["гост", "оформление", "отчет", "отчёт", "документ", "реферат", "курсовая"])
         }
 
     @staticmethod
@@ -30,6 +33,9 @@ class RulesHelperTool(ITool):
             "tool": ToolBuilder()
                 .set_name("get_charlie_tools_guide_tool")
                 .set_description("Returns the internal tools guide for Charlie assistant")
+                .set_read_only()
+                .set_cache("1h")
+                .set_keywords(["инструмент", "умеешь", "возможности", "навык", "guide"])
         }
 
     @staticmethod
@@ -18,6 +18,9 @@ class SystemManagementTool(ITool):
             "tool": ToolBuilder()
                 .set_name("get_time_tool")
                 .set_description("Tool that retrieves the current system time")
+                .set_read_only()
+                .set_cache("1s")
+                .set_keywords(["время", "час", "дата", "сегодня", "завтра", "вчера", "день"])
         }
     
     @staticmethod
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Dict, Any
 from core.interfaces import ITool
 
@@ -25,11 +24,14 @@ class TelegramTool(ITool):
                 )
                 .add_property("message", "string", description="The message text to send to the user")
                 .add_requirements(['message'])
+                .set_parallel(False)
+                .set_timeout("15s")
+                .set_keywords(["телеграм", "телеграмм", "telegram", "отправь", "уведоми", "напомни", "сообщение"])
         }
     
     @staticmethod
-    def send_telegram_message_handler(message: str) -> Dict[str, Any]:
-        return asyncio.run(TelegramService.send_message(Config.TELEGRAM_BOT_TOKEN, Config.TELEGRAM_USER_ID, message))
+    async def send_telegram_message_handler(message: str) -> Dict[str, Any]:
+        return await TelegramService.send_message(Config.TELEGRAM_BOT_TOKEN, Config.TELEGRAM_USER_ID, message)
 
 
 TelegramTool.commands = [
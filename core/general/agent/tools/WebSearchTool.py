@@ -1,3 +1,5 @@
+import threading
+
 from core.interfaces import ITool
 
 from core.types.ai import ToolClassSetupObject
@@ -21,6 +23,10 @@ class WebSearchTool(ITool):
                 )
                 .add_property("query", "string", description="The search query to perform")
                 .add_requirements(['query'])
+                .set_read_only()
+                .set_cache("10m", key_args=['query'])
+                .set_timeout("20s")
+                .set_keywords(["найди", "поиск", "поищи", "интернет", "гугл", "новости", "google", "search"])
         }
 
     @staticmethod
@@ -36,15 +42,19 @@ class WebSearchTool(ITool):
                 )
                 .add_property("url", "string", description="The URL of the web page to fetch")
                 .add_requirements(['url'])
+                .set_read_only()
+                .set_cache("10m", key_args=['url'])
+                .set_timeout("20s")
+                .set_keywords(["сайт", "ссылка", "страница", "http", "www", "url", "открой"])
         }
     
     @staticmethod
-    def web_search_handler(query: str):
-        return WebSearchService.web_search(query)
+    def web_search_handler(query: str, cancel_event: threading.Event | None = None):
+        return WebSearchService.web_search(query, cancel_event=cancel_event)
 
     @staticmethod
-    def web_fetch_handler(url: str):
-        return WebSearchService.web_fetch(url)
+    def web_fetch_handler(url: str, cancel_event: threading.Event | None = None):
+        return WebSearchService.web_fetch(url, cancel_event=cancel_event)
 
 
 WebSearchTool.commands = [
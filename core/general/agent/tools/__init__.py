@@ -4,6 +4,7 @@ from core.general.agent.tools.MIREAScheduleTool import MIREAScheduleTool
 from core.general.agent.tools.TelegramTool import TelegramTool
 from core.general.agent.tools.WebSearchTool import WebSearchTool
 from core.general.agent.tools.RulesHelperTool import RulesHelperTool
+from core.general.agent.tools.DialogSearchTool import DialogSearchTool
 
 __all__ = [
     "SystemManagementTool",
@@ -11,5 +12,6 @@ __all__ = [
     "MIREAScheduleTool",
     "TelegramTool",
     "WebSearchTool",
-    "RulesHelperTool"
+    "RulesHelperTool",
+    "DialogSearchTool",
 ]
\ No newline at end of file
@@ -0,0 +1,136 @@
+import atexit
+import json
+import queue
+import threading
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from core.interfaces import ISpanExporter
+from core.general.tracing.Tracer import Span
+
+
+class JsonlSpanExporter(ISpanExporter):
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue[List[Span] | None]" = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if not spans:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="span-exporter", daemon=True)
+                self._writer.start()
+                atexit.register(self.shutdown)
+            self._queue.put(list(spans))
+
+    def shutdown(self) -> None:
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is None:
+                return
+            self._queue.put(None)
+            atexit.unregister(self.shutdown)
+        writer.join()
+
+    def _drain(self) -> None:
+        stop = False
+        while not stop:
+            batches = [self._queue.get()]
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: List[str] = []
+            for batch in batches:
+                if batch is None:
+                    stop = True
+                    continue
+                lines.extend(self._format(batch))
+            if not lines:
+                continue
+            try:
+                self._write(lines)
+            except OSError:
+                pass
+
+    def _format(self, spans: Sequence[Span]) -> List[str]:
+        return [json.dumps(span.to_dict(), ensure_ascii=False, default=str) for span in spans]
+
+    def _write(self, lines: List[str]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+class OtlpJsonSpanExporter(JsonlSpanExporter):
+    STATUS_CODES = {"ok": 1, "error": 2}
+    SPAN_KIND_INTERNAL = 1
+
+    def __init__(self, path: str | Path, service_name: str = "charlie") -> None:
+        super().__init__(path)
+        self.service_name = service_name
+
+    def _format(self, spans: Sequence[Span]) -> List[str]:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": self._build_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "core.general.tracing"},
+                            "spans": [self._build_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        return [json.dumps(payload, ensure_ascii=False, default=str)]
+
+    @classmethod
+    def _build_span(cls, span: Span) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": cls.SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+            "attributes": cls._build_attributes(span.attributes),
+            "events": [
+                {
+                    "timeUnixNano": str(event["time_ns"]),
+                    "name": event["name"],
+                    "attributes": cls._build_attributes(event.get("attributes") or {}),
+                }
+                for event in span.events
+            ],
+            "status": {"code": cls.STATUS_CODES.get(span.status, 0)},
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        if span.status_message:
+            data["status"]["message"] = span.status_message
+        return data
+
+    @classmethod
+    def _build_attributes(cls, attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{"key": str(key), "value": cls._build_value(value)} for key, value in attributes.items()]
+
+    @staticmethod
+    def _build_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        if isinstance(value, (list, tuple)):
+            return {"arrayValue": {"values": [OtlpJsonSpanExporter._build_value(v) for v in value]}}
+        return {"stringValue": str(value)}
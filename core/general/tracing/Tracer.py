@@ -0,0 +1,227 @@
+import contextvars
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from core.general import Config
+
+if TYPE_CHECKING:
+    from core.interfaces import ISpanExporter
+
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("charlie_current_span", default=None)
+
+_UNSET: Any = object()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_time_ns: int = 0
+    end_time_ns: int | None = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "ok"
+    status_message: str = ""
+    _started: float = 0.0
+    _tracer: Optional["Tracer"] = None
+
+    @property
+    def recording(self) -> bool:
+        return self._tracer is not None and self.end_time_ns is None
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end_time_ns is None:
+            return self.elapsed_ms()
+        return (self.end_time_ns - self.start_time_ns) / 1_000_000
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self._started) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> "Span":
+        if self._tracer is not None:
+            self.attributes[key] = value
+        return self
+
+    def set_attributes(self, **attributes: Any) -> "Span":
+        if self._tracer is not None:
+            self.attributes.update(attributes)
+        return self
+
+    def add_event(self, name: str, **attributes: Any) -> "Span":
+        if self._tracer is not None:
+            self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+        return self
+
+    def set_error(self, exc: BaseException | str) -> "Span":
+        if self._tracer is not None:
+            self.status = "error"
+            self.status_message = exc if isinstance(exc, str) else f"{type(exc).__name__}: {exc}"
+        return self
+
+    def end(self, at: float | None = None) -> None:
+        tracer = self._tracer
+        if tracer is None or self.end_time_ns is not None:
+            return
+        finished = time.monotonic() if at is None else at
+        self.end_time_ns = self.start_time_ns + max(0, int((finished - self._started) * 1_000_000_000))
+        tracer._finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "status_message": self.status_message,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+NOOP_SPAN = Span(name="", trace_id="", span_id="")
+
+
+class Tracer:
+    def __init__(self, exporter: "ISpanExporter | None" = None, service_name: str = "charlie") -> None:
+        self.exporter = exporter
+        self.service_name = service_name
+        self._pending: Dict[str, List[Span]] = {}
+        self._open: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "Tracer":
+        if not Config.TRACING_ENABLED:
+            return cls()
+
+        from core.general.tracing.SpanExporters import JsonlSpanExporter, OtlpJsonSpanExporter
+
+        exporter: "ISpanExporter"
+        if Config.TRACING_EXPORTER == "jsonl":
+            exporter = JsonlSpanExporter(Config.TRACING_PATH)
+        elif Config.TRACING_EXPORTER == "otlp":
+            exporter = OtlpJsonSpanExporter(Config.TRACING_PATH, service_name=Config.TRACING_SERVICE_NAME)
+        else:
+            raise ValueError(f"Неизвестный экспортер трассировки: {Config.TRACING_EXPORTER}")
+        return cls(exporter, service_name=Config.TRACING_SERVICE_NAME)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        parent: Span | None = _UNSET,
+        start_at: float | None = None,
+        **attributes: Any,
+    ) -> Span:
+        if self.exporter is None:
+            return NOOP_SPAN
+
+        if parent is _UNSET:
+            parent = _current_span.get()
+        if parent is not None and not parent.trace_id:
+            parent = None
+
+        now = time.monotonic()
+        started = now if start_at is None else start_at
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            start_time_ns=time.time_ns() - int((now - started) * 1_000_000_000),
+            attributes=attributes,
+            _started=started,
+            _tracer=self,
+        )
+        with self._lock:
+            self._open[span.trace_id] = self._open.get(span.trace_id, 0) + 1
+        return span
+
+    @contextmanager
+    def span(self, name: str, parent: Span | None = _UNSET, **attributes: Any) -> Iterator[Span]:
+        span = self.start_span(name, parent, **attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except Exception as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            span.end()
+
+    @contextmanager
+    def activate(self, span: Span) -> Iterator[Span]:
+        if not span.recording:
+            yield span
+            return
+
+        previous = _current_span.get()
+        _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.set(previous)
+
+    @staticmethod
+    def current_span() -> Span | None:
+        return _current_span.get()
+
+    def _finish(self, span: Span) -> None:
+        ready: List[Span] | None = None
+        with self._lock:
+            self._pending.setdefault(span.trace_id, []).append(span)
+            left = self._open.get(span.trace_id, 1) - 1
+            if left <= 0:
+                self._open.pop(span.trace_id, None)
+                ready = self._pending.pop(span.trace_id)
+            else:
+                self._open[span.trace_id] = left
+
+        if ready and self.exporter is not None:
+            self.exporter.export(ready)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            leftovers = [span for spans in self._pending.values() for span in spans]
+            self._pending.clear()
+            self._open.clear()
+        if self.exporter is not None:
+            if leftovers:
+                self.exporter.export(leftovers)
+            self.exporter.shutdown()
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_config()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+    return tracer
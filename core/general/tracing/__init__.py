@@ -0,0 +1,12 @@
+from core.general.tracing.Tracer import NOOP_SPAN, Span, Tracer, get_tracer, set_tracer
+from core.general.tracing.SpanExporters import JsonlSpanExporter, OtlpJsonSpanExporter
+
+__all__ = [
+    "NOOP_SPAN",
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "set_tracer",
+    "JsonlSpanExporter",
+    "OtlpJsonSpanExporter",
+]
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterator
+
+
+class ICacheBackend(ABC):
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def keys(self) -> list[str]:
+        raise NotImplementedError
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        for key in self.keys():
+            value = self.get(key)
+            if value is not None:
+                yield key, value
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def refresh(self) -> list[str] | None:
+        return []
+
+    def close(self) -> None:
+        return
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from core.general.tracing.Tracer import Span
+
+
+class ISpanExporter(ABC):
+
+    @abstractmethod
+    def export(self, spans: Sequence["Span"]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        return
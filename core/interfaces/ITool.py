@@ -13,4 +13,8 @@ class ITool:
 
     @classmethod
     def get_commands(cls):
-        return deepcopy(cls.commands)
\ No newline at end of file
+        return deepcopy(cls.commands)
+
+    @classmethod
+    def get_commands_view(cls) -> tuple[ToolClassSetupObject, ...]:
+        return tuple(cls.commands)
@@ -1,7 +1,11 @@
 from .ITool import ITool
 from .ICommand import ICommand
+from .ISpanExporter import ISpanExporter
+from .ICacheBackend import ICacheBackend
 
 __all__ = [
     "ITool",
     "ICommand",
+    "ISpanExporter",
+    "ICacheBackend",
 ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+from typing import AsyncGenerator, AsyncIterable
+
+from openai.types.responses import ResponseInputParam
+
+from core.general.tracing import Span
+from core.types.ai import AIResponseChunk
+from core.providers.BaseAIProvider import BaseAIProvider
+
+
+class AsyncBaseAIProvider(BaseAIProvider):
+
+    async def generate_response(self, messages: ResponseInputParam, **kwargs) -> AsyncGenerator[AIResponseChunk, None]: # type: ignore[override]
+        raise NotImplementedError("This method should be implemented by subclasses.")
+        yield
+
+    async def _arecord_chunks(self, chunks: AsyncIterable[AIResponseChunk]) -> AsyncGenerator[AIResponseChunk, None]:
+        if self.recorder is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        turn = self.recorder.start_turn(type(self).__name__, self.model_name)
+        try:
+            async for chunk in chunks:
+                turn.write(chunk)
+                yield chunk
+        finally:
+            turn.close()
+
+    async def _atrace_chunks(self, chunks: AsyncIterable[AIResponseChunk], span: Span) -> AsyncGenerator[AIResponseChunk, None]:
+        count = 0
+        try:
+            async for chunk in chunks:
+                if count == 0:
+                    span.set_attribute("first_chunk_ms", round(span.elapsed_ms(), 3))
+                count += 1
+                yield chunk
+        except Exception as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            span.set_attribute("chunks", count)
+            span.end()
@@ -0,0 +1,60 @@
+from typing import AsyncGenerator, AsyncIterator, Iterable
+
+from ollama import AsyncClient, ChatResponse
+from openai.types.responses import ResponseInputParam
+
+from core.exeptions import NoClientError
+from core.types.ai import AIChunk
+from core.providers.AsyncBaseAIProvider import AsyncBaseAIProvider
+from core.providers.OllamaAIProvider import OllamaAIProvider
+
+
+class AsyncOllamaAIProvider(AsyncBaseAIProvider, OllamaAIProvider):
+
+    def provider_setup(self):
+        headers: dict[str, str] | None = None
+        if self.api_key:
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        self.client = AsyncClient(host=self.api_base, headers=headers)
+
+    async def generate_response(self, messages: ResponseInputParam, **kwargs) -> AsyncGenerator[AIChunk, None]: # type: ignore[override]
+        if not self.client:
+            raise NoClientError("AsyncOllamaAIProvider")
+
+        span = self._start_request_span(messages, kwargs)
+        call_kwargs = self._build_call_kwargs(kwargs)
+        ollama_messages = self._coerce_messages(messages)
+
+        chunks: AsyncIterator[AIChunk]
+        try:
+            if not call_kwargs["stream"]:
+                data: ChatResponse = await self.client.chat(
+                    model=self.model_name,
+                    messages=ollama_messages,
+                    **call_kwargs,
+                )
+                chunks = self._aiter_chunks(self._build_response_chunks(data, self.keep_raw_events))
+            else:
+                stream = await self.client.chat(
+                    model=self.model_name,
+                    messages=ollama_messages,
+                    **call_kwargs,
+                )
+                chunks = (chunk async for part in stream for chunk in self._build_stream_chunks(part, self.keep_raw_events))
+        except Exception as exc:
+            span.set_error(exc).end()
+            raise
+        span.set_attribute("open_ms", round(span.elapsed_ms(), 3))
+
+        if self.recorder is not None:
+            chunks = self._arecord_chunks(chunks)
+        if span.recording:
+            chunks = self._atrace_chunks(chunks, span)
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    async def _aiter_chunks(chunks: Iterable[AIChunk]) -> AsyncIterator[AIChunk]:
+        for chunk in chunks:
+            yield chunk
@@ -0,0 +1,70 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Sequence
+
+from openai import AsyncOpenAI, BadRequestError, NotFoundError
+from openai.types.responses import ResponseInputParam
+
+from core.exeptions import NoClientError
+from core.types.ai import AIChunk, ResponseChain
+from core.providers.AsyncBaseAIProvider import AsyncBaseAIProvider
+from core.providers.OpenAIProvider import OpenAIProvider
+
+
+class AsyncOpenAIProvider(AsyncBaseAIProvider, OpenAIProvider):
+
+    def provider_setup(self):
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_base,
+        )
+
+    async def generate_response( # type: ignore[override]
+        self,
+        messages: ResponseInputParam,
+        chain: ResponseChain | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[AIChunk, None]:
+        if not self.client:
+            raise NoClientError("AsyncOpenAIProvider")
+
+        span = self._start_request_span(messages, kwargs)
+        try:
+            input_items, call_kwargs = self._build_chain_kwargs(messages, chain, self._build_tools_kwargs(kwargs))
+            try:
+                stream = await self.client.responses.create(model=self.model_name, input=input_items, **call_kwargs)
+            except (BadRequestError, NotFoundError):
+                if chain is None or "previous_response_id" not in call_kwargs:
+                    raise
+                chain.reset()
+                span.add_event("chain_fallback")
+                input_items, call_kwargs = self._build_chain_kwargs(messages, chain, call_kwargs)
+                stream = await self.client.responses.create(model=self.model_name, input=input_items, **call_kwargs)
+        except Exception as exc:
+            span.set_error(exc).end()
+            raise
+        span.set_attributes(
+            open_ms=round(span.elapsed_ms(), 3),
+            input_items=len(input_items),
+            continued="previous_response_id" in call_kwargs,
+        )
+
+        chunks = (self._build_chunk(event, self.keep_raw_events) async for event in stream)
+        if chain is not None and self.continuation:
+            chunks = self._aadvance_chain(chunks, chain, messages)
+        if self.recorder is not None:
+            chunks = self._arecord_chunks(chunks)
+        if span.recording:
+            chunks = self._atrace_chunks(chunks, span)
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    async def _aadvance_chain(
+        chunks: AsyncIterable[AIChunk],
+        chain: ResponseChain,
+        messages: Sequence[Any],
+    ) -> AsyncGenerator[AIChunk, None]:
+        covered = len(messages)
+        async for chunk in chunks:
+            if chunk.kind == AIChunk.KIND_DONE and chunk.response_id:
+                chain.advance(chunk.response_id, messages, covered)
+            yield chunk
@@ -0,0 +1,35 @@
+import asyncio
+import time
+from typing import AsyncGenerator
+
+from openai.types.responses import ResponseInputParam
+
+from core.exeptions import NoClientError
+from core.types.ai import AIChunk
+from core.providers.AsyncBaseAIProvider import AsyncBaseAIProvider
+from core.providers.ReplayProvider import ReplayProvider
+
+
+class AsyncReplayProvider(AsyncBaseAIProvider, ReplayProvider):
+
+    async def generate_response(self, messages: ResponseInputParam, **kwargs) -> AsyncGenerator[AIChunk, None]: # type: ignore[override]
+        if not self.client:
+            raise NoClientError("AsyncReplayProvider")
+
+        span = self._start_request_span(messages, kwargs)
+        chunks = self._aiter_replay_chunks()
+        if span.recording:
+            chunks = self._atrace_chunks(chunks, span)
+        async for chunk in chunks:
+            yield chunk
+
+    async def _aiter_replay_chunks(self) -> AsyncGenerator[AIChunk, None]:
+        started = time.monotonic()
+        for offset, record in self._iter_turn():
+            if self.realtime:
+                delay = started + offset - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            yield AIChunk.from_record(record)
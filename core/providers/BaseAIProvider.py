@@ -1,8 +1,11 @@
-from typing import Any, Generator
+from typing import Any, Generator, Iterable
 
 from openai.types.responses import ResponseInputParam
 
+from core.general import Config
+from core.general.tracing import Span, Tracer, get_tracer
 from core.types.ai import AIResponseChunk
+from core.providers.ChunkRecorder import ChunkRecorder
 
 
 class BaseAIProvider:
@@ -10,11 +13,16 @@ class BaseAIProvider:
     REQUIRES_API_KEY: bool = True
     REQUIRES_API_BASE: bool = True
 
+    continuation: bool = False
+
     def __init__(self, api_key: str, api_base: str) -> None:
         self.api_key = api_key
         self.api_base = api_base
         self.client = None
         self.model_name = ''
+        self.keep_raw_events = Config.PROVIDERS_KEEP_RAW_EVENTS
+        self.recorder: ChunkRecorder | None = ChunkRecorder(Config.PROVIDERS_RECORD_PATH) if Config.PROVIDERS_RECORD_PATH else None
+        self.tracer: Tracer = get_tracer()
     
         self._provider_setup()
 
@@ -29,6 +37,44 @@ class BaseAIProvider:
     def generate_response(self, messages: ResponseInputParam , **kwargs) -> Generator[AIResponseChunk, None, None]:
         raise NotImplementedError("This method should be implemented by subclasses.")
 
+    def _record_chunks(self, chunks: Iterable[AIResponseChunk]) -> Generator[AIResponseChunk, None, None]:
+        if self.recorder is None:
+            yield from chunks
+            return
+
+        turn = self.recorder.start_turn(type(self).__name__, self.model_name)
+        try:
+            for chunk in chunks:
+                turn.write(chunk)
+                yield chunk
+        finally:
+            turn.close()
+
+    def _start_request_span(self, messages: Any, kwargs: dict[str, Any]) -> Span:
+        return self.tracer.start_span(
+            "provider.request",
+            provider=type(self).__name__,
+            model=self.model_name,
+            messages=len(messages or ()),
+            tools=len(kwargs.get("tools") or ()),
+            stream=bool(kwargs.get("stream", True)),
+        )
+
+    def _trace_chunks(self, chunks: Iterable[AIResponseChunk], span: Span) -> Generator[AIResponseChunk, None, None]:
+        count = 0
+        try:
+            for chunk in chunks:
+                if count == 0:
+                    span.set_attribute("first_chunk_ms", round(span.elapsed_ms(), 3))
+                count += 1
+                yield chunk
+        except Exception as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            span.set_attribute("chunks", count)
+            span.end()
+
     def add_assistant_message(
         self,
         messages: list[dict[str, Any]],
@@ -57,4 +103,16 @@ class BaseAIProvider:
     
     def set_model(self, model_name: str):
         self.model_name = model_name
-        return self
\ No newline at end of file
+        return self
+
+    def set_keep_raw_events(self, enabled: bool):
+        self.keep_raw_events = bool(enabled)
+        return self
+
+    def set_recorder(self, recorder: ChunkRecorder | None):
+        self.recorder = recorder
+        return self
+
+    def set_tracer(self, tracer: Tracer):
+        self.tracer = tracer
+        return self
@@ -0,0 +1,110 @@
+import itertools
+import json
+import threading
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.types.ai import AIChunk
+
+
+class ChunkRecorderTurn:
+    def __init__(self, recorder: "ChunkRecorder", turn_id: int) -> None:
+        self._recorder = recorder
+        self.turn_id = turn_id
+        self._started = time.monotonic()
+        self._lines: List[str] = []
+
+    def write(self, chunk: AIChunk) -> None:
+        self._lines.append(
+            json.dumps(
+                {"turn": self.turn_id, "offset": round(time.monotonic() - self._started, 6), "chunk": chunk.to_record()},
+                ensure_ascii=False,
+                default=str,
+            )
+        )
+
+    def close(self) -> None:
+        self._recorder._flush(self._lines)
+        self._lines = []
+
+
+class ChunkRecorder:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._turn_ids = itertools.count(self._next_turn_id())
+
+    def start_turn(self, provider: str, model: str) -> ChunkRecorderTurn:
+        turn = ChunkRecorderTurn(self, next(self._turn_ids))
+        turn._lines.append(
+            json.dumps(
+                {
+                    "turn": turn.turn_id,
+                    "provider": provider,
+                    "model": model,
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                },
+                ensure_ascii=False,
+            )
+        )
+        return turn
+
+    def _flush(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def _next_turn_id(self) -> int:
+        try:
+            turns = ChunkRecording.load(self.path).turns
+        except (OSError, ValueError):
+            return 0
+        return max((turn["turn"] for turn in turns), default=-1) + 1
+
+
+class ChunkRecording:
+    def __init__(self, turns: List[Dict[str, Any]]) -> None:
+        self.turns = turns
+        self._position = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ChunkRecording":
+        turns: Dict[int, Dict[str, Any]] = {}
+        with Path(path).open("r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Некорректная строка записи {path}:{line_no}: {exc}") from exc
+
+                turn_id = record.get("turn")
+                if not isinstance(turn_id, int):
+                    continue
+                turn = turns.setdefault(turn_id, {"turn": turn_id, "provider": "", "model": "", "chunks": []})
+                if "chunk" in record:
+                    turn["chunks"].append((float(record.get("offset") or 0.0), record["chunk"]))
+                else:
+                    turn["provider"] = record.get("provider") or ""
+                    turn["model"] = record.get("model") or ""
+        return cls(list(turns.values()))
+
+    def next_turn(self) -> Dict[str, Any]:
+        if not self.turns:
+            raise ValueError("Запись не содержит ни одного хода")
+        with self._lock:
+            turn = self.turns[self._position % len(self.turns)]
+            self._position += 1
+        return turn
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._position = 0
@@ -1,12 +1,12 @@
 import json
-from typing import Any, Generator
+from typing import Any, Generator, Iterable
 
-from ollama import Client, ChatResponse
+from ollama import Client, ChatResponse, Tool
 from openai.types.responses import ResponseInputParam
 
 from core.general import Config
 from core.exeptions import NoClientError
-from core.types.ai import OllamaAIResponseChunk
+from core.types.ai import AIChunk, ToolSet
 from core.providers.BaseAIProvider import BaseAIProvider
 
 
@@ -15,6 +15,8 @@ class OllamaAIProvider(BaseAIProvider):
     REQUIRES_API_BASE = False
 
     def __init__(self):
+        self._tool_models: dict[str, Tool] = {}
+        self._coerced_messages: dict[int, tuple[dict[str, Any], dict[str, Any]]] = {}
         super().__init__(
             api_key=Config.OLLAMA_API_KEY,
             api_base=Config.OLLAMA_API_BASE
@@ -27,150 +29,179 @@ class OllamaAIProvider(BaseAIProvider):
 
         self.client = Client(host=self.api_base, headers=headers)
 
-    @staticmethod
-    def _coerce_messages(messages: ResponseInputParam) -> list[dict[str, Any]]:
+    def _coerce_messages(self, messages: ResponseInputParam) -> list[dict[str, Any]]:
+        cache = self._coerced_messages
         coerced: list[dict[str, Any]] = []
-        for msg in list(messages):
+        for msg in messages:
             if not isinstance(msg, dict):
                 continue
-            role = msg.get("role")
-            if role not in {"system", "user", "assistant", "tool"}:
+            hit = cache.get(id(msg))
+            if hit is not None and hit[0] is msg:
+                coerced.append(hit[1])
                 continue
 
-            content = msg.get("content")
-            content_str = content if isinstance(content, str) else str(content or "")
-
-            if role == "tool":
-                tool_name = msg.get("tool_name") or msg.get("name")
-                if isinstance(tool_name, str) and tool_name:
-                    coerced.append({"role": "tool", "tool_name": tool_name, "content": content_str})  # type: ignore[typeddict-item]
-                else:
-                    coerced.append({"role": "tool", "content": content_str})
-            elif role == "assistant":
-                out: dict[str, Any] = {"role": "assistant", "content": content_str}
-                thinking = msg.get("thinking")
-                if isinstance(thinking, str) and thinking:
-                    out["thinking"] = thinking
-                tool_calls = msg.get("tool_calls")
-                if isinstance(tool_calls, list):
-                    out["tool_calls"] = tool_calls
-                coerced.append(out)
-            else:
-                coerced.append({"role": str(role), "content": content_str})
+            out = self._coerce_message(msg)
+            if out is None:
+                continue
+            cache[id(msg)] = (msg, out)
+            coerced.append(out)
 
+        if len(cache) > 2 * len(coerced) + 64:
+            self._coerced_messages = {id(msg): cache[id(msg)] for msg in messages if id(msg) in cache}
         return coerced
 
+    @staticmethod
+    def _coerce_message(msg: dict[str, Any]) -> dict[str, Any] | None:
+        role = msg.get("role")
+        if role not in {"system", "user", "assistant", "tool"}:
+            return None
+
+        content = msg.get("content")
+        content_str = content if isinstance(content, str) else str(content or "")
+
+        if role == "tool":
+            tool_name = msg.get("tool_name") or msg.get("name")
+            if isinstance(tool_name, str) and tool_name:
+                return {"role": "tool", "tool_name": tool_name, "content": content_str}
+            return {"role": "tool", "content": content_str}
+        if role == "assistant":
+            out: dict[str, Any] = {"role": "assistant", "content": content_str}
+            thinking = msg.get("thinking")
+            if isinstance(thinking, str) and thinking:
+                out["thinking"] = thinking
+            tool_calls = msg.get("tool_calls")
+            if isinstance(tool_calls, list):
+                out["tool_calls"] = tool_calls
+            return out
+        return {"role": str(role), "content": content_str}
+
     @staticmethod
     def _get_field(obj: Any, key: str) -> Any:
         if isinstance(obj, dict):
             return obj.get(key)
         return getattr(obj, key, None)
 
-    def generate_response(self, messages: ResponseInputParam, **kwargs) -> Generator[OllamaAIResponseChunk, None, None]:
+    def generate_response(self, messages: ResponseInputParam, **kwargs) -> Generator[AIChunk, None, None]:
         if not self.client:
             raise NoClientError("OllamaAIProvider")
 
+        span = self._start_request_span(messages, kwargs)
+        call_kwargs = self._build_call_kwargs(kwargs)
+        ollama_messages = self._coerce_messages(messages)
+
+        chunks: Iterable[AIChunk]
+        try:
+            if not call_kwargs["stream"]:
+                data: ChatResponse = self.client.chat(
+                    model=self.model_name,
+                    messages=ollama_messages,
+                    **call_kwargs,
+                )
+                chunks = self._build_response_chunks(data, self.keep_raw_events)
+            else:
+                stream = self.client.chat(
+                    model=self.model_name,
+                    messages=ollama_messages,
+                    **call_kwargs,
+                )
+                chunks = (chunk for part in stream for chunk in self._build_stream_chunks(part, self.keep_raw_events))
+        except Exception as exc:
+            span.set_error(exc).end()
+            raise
+        span.set_attribute("open_ms", round(span.elapsed_ms(), 3))
+
+        if self.recorder is not None:
+            chunks = self._record_chunks(chunks)
+        if span.recording:
+            chunks = self._trace_chunks(chunks, span)
+        yield from chunks
+
+    def _build_call_kwargs(self, kwargs: dict[str, Any]) -> dict[str, Any]:
         stream = bool(kwargs.get("stream", True))
         tools = kwargs.get("tools")
 
         allowed_passthrough = {"format", "options", "keep_alive", "think"}
         call_kwargs: dict[str, Any] = {k: v for k, v in kwargs.items() if k in allowed_passthrough}
-        if tools is not None:
+        if isinstance(tools, ToolSet):
+            call_kwargs["tools"] = self._get_tool_models(tools)
+        elif tools is not None:
             call_kwargs["tools"] = tools
         call_kwargs["stream"] = stream
+        return call_kwargs
+
+    def _get_tool_models(self, tools: ToolSet) -> list[Tool]:
+        models: list[Tool] = []
+        for spec in tools.specs:
+            model = self._tool_models.get(spec.content_hash)
+            if model is None:
+                model = Tool.model_validate(spec.definition)
+                self._tool_models[spec.content_hash] = model
+            models.append(model)
+        return models
+
+    @classmethod
+    def _build_response_chunks(cls, data: Any, keep_raw: bool = False) -> Generator[AIChunk, None, None]:
+        msg = cls._get_field(data, "message") or {}
+        text = cls._get_field(msg, "content") or ""
+        if not isinstance(text, str):
+            text = str(text)
+
+        yield AIChunk(
+            AIChunk.KIND_CONTENT,
+            "ollama.chat.done",
+            ai_content_part=text,
+            event=data if keep_raw else None,
+        )
+        yield from cls._build_tool_call_chunks(data if keep_raw else None, cls._get_field(msg, "tool_calls"))
 
-        ollama_messages = self._coerce_messages(messages)
+    @classmethod
+    def _build_stream_chunks(cls, part: Any, keep_raw: bool = False) -> Generator[AIChunk, None, None]:
+        msg = cls._get_field(part, "message") or {}
+        event = part if keep_raw else None
 
-        if not stream:
-            data: ChatResponse = self.client.chat(
-                model=self.model_name,
-                messages=ollama_messages,
-                **call_kwargs,
-            )
+        delta = cls._get_field(msg, "content") or ""
+        if isinstance(delta, str) and delta:
+            yield AIChunk(AIChunk.KIND_CONTENT, "ollama.chat.delta", ai_content_part=delta, event=event)
 
-            msg = self._get_field(data, "message") or {}
-            text = self._get_field(msg, "content") or ""
-            if not isinstance(text, str):
-                text = str(text)
+        yield from cls._build_tool_call_chunks(event, cls._get_field(msg, "tool_calls"))
 
-            yield OllamaAIResponseChunk(event=data, event_type="ollama.chat.done", ai_content_part=text)
-
-            tool_calls = self._get_field(msg, "tool_calls")
-            if isinstance(tool_calls, list):
-                for i, tc in enumerate(tool_calls):
-                    fn = self._get_field(tc, "function") or {}
-                    fn_name = self._get_field(fn, "name") or ""
-                    fn_args = self._get_field(fn, "arguments")
-                    if isinstance(fn_args, str):
-                        args_str = fn_args
-                    else:
-                        try:
-                            args_str = json.dumps(fn_args or {}, ensure_ascii=False)
-                        except Exception:
-                            args_str = str(fn_args or "")
-
-                    idx = self._get_field(fn, "index")
-                    tool_idx = int(idx) if isinstance(idx, int) else i
-
-                    yield OllamaAIResponseChunk(
-                        event=data,
-                        event_type="ollama.tool_call",
-                        tool_call_index=tool_idx,
-                        tool_call={
-                            "type": "function_call",
-                            "id": "",
-                            "call_id": "",
-                            "name": str(fn_name),
-                            "arguments": args_str,
-                        },
-                    )
+        if cls._get_field(part, "done") is True:
+            yield AIChunk(AIChunk.KIND_DONE, "ollama.chat.done", event=event)
 
+    @classmethod
+    def _build_tool_call_chunks(cls, event: Any, tool_calls: Any) -> Generator[AIChunk, None, None]:
+        if not isinstance(tool_calls, list) or not tool_calls:
             return
 
-        for part in self.client.chat(
-            model=self.model_name,
-            messages=ollama_messages,
-            **call_kwargs,
-        ):
-            msg = self._get_field(part, "message") or {}
-
-            delta = self._get_field(msg, "content") or ""
-            if isinstance(delta, str) and delta:
-                yield OllamaAIResponseChunk(event=part, event_type="ollama.chat.delta", ai_content_part=delta)
-
-            tool_calls = self._get_field(msg, "tool_calls")
-            if isinstance(tool_calls, list) and tool_calls:
-                for i, tc in enumerate(tool_calls):
-                    fn = self._get_field(tc, "function") or {}
-                    fn_name = self._get_field(fn, "name") or ""
-                    fn_args = self._get_field(fn, "arguments")
-
-                    if isinstance(fn_args, str):
-                        args_str = fn_args
-                    else:
-                        try:
-                            args_str = json.dumps(fn_args or {}, ensure_ascii=False)
-                        except Exception:
-                            args_str = str(fn_args or "")
-
-                    idx = self._get_field(fn, "index")
-                    tool_idx = int(idx) if isinstance(idx, int) else i
-
-                    yield OllamaAIResponseChunk(
-                        event=part,
-                        event_type="ollama.tool_call",
-                        tool_call_index=tool_idx,
-                        tool_call={
-                            "type": "function_call",
-                            "id": "",
-                            "call_id": "",
-                            "name": str(fn_name),
-                            "arguments": args_str,
-                        },
-                    )
-
-            if self._get_field(part, "done") is True:
-                yield OllamaAIResponseChunk(event=part, event_type="ollama.chat.done")
+        for i, tc in enumerate(tool_calls):
+            fn = cls._get_field(tc, "function") or {}
+            fn_name = cls._get_field(fn, "name") or ""
+            fn_args = cls._get_field(fn, "arguments")
+
+            if isinstance(fn_args, str):
+                args_str = fn_args
+            else:
+                try:
+                    args_str = json.dumps(fn_args or {}, ensure_ascii=False)
+                except Exception:
+                    args_str = str(fn_args or "")
+
+            idx = cls._get_field(fn, "index")
+            tool_idx = int(idx) if isinstance(idx, int) else i
+
+            yield AIChunk.for_tool_call(
+                AIChunk.KIND_TOOL_CALL,
+                "ollama.tool_call",
+                event=event,
+                tool_call_index=tool_idx,
+                tool_call={
+                    "type": "function_call",
+                    "id": "",
+                    "call_id": "",
+                    "name": str(fn_name),
+                    "arguments": args_str,
+                },
+            )
 
     def add_assistant_message(self, messages: list[dict[str, Any]], *, content: str, tool_calls: list[dict[str, Any]]) -> None:
         if not content.strip() and not tool_calls:
@@ -1,15 +1,16 @@
-from openai import OpenAI, Stream
+from openai import BadRequestError, NotFoundError, OpenAI, Stream
 from openai.types.responses import ResponseInputParam, ResponseStreamEvent
 
-from typing import Any, Generator, cast
+from typing import Any, Generator, Iterable, Sequence, cast
 
 from core.general import Config
 from core.exeptions import NoClientError
-from core.types.ai import OpenRouterAIResponseChunk
+from core.types.ai import AIChunk, ResponseChain, ToolSet
 from core.providers.BaseAIProvider import BaseAIProvider
 
 class OpenAIProvider(BaseAIProvider):
     def __init__(self):
+        self.continuation = Config.OPENAI_CONTINUATION
         super().__init__(
             api_key=Config.OPENAI_API_KEY,
             api_base=Config.OPENAI_API_BASE
@@ -21,99 +22,179 @@ class OpenAIProvider(BaseAIProvider):
             base_url=self.api_base,
         )
     
-    def generate_response(self, messages: ResponseInputParam, **kwargs) -> Generator[OpenRouterAIResponseChunk, None, None]:
+    def set_continuation(self, enabled: bool = True):
+        self.continuation = bool(enabled)
+        return self
+
+    def generate_response(
+        self,
+        messages: ResponseInputParam,
+        chain: ResponseChain | None = None,
+        **kwargs,
+    ) -> Generator[AIChunk, None, None]:
         if not self.client:
             raise NoClientError("OpenAIProvider")
 
-        def _get_field(obj: Any, key: str) -> Any:
-            if isinstance(obj, dict):
-                return obj.get(key)
-            return getattr(obj, key, None)
-
-        for event in self.client.responses.create(
-            model=self.model_name,
-            input=messages,
-            **kwargs,
-        ):
-            data = cast(ResponseStreamEvent, event)
-            event_type = _get_field(data, "type") or ""
-
-            chunk: OpenRouterAIResponseChunk = {
-                "event": data,
-                "event_type": str(event_type),
-            }
+        span = self._start_request_span(messages, kwargs)
+        try:
+            input_items, call_kwargs = self._build_chain_kwargs(messages, chain, self._build_tools_kwargs(kwargs))
+            try:
+                stream = self.client.responses.create(model=self.model_name, input=input_items, **call_kwargs)
+            except (BadRequestError, NotFoundError):
+                if chain is None or "previous_response_id" not in call_kwargs:
+                    raise
+                chain.reset()
+                span.add_event("chain_fallback")
+                input_items, call_kwargs = self._build_chain_kwargs(messages, chain, call_kwargs)
+                stream = self.client.responses.create(model=self.model_name, input=input_items, **call_kwargs)
+        except Exception as exc:
+            span.set_error(exc).end()
+            raise
+        span.set_attributes(
+            open_ms=round(span.elapsed_ms(), 3),
+            input_items=len(input_items),
+            continued="previous_response_id" in call_kwargs,
+        )
 
-            if event_type == "response.output_text.delta":
-                delta = _get_field(data, "delta")
-                if isinstance(delta, str) and delta:
-                    chunk["ai_content_part"] = delta
-
-            elif event_type == "response.output_item.added":
-                item = _get_field(data, "item")
-                item_type = _get_field(item, "type")
-                if item_type == "function_call":
-                    output_index = _get_field(data, "output_index")
-                    if isinstance(output_index, int):
-                        chunk["tool_call_index"] = output_index
-
-                    tool_call: dict[str, Any] = {
-                        "type": "function_call",
-                        "id": _get_field(item, "id") or "",
-                        "call_id": _get_field(item, "call_id") or "",
-                        "name": _get_field(item, "name") or "",
-                        "arguments": _get_field(item, "arguments") or "",
-                    }
-                    chunk["tool_call"] = cast(Any, tool_call)
-                    if tool_call.get("id"):
-                        chunk["tool_call_id"] = cast(str, tool_call["id"])
-
-            elif event_type == "response.function_call_arguments.delta":
-                delta = _get_field(data, "delta")
-                if isinstance(delta, str) and delta:
-                    chunk["tool_call_arguments_delta"] = delta
-
-                output_index = _get_field(data, "output_index")
-                if isinstance(output_index, int):
-                    chunk["tool_call_index"] = output_index
-
-                item_id = _get_field(data, "item_id")
-                if isinstance(item_id, str) and item_id:
-                    chunk["tool_call_id"] = item_id
-
-            elif event_type == "response.function_call_arguments.done":
-                arguments = _get_field(data, "arguments")
-                if isinstance(arguments, str):
-                    chunk["tool_call_arguments"] = arguments
-
-                output_index = _get_field(data, "output_index")
-                if isinstance(output_index, int):
-                    chunk["tool_call_index"] = output_index
-
-                item_id = _get_field(data, "item_id")
-                if isinstance(item_id, str) and item_id:
-                    chunk["tool_call_id"] = item_id
-
-            elif event_type == "response.output_item.done":
-                item = _get_field(data, "item")
-                item_type = _get_field(item, "type")
-                if item_type == "function_call":
-                    output_index = _get_field(data, "output_index")
-                    if isinstance(output_index, int):
-                        chunk["tool_call_index"] = output_index
-
-                    tool_call: dict[str, Any] = {
-                        "type": "function_call",
-                        "id": _get_field(item, "id") or "",
-                        "call_id": _get_field(item, "call_id") or "",
-                        "name": _get_field(item, "name") or "",
-                        "arguments": _get_field(item, "arguments") or "",
-                    }
-                    chunk["tool_call"] = cast(Any, tool_call)
-                    if tool_call.get("id"):
-                        chunk["tool_call_id"] = cast(str, tool_call["id"])
+        chunks = (self._build_chunk(event, self.keep_raw_events) for event in stream)
+        if chain is not None and self.continuation:
+            chunks = self._advance_chain(chunks, chain, messages)
+        if self.recorder is not None:
+            chunks = self._record_chunks(chunks)
+        if span.recording:
+            chunks = self._trace_chunks(chunks, span)
+        yield from chunks
 
+    def _build_chain_kwargs(
+        self,
+        messages: Any,
+        chain: ResponseChain | None,
+        call_kwargs: dict[str, Any],
+    ) -> tuple[Any, dict[str, Any]]:
+        if chain is None or not self.continuation:
+            return messages, call_kwargs
+
+        call_kwargs = {k: v for k, v in call_kwargs.items() if k != "previous_response_id"}
+        call_kwargs["store"] = True
+        if chain.matches(messages):
+            call_kwargs["previous_response_id"] = chain.response_id
+            return chain.pending_items(messages), call_kwargs
+
+        chain.reset()
+        return messages, call_kwargs
+
+    @staticmethod
+    def _advance_chain(
+        chunks: Iterable[AIChunk],
+        chain: ResponseChain,
+        messages: Sequence[Any],
+    ) -> Generator[AIChunk, None, None]:
+        covered = len(messages)
+        for chunk in chunks:
+            if chunk.kind == AIChunk.KIND_DONE and chunk.response_id:
+                chain.advance(chunk.response_id, messages, covered)
             yield chunk
 
+    @staticmethod
+    def _build_tools_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+        tools = kwargs.get("tools")
+        if not isinstance(tools, ToolSet):
+            return kwargs
+
+        return {**kwargs, "tools": list(tools.definitions)}
+
+    @staticmethod
+    def _get_field(obj: Any, key: str) -> Any:
+        if isinstance(obj, dict):
+            return obj.get(key)
+        return getattr(obj, key, None)
+
+    @classmethod
+    def _build_chunk(cls, event: Any, keep_raw: bool = False) -> AIChunk:
+        _get_field = cls._get_field
+
+        data = cast(ResponseStreamEvent, event)
+        if isinstance(data, dict):
+            event_type = str(data.get("type") or "")
+            delta = data.get("delta")
+        else:
+            event_type = str(getattr(data, "type", None) or "")
+            delta = getattr(data, "delta", None)
+
+        if event_type == "response.output_text.delta":
+            if isinstance(delta, str) and delta:
+                chunk = AIChunk(AIChunk.KIND_CONTENT, event_type, delta)
+            else:
+                chunk = AIChunk(AIChunk.KIND_EVENT, event_type)
+
+        elif event_type in ("response.output_item.added", "response.output_item.done"):
+            chunk = cls._build_function_call_chunk(data, event_type)
+
+        elif event_type == "response.function_call_arguments.delta":
+            chunk = AIChunk.for_tool_call(
+                AIChunk.KIND_TOOL_ARGUMENTS_DELTA,
+                event_type,
+                tool_call_arguments_delta=delta if isinstance(delta, str) and delta else None,
+                tool_call_index=cls._get_output_index(data),
+                tool_call_id=cls._get_item_id(data),
+            )
+
+        elif event_type == "response.function_call_arguments.done":
+            arguments = _get_field(data, "arguments")
+            chunk = AIChunk.for_tool_call(
+                AIChunk.KIND_TOOL_ARGUMENTS,
+                event_type,
+                tool_call_arguments=arguments if isinstance(arguments, str) else None,
+                tool_call_index=cls._get_output_index(data),
+                tool_call_id=cls._get_item_id(data),
+            )
+
+        elif event_type == "response.completed":
+            chunk = AIChunk(AIChunk.KIND_DONE, event_type)
+            response_id = _get_field(_get_field(data, "response"), "id")
+            if isinstance(response_id, str) and response_id:
+                chunk.response_id = response_id
+
+        else:
+            chunk = AIChunk(AIChunk.KIND_EVENT, event_type)
+
+        if keep_raw:
+            chunk.attach_event(data)
+        return chunk
+
+    @classmethod
+    def _build_function_call_chunk(cls, data: Any, event_type: str) -> AIChunk:
+        _get_field = cls._get_field
+
+        item = _get_field(data, "item")
+        if _get_field(item, "type") != "function_call":
+            return AIChunk(AIChunk.KIND_EVENT, event_type)
+
+        tool_call: dict[str, Any] = {
+            "type": "function_call",
+            "id": _get_field(item, "id") or "",
+            "call_id": _get_field(item, "call_id") or "",
+            "name": _get_field(item, "name") or "",
+            "arguments": _get_field(item, "arguments") or "",
+        }
+        return AIChunk.for_tool_call(
+            AIChunk.KIND_TOOL_CALL,
+            event_type,
+            tool_call=tool_call,
+            tool_call_index=cls._get_output_index(data),
+            tool_call_id=tool_call["id"] or None,
+        )
+
+    @classmethod
+    def _get_output_index(cls, data: Any) -> int | None:
+        output_index = cls._get_field(data, "output_index")
+        return output_index if isinstance(output_index, int) else None
+
+    @classmethod
+    def _get_item_id(cls, data: Any) -> str | None:
+        item_id = cls._get_field(data, "item_id")
+        return item_id if isinstance(item_id, str) and item_id else None
+
     def add_assistant_message(self, messages: list[dict[str, Any]], *, content: str, tool_calls: list[dict[str, Any]]) -> None:
         if content.strip():
             messages.append({"role": "assistant", "content": content})
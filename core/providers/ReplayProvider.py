@@ -0,0 +1,84 @@
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, Iterator, Tuple
+
+from openai.types.responses import ResponseInputParam
+
+from core.general import Config
+from core.exeptions import NoClientError
+from core.types.ai import AIChunk
+from core.providers.BaseAIProvider import BaseAIProvider
+from core.providers.ChunkRecorder import ChunkRecording
+
+
+class ReplayProvider(BaseAIProvider):
+    REQUIRES_API_KEY = False
+
+    def __init__(self):
+        self.realtime = Config.REPLAY_REALTIME
+        super().__init__(
+            api_key='',
+            api_base=Config.REPLAY_PATH
+        )
+
+    def provider_setup(self):
+        base = Path(__file__).resolve().parents[2]
+        path = Path(self.api_base)
+        if not path.is_absolute():
+            path = base / path
+        if not path.exists():
+            raise ValueError(f"Файл записи не найден: {path}")
+
+        self.client = ChunkRecording.load(path)
+
+    def set_realtime(self, realtime: bool = True):
+        self.realtime = bool(realtime)
+        return self
+
+    def rewind(self):
+        if self.client:
+            self.client.rewind()
+        return self
+
+    def generate_response(self, messages: ResponseInputParam, **kwargs) -> Generator[AIChunk, None, None]:
+        if not self.client:
+            raise NoClientError("ReplayProvider")
+
+        span = self._start_request_span(messages, kwargs)
+        chunks = self._iter_chunks()
+        if span.recording:
+            chunks = self._trace_chunks(chunks, span)
+        yield from chunks
+
+    def _iter_chunks(self) -> Generator[AIChunk, None, None]:
+        started = time.monotonic()
+        for offset, record in self._iter_turn():
+            if self.realtime:
+                delay = started + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield AIChunk.from_record(record)
+
+    def _iter_turn(self) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        turn = self.client.next_turn()  # type: ignore[union-attr]
+        return iter(turn["chunks"])
+
+    def add_tool_call_message(self, messages: list[dict[str, Any]], *, tool_call: dict[str, Any]) -> None:
+        messages.append(
+            {
+                "type": "function_call",
+                "call_id": tool_call.get("call_id") or tool_call.get("id") or "",
+                "name": str((tool_call.get("name") or "")).strip(),
+                "arguments": tool_call.get("arguments") or "{}",
+            }
+        )
+
+    def add_tool_result_message(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        tool_name: str,
+        tool_call: dict[str, Any],
+        output: str,
+    ) -> None:
+        messages.append({"role": "tool", "tool_name": tool_name, "content": output})
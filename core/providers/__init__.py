@@ -1,9 +1,22 @@
 from core.providers.OpenAIProvider import OpenAIProvider
 from core.providers.OllamaAIProvider import OllamaAIProvider
 from core.providers.BaseAIProvider import BaseAIProvider
+from core.providers.AsyncBaseAIProvider import AsyncBaseAIProvider
+from core.providers.AsyncOpenAIProvider import AsyncOpenAIProvider
+from core.providers.AsyncOllamaAIProvider import AsyncOllamaAIProvider
+from core.providers.ReplayProvider import ReplayProvider
+from core.providers.AsyncReplayProvider import AsyncReplayProvider
+from core.providers.ChunkRecorder import ChunkRecorder, ChunkRecording
 
 __all__ = [
     "OpenAIProvider",
     "OllamaAIProvider",
-    "BaseAIProvider"
-]
\ No newline at end of file
+    "BaseAIProvider",
+    "AsyncBaseAIProvider",
+    "AsyncOpenAIProvider",
+    "AsyncOllamaAIProvider",
+    "ReplayProvider",
+    "AsyncReplayProvider",
+    "ChunkRecorder",
+    "ChunkRecording"
+]
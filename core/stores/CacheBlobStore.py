@@ -0,0 +1,52 @@
+import hashlib
+import lzma
+import os
+import zlib
+
+from pathlib import Path
+
+
+class CacheBlobStore:
+    CODECS = ("zlib", "lzma")
+
+    def __init__(self, root: str | Path, codec: str = "zlib") -> None:
+        if codec not in self.CODECS:
+            raise ValueError(f"Неизвестный кодек сжатия кэша: {codec}")
+        self.root = Path(root)
+        self.codec = codec
+
+    def write(self, key: str, raw: bytes) -> tuple[str, int]:
+        payload = self.compress(raw, self.codec)
+        name = (
+            f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}-"
+            f"{hashlib.sha256(raw).hexdigest()[:16]}.{self.codec}"
+        )
+        path = self.root / name
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        return name, len(payload)
+
+    def read(self, name: str) -> bytes:
+        codec = name.rsplit(".", 1)[-1]
+        return self.decompress((self.root / name).read_bytes(), codec)
+
+    def delete(self, name: str) -> None:
+        try:
+            (self.root / name).unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def compress(raw: bytes, codec: str) -> bytes:
+        if codec == "lzma":
+            return lzma.compress(raw)
+        return zlib.compress(raw, 6)
+
+    @staticmethod
+    def decompress(payload: bytes, codec: str) -> bytes:
+        if codec == "lzma":
+            return lzma.decompress(payload)
+        return zlib.decompress(payload)
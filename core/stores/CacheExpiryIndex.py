@@ -0,0 +1,117 @@
+import heapq
+import itertools
+import time
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class CacheEntryMeta:
+    collected: float
+    fresh_until: float
+    evict_at: float
+    policy: str | None
+    generation: int
+
+
+class CacheExpiryIndex:
+    def __init__(self) -> None:
+        self._entries: dict[str, CacheEntryMeta] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._generations = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntryMeta | None:
+        return self._entries.get(key)
+
+    def track(self, key: str, entry: Any) -> CacheEntryMeta | None:
+        meta = self._build_meta(entry)
+        if meta is None:
+            self._entries.pop(key, None)
+            return None
+        self._entries[key] = meta
+        heapq.heappush(self._heap, (meta.evict_at, meta.generation, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._rebuild()
+        return meta
+
+    def track_many(self, entries: list[tuple[str, Any]]) -> None:
+        for key, entry in entries:
+            meta = self._build_meta(entry)
+            if meta is not None:
+                self._entries[key] = meta
+                self._heap.append((meta.evict_at, meta.generation, key))
+        heapq.heapify(self._heap)
+
+    def forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def is_fresh(self, key: str, ttl_seconds: int, policy: str | int | None, now: float) -> bool:
+        return self.fresh_for(key, ttl_seconds, policy, now) > 0
+
+    def fresh_for(self, key: str, ttl_seconds: int, policy: str | int | None, now: float) -> float:
+        meta = self._entries.get(key)
+        if meta is None:
+            return 0.0
+        if policy is not None and meta.policy != str(policy):
+            return 0.0
+        return max(0.0, min(meta.fresh_until, meta.collected + int(ttl_seconds)) - now)
+
+    def is_usable(self, key: str, stale_seconds: int, now: float) -> bool:
+        meta = self._entries.get(key)
+        if meta is None:
+            return False
+        return now < max(meta.evict_at, meta.fresh_until + int(stale_seconds))
+
+    def next_deadline(self) -> float | None:
+        self._drop_superseded()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, limit: int) -> list[str]:
+        due: list[str] = []
+        while len(due) < limit:
+            self._drop_superseded()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            due.append(key)
+        return due
+
+    def _rebuild(self) -> None:
+        self._heap = [(meta.evict_at, meta.generation, key) for key, meta in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def _drop_superseded(self) -> None:
+        heap = self._heap
+        while heap:
+            _, generation, key = heap[0]
+            meta = self._entries.get(key)
+            if meta is not None and meta.generation == generation:
+                return
+            heapq.heappop(heap)
+
+    def _build_meta(self, entry: Any) -> CacheEntryMeta | None:
+        if not isinstance(entry, dict):
+            return None
+        expires_at = entry.get("expires_at")
+        if not isinstance(expires_at, (int, float)):
+            return None
+
+        offset = time.monotonic() - time.time()
+        collected_at = entry.get("collected_at")
+        if not isinstance(collected_at, (int, float)):
+            collected_at = float(expires_at) - int(entry.get("ttl_seconds") or 0)
+        stale_until = entry.get("stale_until")
+        evict_at = float(stale_until) if isinstance(stale_until, (int, float)) else float(expires_at)
+        policy = entry.get("policy")
+        return CacheEntryMeta(
+            collected=float(collected_at) + offset,
+            fresh_until=float(expires_at) + offset,
+            evict_at=max(evict_at, float(expires_at)) + offset,
+            policy=None if policy is None else str(policy),
+            generation=next(self._generations),
+        )
@@ -0,0 +1,60 @@
+import json
+
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheMemoryTier:
+    def __init__(self, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        cached = self._entries.get(key)
+        if cached is None:
+            return default
+        self._entries.move_to_end(key)
+        return cached[0]
+
+    def put(self, key: str, value: Any, size: int | None = None) -> list[str]:
+        self.pop(key)
+        size = self.estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return []
+
+        self._entries[key] = (value, size)
+        self._bytes += size
+        evicted: list[str] = []
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key, (_, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+            evicted.append(old_key)
+        return evicted
+
+    def pop(self, key: str) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= cached[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        try:
+            return len(json.dumps(value, ensure_ascii=False, default=str))
+        except (TypeError, ValueError):
+            return 0
@@ -1,91 +1,475 @@
 import json
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, ClassVar, Optional
+
+from core.general import Config
+from core.interfaces import ICacheBackend
+from core.stores.CacheBlobStore import CacheBlobStore
+from core.stores.CacheExpiryIndex import CacheExpiryIndex
+from core.stores.CacheMemoryTier import CacheMemoryTier
+from core.stores.backends import LogCacheBackend, SqliteCacheBackend
 
 
 class CacheStore:
-    def __init__(self, cache_path: str | None = None) -> None:
+    BACKEND_SUFFIXES = {"log": ".log", "sqlite": ".sqlite3"}
+    DEFAULT_NAMESPACE = "default"
+    COUNTERS = (
+        "hits",
+        "memory_hits",
+        "misses",
+        "evictions",
+        "expired",
+        "stale_hits",
+        "refreshes",
+        "refresh_errors",
+    )
+    SWEEP_BATCH = 256
+    SWEEP_MAX_WAIT = 300.0
+    BLOB_MARKER = "__blob__"
+
+    _default: ClassVar[Optional["CacheStore"]] = None
+    _default_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        cache_path: str | None = None,
+        backend: ICacheBackend | None = None,
+        memory: CacheMemoryTier | None = None,
+        blobs: CacheBlobStore | None = None,
+        compress_threshold: int | None = None,
+    ) -> None:
         base = Path(__file__).resolve().parents[2]
-        self._path = Path(cache_path) if cache_path else base / "data" / "cache" / "cache.json"
-        self._data: dict[str, Any] = {}
+        self._path = Path(cache_path) if cache_path else base / Config.CACHE_PATH
+        self._backend = backend if backend is not None else self.create_backend(self._path)
+        self._memory = (
+            memory
+            if memory is not None
+            else CacheMemoryTier(Config.CACHE_MEMORY_MAX_ENTRIES, Config.CACHE_MEMORY_MAX_BYTES)
+        )
+        codec = Config.CACHE_COMPRESSION
+        self._blobs = (
+            blobs
+            if blobs is not None
+            else CacheBlobStore(self._path.with_suffix(".blobs"), "zlib" if codec == "none" else codec)
+        )
+        if compress_threshold is None and codec != "none":
+            compress_threshold = Config.CACHE_COMPRESS_THRESHOLD
+        self._compress_threshold = compress_threshold
+        self._blob_refs: dict[str, dict[str, Any]] = {}
+        self._decodes = 0
+        self._decode_seconds = 0.0
+        self._counters: dict[str, dict[str, int]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._refresh_pool: ThreadPoolExecutor | None = None
+        self._expiry = CacheExpiryIndex()
+        self._lock = threading.RLock()
+        self._sweep_wakeup = threading.Condition(self._lock)
+        self._sweeper: threading.Thread | None = None
+        self._closed = False
         self._load()
 
+    @classmethod
+    def default(cls) -> "CacheStore":
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def create_backend(cls, path: str | Path, kind: str | None = None) -> ICacheBackend:
+        kind = (kind or Config.CACHE_BACKEND).lower()
+        suffix = cls.BACKEND_SUFFIXES.get(kind)
+        if suffix is None:
+            raise ValueError(f"Неизвестный бэкенд кэша: {kind}")
+
+        path = Path(path)
+        if path.suffix == ".json":
+            path = path.with_suffix(suffix)
+        if kind == "sqlite":
+            return SqliteCacheBackend(path)
+        return LogCacheBackend(path, compact_ratio=Config.CACHE_COMPACT_RATIO, fsync=Config.CACHE_FSYNC)
+
     def _load(self) -> None:
+        if len(self._backend) == 0:
+            self._import_legacy()
+        self._index_backend()
+
+    def _index_backend(self) -> None:
+        items = list(self._backend.items())
+        for key, value in items:
+            ref = self._blob_ref(value)
+            if ref is not None:
+                self._blob_refs[key] = ref
+        self._expiry.track_many(items)
+        self._wake_sweeper()
+
+    def _import_legacy(self) -> None:
+        legacy = self._path if self._path.suffix == ".json" else self._path.with_suffix(".json")
         try:
-            if not self._path.exists():
-                self._data = {}
+            if not legacy.is_file():
                 return
-            raw = self._path.read_text(encoding="utf-8")
+            raw = legacy.read_text(encoding="utf-8")
             obj = json.loads(raw) if raw.strip() else {}
-            self._data = obj if isinstance(obj, dict) else {}
-            self._purge_expired()
         except Exception:
-            self._data = {}
+            return
+        if not isinstance(obj, dict):
+            return
+
+        for key, value in obj.items():
+            self._backend.set(key, value)
+        try:
+            legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+        except FileNotFoundError:
+            pass
 
-    def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        with self._path.open("w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False)
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._sweep_wakeup.notify_all()
+            pool, self._refresh_pool = self._refresh_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._backend.close()
 
     def get(self, key: str) -> Any:
-        return self._data.get(key)
-
-    def get_valid(self, key: str, ttl_seconds: int) -> Any:
-        cached = self._data.get(key)
-        if self._is_entry_valid(cached, ttl_seconds):
-            return cached.get("data") if isinstance(cached, dict) else cached
-        if cached is not None:
-            self.delete(key)
-        return None
+        with self._lock:
+            self._sync()
+            value = self._lookup(key)
+            self._count(key, "hits" if value is not None else "misses")
+            return value
+
+    def get_valid(self, key: str, ttl_seconds: int, policy: str | int | None = None) -> Any:
+        return self.get_fresh(key, ttl_seconds, policy)[0]
+
+    def get_fresh(self, key: str, ttl_seconds: int, policy: str | int | None = None) -> tuple[Any, float]:
+        with self._lock:
+            self._sync()
+            fresh_for = self._expiry.fresh_for(key, ttl_seconds, policy, time.monotonic())
+            if fresh_for > 0:
+                cached = self._lookup(key)
+                if isinstance(cached, dict):
+                    self._count(key, "hits")
+                    return cached.get("data"), fresh_for
+            self._count(key, "misses")
+            return None, 0.0
+
+    def get_or_refresh(
+        self,
+        key: str,
+        ttl_seconds: int,
+        loader: Callable[[], Any],
+        *,
+        stale_seconds: int = 0,
+        policy: str | int | None = None,
+    ) -> Any:
+        with self._lock:
+            self._sync()
+            now = time.monotonic()
+            if self._expiry.is_fresh(key, ttl_seconds, policy, now):
+                cached = self._lookup(key)
+                if isinstance(cached, dict):
+                    self._count(key, "hits")
+                    return cached.get("data")
+            elif self._expiry.is_usable(key, stale_seconds, now):
+                cached = self._lookup(key)
+                if isinstance(cached, dict):
+                    self._count(key, "stale_hits")
+                    self._refresh_in_background(key, ttl_seconds, loader, stale_seconds, policy)
+                    return cached.get("data")
+            self._count(key, "misses")
+            flight, owner = self._join_flight(key)
+
+        try:
+            if not owner:
+                return flight.result()
+            return self._run_refresh(key, flight, ttl_seconds, loader, stale_seconds, policy)
+        except Exception:
+            with self._lock:
+                cached = self._lookup(key)
+            if isinstance(cached, dict) and "data" in cached:
+                return cached["data"]
+            raise
 
     def set(self, key: str, value: Any) -> None:
-        self._data[key] = value
-        self._save()
+        is_entry = self._is_entry(value)
+        raw = json.dumps(value["data"] if is_entry else value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._sync()
+            previous = self._blob_refs.pop(key, None)
+            if self._compress_threshold is not None and len(raw) >= self._compress_threshold:
+                name, stored = self._blobs.write(key, raw)
+                ref = {"name": name, "raw_bytes": len(raw), "stored_bytes": stored}
+                stub = {k: v for k, v in value.items() if k != "data"} if is_entry else {}
+                stub[self.BLOB_MARKER] = ref
+                self._backend.set(key, stub)
+                self._blob_refs[key] = ref
+            else:
+                self._backend.set(key, value)
+            if previous is not None and previous["name"] != self._blob_refs.get(key, {}).get("name"):
+                self._blobs.delete(previous["name"])
+            self._remember(key, value, len(raw))
+            if self._expiry.track(key, value) is not None:
+                self._wake_sweeper()
 
-    def set_with_ttl(self, key: str, data: Any, ttl_seconds: int) -> None:
-        entry = self._build_entry(data, ttl_seconds)
+    def set_with_ttl(
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: int,
+        stale_seconds: int = 0,
+        policy: str | int | None = None,
+    ) -> None:
+        entry = self._build_entry(data, ttl_seconds, stale_seconds, policy)
         self.set(key, entry)
 
     def delete(self, key: str) -> None:
-        if key in self._data:
-            del self._data[key]
-            self._save()
+        with self._lock:
+            self._sync()
+            self._expiry.forget(key)
+            self._drop(key)
+
+    def sweep(self) -> int:
+        with self._lock:
+            self._sync()
+            expired = self._expiry.pop_due(time.monotonic(), len(self._expiry) + 1)
+            self._evict_expired(expired)
+            return len(expired)
 
     def all(self) -> dict[str, Any]:
-        return dict(self._data)
+        with self._lock:
+            self._sync()
+            return {key: self._decode(key, value) for key, value in self._backend.items()}
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._sync()
+            totals = {name: sum(c[name] for c in self._counters.values()) for name in self.COUNTERS}
+            return {
+                **totals,
+                "entries": len(self._backend),
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory.bytes,
+                "expiring_entries": len(self._expiry),
+                "compression": self._compression_stats(),
+                "namespaces": {ns: dict(c) for ns, c in self._counters.items()},
+            }
+
+    @classmethod
+    def namespace_of(cls, key: str) -> str:
+        namespace, sep, _ = key.partition("::")
+        return namespace if sep and namespace else cls.DEFAULT_NAMESPACE
+
+    def _join_flight(self, key: str) -> tuple[Future, bool]:
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return flight, False
+        flight = self._inflight[key] = Future()
+        return flight, True
 
-    def _build_entry(self, data: Any, ttl_seconds: int) -> dict[str, Any]:
-        now = datetime.now(timezone.utc)
-        expires_at = now + timedelta(seconds=int(ttl_seconds))
+    def _refresh_in_background(
+        self,
+        key: str,
+        ttl_seconds: int,
+        loader: Callable[[], Any],
+        stale_seconds: int,
+        policy: str | int | None,
+    ) -> None:
+        flight, owner = self._join_flight(key)
+        if not owner:
+            return
+        if self._refresh_pool is None:
+            self._refresh_pool = ThreadPoolExecutor(
+                max_workers=max(1, Config.CACHE_REFRESH_WORKERS),
+                thread_name_prefix="cache-refresh",
+            )
+        self._refresh_pool.submit(self._run_refresh, key, flight, ttl_seconds, loader, stale_seconds, policy, True)
+
+    def _run_refresh(
+        self,
+        key: str,
+        flight: Future,
+        ttl_seconds: int,
+        loader: Callable[[], Any],
+        stale_seconds: int,
+        policy: str | int | None = None,
+        background: bool = False,
+    ) -> Any:
+        try:
+            data = loader()
+            self.set_with_ttl(key, data, ttl_seconds, stale_seconds, policy)
+        except Exception as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._count(key, "refresh_errors")
+            flight.set_exception(exc)
+            if background:
+                return None
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._count(key, "refreshes")
+        flight.set_result(data)
+        return data
+
+    def _lookup(self, key: str) -> Any:
+        value = self._memory.get(key)
+        if value is not None:
+            self._count(key, "memory_hits")
+            return value
+        value = self._backend.get(key)
+        if value is None:
+            return None
+        ref = self._blob_ref(value)
+        value = self._decode(key, value)
+        if value is not None:
+            self._remember(key, value, ref["raw_bytes"] if ref is not None else None)
+        return value
+
+    def _decode(self, key: str, value: Any) -> Any:
+        ref = self._blob_ref(value)
+        if ref is None:
+            return value
+        started = time.perf_counter()
+        try:
+            data = json.loads(self._blobs.read(ref["name"]))
+        except Exception:
+            data = None
+            missing = True
+        else:
+            missing = False
+        self._decodes += 1
+        self._decode_seconds += time.perf_counter() - started
+
+        if missing:
+            self._sync()
+            current = self._backend.get(key)
+            if self._blob_ref(current) != ref:
+                return self._decode(key, current)
+            self._expiry.forget(key)
+            self._drop(key)
+            return None
+        if "expires_at" not in value:
+            return data
+        entry = {k: v for k, v in value.items() if k != self.BLOB_MARKER}
+        entry["data"] = data
+        return entry
+
+    def _sync(self) -> None:
+        changed = self._backend.refresh()
+        if changed is None:
+            self._memory.clear()
+            self._blob_refs.clear()
+            self._expiry = CacheExpiryIndex()
+            self._index_backend()
+            return
+        for key in changed:
+            value = self._backend.get(key)
+            ref = self._blob_ref(value)
+            self._memory.pop(key)
+            if ref is not None:
+                self._blob_refs[key] = ref
+            else:
+                self._blob_refs.pop(key, None)
+            self._expiry.track(key, value)
+        if changed:
+            self._wake_sweeper()
+
+    def _drop(self, key: str) -> None:
+        self._memory.pop(key)
+        self._backend.delete(key)
+        ref = self._blob_refs.pop(key, None)
+        if ref is not None:
+            self._blobs.delete(ref["name"])
+
+    @staticmethod
+    def _is_entry(value: Any) -> bool:
+        return isinstance(value, dict) and "data" in value and "expires_at" in value
+
+    def _blob_ref(self, value: Any) -> dict[str, Any] | None:
+        if isinstance(value, dict):
+            ref = value.get(self.BLOB_MARKER)
+            if isinstance(ref, dict) and isinstance(ref.get("name"), str):
+                return ref
+        return None
+
+    def _compression_stats(self) -> dict[str, Any]:
+        raw_bytes = sum(int(ref.get("raw_bytes") or 0) for ref in self._blob_refs.values())
+        stored_bytes = sum(int(ref.get("stored_bytes") or 0) for ref in self._blob_refs.values())
+        decode_ms = self._decode_seconds * 1000
         return {
-            "collected_at": int(now.timestamp()),
+            "codec": self._blobs.codec if self._compress_threshold is not None else "none",
+            "threshold_bytes": self._compress_threshold,
+            "entries": len(self._blob_refs),
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "ratio": round(raw_bytes / stored_bytes, 3) if stored_bytes else None,
+            "decodes": self._decodes,
+            "decode_ms": round(decode_ms, 3),
+            "decode_avg_ms": round(decode_ms / self._decodes, 3) if self._decodes else None,
+        }
+
+    def _remember(self, key: str, value: Any, size: int | None = None) -> None:
+        for evicted in self._memory.put(key, value, size):
+            self._count(evicted, "evictions")
+
+    def _count(self, key: str, counter: str) -> None:
+        namespace = self.namespace_of(key)
+        counters = self._counters.get(namespace)
+        if counters is None:
+            counters = self._counters[namespace] = dict.fromkeys(self.COUNTERS, 0)
+        counters[counter] += 1
+
+    def _build_entry(
+        self,
+        data: Any,
+        ttl_seconds: int,
+        stale_seconds: int = 0,
+        policy: str | int | None = None,
+    ) -> dict[str, Any]:
+        now = time.time()
+        expires_at = now + int(ttl_seconds)
+        entry: dict[str, Any] = {
+            "collected_at": round(now, 3),
             "ttl_seconds": int(ttl_seconds),
-            "expires_at": int(expires_at.timestamp()),
+            "expires_at": round(expires_at, 3),
             "data": data,
         }
+        if stale_seconds > 0:
+            entry["stale_until"] = round(expires_at + int(stale_seconds), 3)
+        if policy is not None:
+            entry["policy"] = str(policy)
+        return entry
 
-    def _is_entry_valid(self, cached: Any, ttl_seconds: int) -> bool:
-        if not isinstance(cached, dict):
-            return False
-        if int(cached.get("ttl_seconds") or 0) != int(ttl_seconds):
-            return False
-        expires_at = cached.get("expires_at")
-        if not isinstance(expires_at, (int, float)):
-            return False
-        return datetime.now(timezone.utc).timestamp() < float(expires_at)
-
-    def _purge_expired(self) -> None:
-        now_ts = datetime.now(timezone.utc).timestamp()
-        expired_keys = []
-        for key, value in self._data.items():
-            if not isinstance(value, dict):
-                continue
-            expires_at = value.get("expires_at")
-            if isinstance(expires_at, (int, float)) and now_ts >= float(expires_at):
-                expired_keys.append(key)
-        if not expired_keys:
+    def _wake_sweeper(self) -> None:
+        if self._closed or self._expiry.next_deadline() is None:
             return
-        for key in expired_keys:
-            del self._data[key]
-        self._save()
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-expiry", daemon=True)
+            self._sweeper.start()
+        else:
+            self._sweep_wakeup.notify()
+
+    def _sweep_loop(self) -> None:
+        with self._lock:
+            while not self._closed:
+                deadline = self._expiry.next_deadline()
+                if deadline is None:
+                    self._sweep_wakeup.wait(self.SWEEP_MAX_WAIT)
+                    continue
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._sweep_wakeup.wait(min(delay, self.SWEEP_MAX_WAIT))
+                    continue
+                self._sync()
+                self._evict_expired(self._expiry.pop_due(time.monotonic(), self.SWEEP_BATCH))
+                self._sweep_wakeup.wait(0)
+
+    def _evict_expired(self, keys: list[str]) -> None:
+        for key in keys:
+            self._drop(key)
+            self._count(key, "expired")
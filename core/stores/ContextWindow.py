@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Mapping, Sequence
+
+from core.general import Config
+
+
+ContextStrategy = Literal["trim", "summarize"]
+
+
+@dataclass(slots=True)
+class ContextWindow:
+    messages: List[Dict[str, Any]]
+    budget: int = 0
+    tokens: int = 0
+    dropped_tokens: int = 0
+    dropped_messages: int = 0
+    summary_tokens: int = 0
+    token_counts: List[int] = field(default_factory=list)
+
+    @property
+    def trimmed(self) -> bool:
+        return self.dropped_messages > 0
+
+
+class ContextWindowManager:
+    MESSAGE_OVERHEAD_TOKENS = 4
+    BYTES_PER_TOKEN = 4
+    SUMMARY_TITLE = "Краткое содержание более ранней части диалога:"
+    SUMMARY_LINE_CHARS = 160
+
+    def __init__(
+        self,
+        default_budget: int = 0,
+        budgets: Mapping[str, int] | None = None,
+        keep_recent: int = 6,
+        strategy: ContextStrategy = "trim",
+        summary_ratio: float = 0.1,
+    ) -> None:
+        self.default_budget = max(0, int(default_budget))
+        self.budgets = {str(k).lower(): int(v) for k, v in (budgets or {}).items()}
+        self.keep_recent = max(0, int(keep_recent))
+        self.strategy: ContextStrategy = strategy
+        self.summary_ratio = min(max(float(summary_ratio), 0.0), 0.5)
+
+    @classmethod
+    def from_config(cls) -> "ContextWindowManager":
+        strategy = Config.CONTEXT_STRATEGY if Config.CONTEXT_STRATEGY in ("trim", "summarize") else "trim"
+        return cls(
+            default_budget=Config.CONTEXT_DEFAULT_BUDGET,
+            budgets=Config.CONTEXT_BUDGETS,
+            keep_recent=Config.CONTEXT_KEEP_RECENT,
+            strategy=strategy,  # type: ignore[arg-type]
+            summary_ratio=Config.CONTEXT_SUMMARY_RATIO,
+        )
+
+    def budget_for(self, provider: str = "", model: str = "") -> int:
+        for key in (model, provider):
+            budget = self.budgets.get(str(key or "").lower())
+            if budget is not None:
+                return max(0, budget)
+        return self.default_budget
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        if not text:
+            return cls.MESSAGE_OVERHEAD_TOKENS
+        return cls.MESSAGE_OVERHEAD_TOKENS + -(-len(text.encode("utf-8")) // cls.BYTES_PER_TOKEN)
+
+    def fit(self, messages: Sequence[Dict[str, Any]], token_counts: Sequence[int], budget: int) -> ContextWindow:
+        total = sum(token_counts)
+        if budget <= 0 or total <= budget:
+            return ContextWindow(list(messages), budget, total, token_counts=list(token_counts))
+
+        head = 0
+        while head < len(messages) and messages[head].get("role") == "system":
+            head += 1
+        tail = max(head, len(messages) - self.keep_recent)
+
+        pinned = sum(token_counts[:head]) + sum(token_counts[tail:])
+        summary_budget = int(budget * self.summary_ratio) if self.strategy == "summarize" else 0
+        room = budget - pinned - summary_budget
+
+        start = tail
+        while start > head and token_counts[start - 1] <= room:
+            room -= token_counts[start - 1]
+            start -= 1
+
+        dropped = list(range(head, start))
+        if not dropped:
+            return ContextWindow(list(messages), budget, total, token_counts=list(token_counts))
+
+        kept = [*range(head), *range(start, len(messages))]
+        window_messages = [messages[i] for i in kept]
+        window_counts = [token_counts[i] for i in kept]
+
+        summary_tokens = 0
+        if summary_budget > 0:
+            summary = self._summarize([messages[i] for i in dropped], summary_budget)
+            if summary is not None:
+                summary_tokens = self.estimate_tokens(summary["content"])
+                window_messages.insert(head, summary)
+                window_counts.insert(head, summary_tokens)
+
+        dropped_tokens = sum(token_counts[i] for i in dropped)
+        return ContextWindow(
+            messages=window_messages,
+            budget=budget,
+            tokens=sum(window_counts),
+            dropped_tokens=dropped_tokens,
+            dropped_messages=len(dropped),
+            summary_tokens=summary_tokens,
+            token_counts=window_counts,
+        )
+
+    def _summarize(self, dropped: Sequence[Mapping[str, Any]], summary_budget: int) -> Dict[str, Any] | None:
+        labels = {"user": "Пользователь", "assistant": "Ассистент"}
+        lines: List[str] = []
+        used = self.estimate_tokens(self.SUMMARY_TITLE)
+        for message in reversed(dropped):
+            role = message.get("role")
+            if role not in labels:
+                continue
+            text = " ".join(str(message.get("content") or "").split())
+            if len(text) > self.SUMMARY_LINE_CHARS:
+                text = text[: self.SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+            line = f"- {labels[role]}: {text}"
+            cost = -(-len(line.encode("utf-8")) // self.BYTES_PER_TOKEN)
+            if used + cost > summary_budget:
+                break
+            lines.append(line)
+            used += cost
+
+        if not lines:
+            return None
+        return {"role": "system", "content": "\n".join([self.SUMMARY_TITLE, *reversed(lines)])}
@@ -0,0 +1,192 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+@dataclass(slots=True)
+class SearchHit:
+    dialog_id: str
+    entry_id: int
+    role: str
+    snippet: str
+    score: float
+    timestamp: str | None = None
+    dialog_title: str = ""
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "dialog_id": self.dialog_id,
+            "dialog_title": self.dialog_title,
+            "entry_id": self.entry_id,
+            "role": self.role,
+            "timestamp": self.timestamp,
+            "snippet": self.snippet,
+            "score": round(self.score, 4),
+        }
+
+
+@dataclass(slots=True)
+class _IndexedDoc:
+    dialog_id: str
+    role: str
+    timestamp: str | None
+    text: str
+    terms: Dict[str, int]
+    length: int
+
+
+class DialogSearchIndex:
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_EXPANSIONS = 16
+    SNIPPET_RADIUS = 60
+
+    def __init__(self) -> None:
+        self._docs: Dict[int, _IndexedDoc] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocabulary: List[str] = []
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, entry_id: int, *, dialog_id: str, role: str, text: str, timestamp: str | None = None) -> None:
+        terms: Dict[str, int] = {}
+        for term in tokenize(text):
+            terms[term] = terms.get(term, 0) + 1
+
+        with self._lock:
+            self._remove_locked(entry_id)
+            if not terms:
+                return
+            doc = _IndexedDoc(dialog_id, role, timestamp, text, terms, sum(terms.values()))
+            self._docs[entry_id] = doc
+            self._total_length += doc.length
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._vocabulary, term)
+                postings[entry_id] = tf
+
+    def remove(self, entry_id: int) -> None:
+        with self._lock:
+            self._remove_locked(entry_id)
+
+    def remove_dialog(self, dialog_id: str) -> None:
+        with self._lock:
+            for entry_id in [i for i, doc in self._docs.items() if doc.dialog_id == dialog_id]:
+                self._remove_locked(entry_id)
+
+    def search(self, query: str, *, limit: int = 10, dialog_id: Optional[str] = None) -> List[SearchHit]:
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms or limit <= 0:
+            return []
+
+        with self._lock:
+            if not self._docs:
+                return []
+            expanded = [self._expand(term) for term in query_terms]
+            scores = self._score(expanded, dialog_id, require_all=True) or self._score(
+                expanded, dialog_id, require_all=False
+            )
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [
+                SearchHit(
+                    dialog_id=self._docs[entry_id].dialog_id,
+                    entry_id=entry_id,
+                    role=self._docs[entry_id].role,
+                    snippet=self.make_snippet(self._docs[entry_id].text, query_terms),
+                    score=score,
+                    timestamp=self._docs[entry_id].timestamp,
+                )
+                for entry_id, score in top
+            ]
+
+    @classmethod
+    def make_snippet(cls, text: str, query_terms: List[str]) -> str:
+        flat = " ".join(text.split())
+        folded = flat.lower().replace("ё", "е")
+        match = None
+        for found in TOKEN_RE.finditer(folded):
+            if any(found.group().startswith(term) for term in query_terms):
+                match = found
+                break
+        if match is None:
+            return flat[: cls.SNIPPET_RADIUS * 2] + ("…" if len(flat) > cls.SNIPPET_RADIUS * 2 else "")
+
+        start = max(0, match.start() - cls.SNIPPET_RADIUS)
+        end = min(len(flat), match.end() + cls.SNIPPET_RADIUS)
+        return (
+            ("…" if start > 0 else "")
+            + flat[start : match.start()]
+            + f"**{flat[match.start() : match.end()]}**"
+            + flat[match.end() : end]
+            + ("…" if end < len(flat) else "")
+        )
+
+    def _expand(self, term: str) -> List[str]:
+        position = bisect.bisect_left(self._vocabulary, term)
+        expansions: List[str] = []
+        while (
+            position < len(self._vocabulary)
+            and self._vocabulary[position].startswith(term)
+            and len(expansions) < self.MAX_PREFIX_EXPANSIONS
+        ):
+            expansions.append(self._vocabulary[position])
+            position += 1
+        return expansions
+
+    def _score(self, expanded: List[List[str]], dialog_id: Optional[str], *, require_all: bool) -> Dict[int, float]:
+        total_docs = len(self._docs)
+        avg_length = self._total_length / total_docs
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+
+        for terms in expanded:
+            seen: set[int] = set()
+            for term in terms:
+                postings = self._postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for entry_id, tf in postings.items():
+                    doc = self._docs[entry_id]
+                    if dialog_id is not None and doc.dialog_id != dialog_id:
+                        continue
+                    norm = tf + self.K1 * (1 - self.B + self.B * doc.length / avg_length)
+                    scores[entry_id] = scores.get(entry_id, 0.0) + idf * tf * (self.K1 + 1) / norm
+                    seen.add(entry_id)
+            for entry_id in seen:
+                matched[entry_id] = matched.get(entry_id, 0) + 1
+
+        if require_all:
+            return {entry_id: score for entry_id, score in scores.items() if matched[entry_id] == len(expanded)}
+        return scores
+
+    def _remove_locked(self, entry_id: int) -> None:
+        doc = self._docs.pop(entry_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(entry_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect.bisect_left(self._vocabulary, term)
+                if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                    del self._vocabulary[position]
@@ -1,17 +1,38 @@
-from typing import Literal, Optional, cast
+import itertools
+
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Literal, Optional, cast
 
 from rich.text import Text
 
 from openai.types.responses import ResponseInputParam, ResponseInputItemParam
 
+from core.stores.ContextWindow import ContextWindow, ContextWindowManager
+from core.stores.DialogSearchIndex import DialogSearchIndex, SearchHit
+from core.types.ai import ResponseChain
 from core.types.chat import ChatDialog, ChatEntry
 
 
+@dataclass(slots=True)
+class LLMMessageCache:
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    token_counts: list[int] = field(default_factory=list)
+    pending: list[tuple[ChatEntry, int]] = field(default_factory=list)
+
+
 class DialogStore:
-    def __init__(self) -> None:
+    LLM_ROLES = frozenset({"user", "assistant", "system"})
+    SEARCH_ROLES = frozenset({"user", "assistant"})
+
+    def __init__(self, context_manager: ContextWindowManager | None = None) -> None:
+        self.context_manager = context_manager or ContextWindowManager.from_config()
         self._dialogs: dict[str, ChatDialog] = {}
         self._active_dialog_id: Optional[str] = None
         self._dialog_counter: int = 0
+        self._response_chains: dict[str, ResponseChain] = {}
+        self._llm_caches: dict[str, LLMMessageCache] = {}
+        self._entry_ids = itertools.count(1)
+        self._search_index = DialogSearchIndex()
 
     @property
     def active_dialog_id(self) -> Optional[str]:
@@ -38,6 +59,9 @@ class DialogStore:
     def get_dialog(self, dialog_id: str) -> Optional[ChatDialog]:
         return self._dialogs.get(dialog_id)
 
+    def list_dialogs(self) -> list[ChatDialog]:
+        return list(self._dialogs.values())
+
     def list_entries(self, dialog_id: str) -> list[ChatEntry]:
         dialog = self._dialogs.get(dialog_id)
         if not dialog:
@@ -65,9 +89,63 @@ class DialogStore:
         else:
             entry["build_to_ui"] = bool(entry.get("build_to_ui", False))
 
-        self._dialogs[dialog_id]["messages"].append(entry)
+        self._add_entry(dialog_id, entry)
+        self._index_entry(dialog_id, entry)
+
+        cache = self._llm_caches.get(dialog_id)
+        if cache is not None:
+            self._track_llm_entry(cache, entry)
         return entry
 
+    def complete_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        self._index_entry(dialog_id, entry)
+        cache = self._llm_caches.get(dialog_id)
+        if cache is None:
+            return
+
+        for i, (pending_entry, position) in enumerate(cache.pending):
+            if pending_entry is entry:
+                del cache.pending[i]
+                break
+        else:
+            return
+
+        converted = self._to_llm_message(entry)
+        if converted is None:
+            return
+        if position != len(cache.messages):
+            self._invalidate_llm_cache(dialog_id)
+            return
+        cache.messages.append(converted[0])
+        cache.token_counts.append(converted[1])
+
+    def update_entry(
+        self,
+        dialog_id: str,
+        entry: ChatEntry,
+        *,
+        content: str | Text | None = None,
+        build_to_llm: bool | None = None,
+    ) -> ChatEntry:
+        if content is not None:
+            entry["content"] = content
+        if build_to_llm is not None:
+            entry["build_to_llm"] = bool(build_to_llm)
+        self._index_entry(dialog_id, entry)
+        self._invalidate_llm_cache(dialog_id)
+        return entry
+
+    def load_older_entries(self, dialog_id: str) -> list[ChatEntry]:
+        return []
+
+    def remove_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        dialog = self._dialogs.get(dialog_id)
+        if not dialog:
+            return
+        dialog["messages"] = [e for e in dialog["messages"] if e is not entry]
+        self._unindex_entry(dialog_id, entry)
+        self._invalidate_llm_cache(dialog_id)
+
     def make_entry(
         self,
         *,
@@ -106,30 +184,135 @@ class DialogStore:
         if dialog_id not in self._dialogs:
             return self._active_dialog_id
         del self._dialogs[dialog_id]
+        self._response_chains.pop(dialog_id, None)
+        self._llm_caches.pop(dialog_id, None)
+        self._search_index.remove_dialog(dialog_id)
 
         if self._active_dialog_id == dialog_id:
             self._active_dialog_id = next(iter(self._dialogs.keys()), None)
         return self._active_dialog_id
 
+    def search(self, query: str, *, limit: int = 10, dialog_id: Optional[str] = None) -> list[SearchHit]:
+        hits = self._search_index.search(query, limit=limit, dialog_id=dialog_id)
+        return self._with_titles(hits)
+
+    def close(self) -> None:
+        return None
+
+    def get_response_chain(self, dialog_id: str) -> ResponseChain:
+        chain = self._response_chains.get(dialog_id)
+        return chain.copy() if chain is not None else ResponseChain()
+
+    def set_response_chain(self, dialog_id: str, response_id: str) -> None:
+        if dialog_id not in self._dialogs or not response_id:
+            self.clear_response_chain(dialog_id)
+            return
+        chain = ResponseChain()
+        chain.advance(response_id, cast(list, self.build_llm_messages(dialog_id)))
+        self._response_chains[dialog_id] = chain
+
+    def clear_response_chain(self, dialog_id: str) -> None:
+        self._response_chains.pop(dialog_id, None)
+
     def build_llm_messages(self, dialog_id: str) -> ResponseInputParam:
-        dialog = self._dialogs.get(dialog_id)
-        if not dialog or not dialog.get("messages"):
+        cache = self._get_llm_cache(dialog_id)
+        if cache is None:
             return []
+        return cast(list[ResponseInputItemParam], list(cache.messages))
+
+    def build_context(
+        self,
+        dialog_id: str,
+        *,
+        provider: str = "",
+        model: str = "",
+        budget: int | None = None,
+    ) -> ContextWindow:
+        cache = self._get_llm_cache(dialog_id)
+        if budget is None:
+            budget = self.context_manager.budget_for(provider, model)
+        if cache is None:
+            return self.context_manager.fit([], [], budget)
+        return self.context_manager.fit(cache.messages, cache.token_counts, budget)
+
+    def _get_llm_cache(self, dialog_id: str) -> LLMMessageCache | None:
+        cache = self._llm_caches.get(dialog_id)
+        if cache is not None:
+            return cache
+
+        if dialog_id not in self._dialogs:
+            return None
+
+        cache = LLMMessageCache()
+        for entry in self._iter_llm_source(dialog_id):
+            self._track_llm_entry(cache, entry)
+        self._llm_caches[dialog_id] = cache
+        return cache
+
+    def _add_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        entry["entry_id"] = next(self._entry_ids)
+        self._dialogs[dialog_id]["messages"].append(entry)
+
+    def _index_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        entry_id = entry.get("entry_id")
+        if entry_id is None or entry.get("role") not in self.SEARCH_ROLES:
+            return
+        content = entry.get("content", "")
+        self._search_index.add(
+            entry_id,
+            dialog_id=dialog_id,
+            role=entry["role"],
+            text=content.plain if isinstance(content, Text) else str(content or ""),
+            timestamp=entry.get("timestamp"),
+        )
+
+    def _unindex_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        entry_id = entry.get("entry_id")
+        if entry_id is not None:
+            self._search_index.remove(entry_id)
+
+    def _with_titles(self, hits: list[SearchHit]) -> list[SearchHit]:
+        for hit in hits:
+            dialog = self._dialogs.get(hit.dialog_id)
+            hit.dialog_title = dialog["title"] if dialog else ""
+        return hits
+
+    def _iter_llm_source(self, dialog_id: str) -> Iterator[ChatEntry]:
+        return iter(self._dialogs[dialog_id]["messages"])
+
+    def _invalidate_llm_cache(self, dialog_id: str) -> None:
+        self._llm_caches.pop(dialog_id, None)
+        self._response_chains.pop(dialog_id, None)
+
+    def _track_llm_entry(self, cache: LLMMessageCache, entry: ChatEntry) -> None:
+        if not entry.get("build_to_llm", False) or entry.get("role") not in self.LLM_ROLES:
+            return
+
+        converted = self._to_llm_message(entry)
+        if converted is None:
+            cache.pending.append((entry, len(cache.messages)))
+            return
+        cache.messages.append(converted[0])
+        cache.token_counts.append(converted[1])
+
+    def _to_llm_message(self, entry: ChatEntry) -> tuple[dict[str, Any], int] | None:
+        role = entry["role"]
+        content = entry.get("content", "")
+        if isinstance(content, Text):
+            content_str = content.plain
+        else:
+            content_str = str(content or "")
+        if role == "assistant" and not content_str.strip():
+            return None
+        return {"role": role, "content": content_str}, self._estimate_entry_tokens(entry, content_str)
+
+    @staticmethod
+    def _estimate_entry_tokens(entry: ChatEntry, content_str: str) -> int:
+        cached = entry.get("token_estimate")
+        if cached is not None and entry.get("token_estimate_len") == len(content_str):
+            return cached
 
-        messages: list[ResponseInputItemParam] = []
-        for entry in dialog["messages"]:
-            role = entry.get("role")
-            if not entry.get("build_to_llm", False):
-                continue
-            if role not in {"user", "assistant", "system"}:
-                continue
-            content = entry.get("content", "")
-            if isinstance(content, Text):
-                content_str = content.plain
-            else:
-                content_str = str(content or "")
-            if role == "assistant" and not content_str.strip():
-                continue
-            messages.append(cast(ResponseInputItemParam, {"role": role, "content": content_str}))
-
-        return messages
+        tokens = ContextWindowManager.estimate_tokens(content_str)
+        entry["token_estimate"] = tokens
+        entry["token_estimate_len"] = len(content_str)
+        return tokens
@@ -0,0 +1,364 @@
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from rich.text import Text
+
+from core.stores.ContextWindow import ContextWindowManager
+from core.stores.DialogSearchIndex import SearchHit, tokenize
+from core.stores.DialogStore import DialogStore
+from core.types.chat import ChatDialog, ChatEntry
+
+
+class SqliteDialogStore(DialogStore):
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS dialogs (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dialog_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            title TEXT,
+            timestamp TEXT,
+            content TEXT NOT NULL,
+            content_kind TEXT NOT NULL,
+            bordered INTEGER NOT NULL,
+            render_mode TEXT NOT NULL,
+            build_to_llm INTEGER NOT NULL,
+            build_to_ui INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS entries_by_dialog ON entries (dialog_id, id)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+    SEARCH_SCHEMA = (
+        "CREATE VIRTUAL TABLE entries_fts USING fts5 (content, tokenize = 'unicode61 remove_diacritics 2')",
+        """
+        CREATE TRIGGER entries_fts_insert AFTER INSERT ON entries
+        WHEN new.role IN ('user', 'assistant') BEGIN
+            INSERT INTO entries_fts (rowid, content) VALUES (new.id, replace(replace(new.content, 'ё', 'е'), 'Ё', 'Е'));
+        END
+        """,
+        """
+        CREATE TRIGGER entries_fts_update AFTER UPDATE OF content ON entries
+        WHEN new.role IN ('user', 'assistant') BEGIN
+            UPDATE entries_fts SET content = replace(replace(new.content, 'ё', 'е'), 'Ё', 'Е') WHERE rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER entries_fts_delete AFTER DELETE ON entries
+        WHEN old.role IN ('user', 'assistant') BEGIN
+            DELETE FROM entries_fts WHERE rowid = old.id;
+        END
+        """,
+        """
+        INSERT INTO entries_fts (rowid, content)
+        SELECT id, replace(replace(content, 'ё', 'е'), 'Ё', 'Е') FROM entries WHERE role IN ('user', 'assistant')
+        """,
+    )
+    SNIPPET_TOKENS = 16
+    ENTRY_COLUMNS = "id, role, title, timestamp, content, content_kind, bordered, render_mode, build_to_llm, build_to_ui"
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        page_size: int = 200,
+        context_manager: ContextWindowManager | None = None,
+    ) -> None:
+        super().__init__(context_manager)
+        self.path = Path(path)
+        self.page_size = max(1, int(page_size))
+        self._loaded: set[str] = set()
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._conn.execute(statement)
+        self._ensure_search_schema()
+        self._load_dialogs()
+
+    def create_dialog(self, *, title: Optional[str] = None, make_active: bool = False) -> ChatDialog:
+        dialog = super().create_dialog(title=title, make_active=False)
+        self._loaded.add(dialog["id"])
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO dialogs (id, title, created_at) VALUES (?, ?, ?)",
+                (dialog["id"], dialog["title"], time.time()),
+            )
+            self._set_meta("dialog_counter", str(self._dialog_counter))
+
+        if make_active:
+            self.set_active(dialog["id"])
+        return dialog
+
+    def set_active(self, dialog_id: str) -> None:
+        previous = self._active_dialog_id
+        super().set_active(dialog_id)
+        if self._active_dialog_id == previous:
+            return
+
+        if previous is not None:
+            self._unload(previous)
+        with self._lock:
+            self._set_meta("active_dialog_id", dialog_id)
+
+    def list_entries(self, dialog_id: str) -> list[ChatEntry]:
+        self._ensure_loaded(dialog_id)
+        return super().list_entries(dialog_id)
+
+    def load_older_entries(self, dialog_id: str) -> list[ChatEntry]:
+        dialog = self._dialogs.get(dialog_id)
+        if not dialog:
+            return []
+        if dialog_id not in self._loaded:
+            self._ensure_loaded(dialog_id)
+            return list(dialog["messages"])
+
+        oldest = next((entry.get("entry_id") for entry in dialog["messages"] if "entry_id" in entry), None)
+        if oldest is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.ENTRY_COLUMNS} FROM entries WHERE dialog_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (dialog_id, oldest, self.page_size),
+            ).fetchall()
+        older = [self._row_to_entry(row) for row in reversed(rows)]
+        dialog["messages"][:0] = older
+        return older
+
+    def complete_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        super().complete_entry(dialog_id, entry)
+        self._update_row(entry)
+
+    def update_entry(
+        self,
+        dialog_id: str,
+        entry: ChatEntry,
+        *,
+        content: str | Text | None = None,
+        build_to_llm: bool | None = None,
+    ) -> ChatEntry:
+        super().update_entry(dialog_id, entry, content=content, build_to_llm=build_to_llm)
+        self._update_row(entry)
+        return entry
+
+    def remove_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        super().remove_entry(dialog_id, entry)
+        entry_id = entry.get("entry_id")
+        if entry_id is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+
+    def rename_dialog(self, dialog_id: str, title: str) -> None:
+        super().rename_dialog(dialog_id, title)
+        with self._lock:
+            self._conn.execute("UPDATE dialogs SET title = ? WHERE id = ?", (title, dialog_id))
+
+    def delete_dialog(self, dialog_id: str) -> Optional[str]:
+        known = dialog_id in self._dialogs
+        next_id = super().delete_dialog(dialog_id)
+        if not known:
+            return next_id
+
+        self._loaded.discard(dialog_id)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM entries WHERE dialog_id = ?", (dialog_id,))
+                self._conn.execute("DELETE FROM dialogs WHERE id = ?", (dialog_id,))
+                self._set_meta("active_dialog_id", next_id or "")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return next_id
+
+    def search(self, query: str, *, limit: int = 10, dialog_id: Optional[str] = None) -> list[SearchHit]:
+        terms = [term.replace('"', "") for term in tokenize(query)]
+        if not terms or limit <= 0:
+            return []
+
+        for operator in (" ", " OR "):
+            hits = self._search_fts(operator.join(f'"{term}"*' for term in terms), limit, dialog_id)
+            if hits or len(terms) == 1:
+                return self._with_titles(hits)
+        return []
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _search_fts(self, match: str, limit: int, dialog_id: Optional[str]) -> list[SearchHit]:
+        sql = (
+            "SELECT e.id, e.dialog_id, e.role, e.timestamp, "
+            f"snippet(entries_fts, 0, '**', '**', '…', {self.SNIPPET_TOKENS}), bm25(entries_fts) "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid WHERE entries_fts MATCH ?"
+        )
+        params: list[Any] = [match]
+        if dialog_id is not None:
+            sql += " AND e.dialog_id = ?"
+            params.append(dialog_id)
+        sql += " ORDER BY bm25(entries_fts) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                dialog_id=row_dialog_id,
+                entry_id=entry_id,
+                role=role,
+                snippet=" ".join(snippet.split()),
+                score=-rank,
+                timestamp=timestamp,
+            )
+            for entry_id, row_dialog_id, role, timestamp, snippet, rank in rows
+        ]
+
+    def _ensure_search_schema(self) -> None:
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entries_fts'"
+            ).fetchone()
+            if exists:
+                return
+            self._conn.execute("BEGIN")
+            try:
+                for statement in self.SEARCH_SCHEMA:
+                    self._conn.execute(statement)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _load_dialogs(self) -> None:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, title FROM dialogs ORDER BY created_at, rowid").fetchall()
+            meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+        for dialog_id, title in rows:
+            self._dialogs[dialog_id] = {"id": dialog_id, "title": title, "messages": []}
+        self._dialog_counter = int(meta.get("dialog_counter") or len(rows))
+        active = meta.get("active_dialog_id")
+        if active in self._dialogs:
+            self._active_dialog_id = active
+
+    def _ensure_loaded(self, dialog_id: str) -> None:
+        dialog = self._dialogs.get(dialog_id)
+        if not dialog or dialog_id in self._loaded:
+            return
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.ENTRY_COLUMNS} FROM entries WHERE dialog_id = ? ORDER BY id DESC LIMIT ?",
+                (dialog_id, self.page_size),
+            ).fetchall()
+        dialog["messages"] = [self._row_to_entry(row) for row in reversed(rows)]
+        self._loaded.add(dialog_id)
+
+    def _unload(self, dialog_id: str) -> None:
+        dialog = self._dialogs.get(dialog_id)
+        if not dialog or dialog_id not in self._loaded:
+            return
+        dialog["messages"] = []
+        self._loaded.discard(dialog_id)
+        self._llm_caches.pop(dialog_id, None)
+
+    def _add_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        content, kind = self._encode_content(entry.get("content", ""))
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (dialog_id, role, title, timestamp, content, content_kind, bordered, render_mode, "
+                "build_to_llm, build_to_ui) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    dialog_id,
+                    entry["role"],
+                    entry.get("title"),
+                    entry.get("timestamp"),
+                    content,
+                    kind,
+                    int(bool(entry.get("bordered", True))),
+                    entry.get("render_mode") or "markdown",
+                    int(entry["build_to_llm"]),
+                    int(entry["build_to_ui"]),
+                ),
+            )
+        entry["entry_id"] = int(cursor.lastrowid or 0)
+        if dialog_id in self._loaded:
+            self._dialogs[dialog_id]["messages"].append(entry)
+
+    def _index_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        return None
+
+    def _unindex_entry(self, dialog_id: str, entry: ChatEntry) -> None:
+        return None
+
+    def _update_row(self, entry: ChatEntry) -> None:
+        entry_id = entry.get("entry_id")
+        if entry_id is None:
+            return
+        content, kind = self._encode_content(entry.get("content", ""))
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET content = ?, content_kind = ?, build_to_llm = ? WHERE id = ?",
+                (content, kind, int(bool(entry.get("build_to_llm", False))), entry_id),
+            )
+
+    def _iter_llm_source(self, dialog_id: str) -> Iterator[ChatEntry]:
+        loaded = {
+            entry["entry_id"]: entry for entry in self._dialogs[dialog_id]["messages"] if "entry_id" in entry
+        }
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.ENTRY_COLUMNS} FROM entries WHERE dialog_id = ? AND build_to_llm = 1 ORDER BY id",
+                (dialog_id,),
+            ).fetchall()
+        for row in rows:
+            yield loaded.get(row[0]) or self._row_to_entry(row)
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @classmethod
+    def _row_to_entry(cls, row: tuple[Any, ...]) -> ChatEntry:
+        entry_id, role, title, timestamp, content, kind, bordered, render_mode, build_to_llm, build_to_ui = row
+        return ChatEntry(
+            role=role,
+            title=title,
+            timestamp=timestamp,
+            content=cls._decode_content(content, kind),
+            bordered=bool(bordered),
+            render_mode=render_mode,
+            build_to_llm=bool(build_to_llm),
+            build_to_ui=bool(build_to_ui),
+            entry_id=entry_id,
+        )
+
+    @staticmethod
+    def _encode_content(content: str | Text) -> tuple[str, str]:
+        if isinstance(content, Text):
+            return content.markup, "markup"
+        return str(content or ""), "text"
+
+    @staticmethod
+    def _decode_content(content: str, kind: str) -> str | Text:
+        if kind == "markup":
+            return Text.from_markup(content)
+        return content
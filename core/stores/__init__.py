@@ -1,7 +1,19 @@
 from core.stores.DialogStore import DialogStore
+from core.stores.SqliteDialogStore import SqliteDialogStore
 from core.stores.CacheStore import CacheStore
+from core.stores.CacheMemoryTier import CacheMemoryTier
+from core.stores.CacheBlobStore import CacheBlobStore
+from core.stores.ContextWindow import ContextWindow, ContextWindowManager
+from core.stores.DialogSearchIndex import DialogSearchIndex, SearchHit
 
 __all__ = [
     "DialogStore",
+    "SqliteDialogStore",
     "CacheStore",
+    "CacheMemoryTier",
+    "CacheBlobStore",
+    "ContextWindow",
+    "ContextWindowManager",
+    "DialogSearchIndex",
+    "SearchHit",
 ]
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from core.interfaces import ICacheBackend
+from core.stores.backends.FileLock import FileLock
+
+
+class LogCacheBackend(ICacheBackend):
+    COMPACT_MIN_BYTES = 1 << 20
+
+    def __init__(self, path: str | Path, *, compact_ratio: float = 0.5, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.compact_ratio = min(max(float(compact_ratio), 0.1), 0.9)
+        self.fsync = fsync
+        self._index: dict[str, tuple[int, int]] = {}
+        self._size = 0
+        self._live_bytes = 0
+        self._identity: tuple[int, int] | None = None
+        self._changed: set[str] = set()
+        self._reloaded = False
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._file_lock.hold():
+            self._file = self._open()
+            self._replay(0, truncate=True)
+        self._changed.clear()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            record = self._read_record(*location)
+        return record.get("v")
+
+    def set(self, key: str, value: Any) -> None:
+        line = self._encode({"k": key, "v": value})
+        with self._lock, self._file_lock.hold():
+            self._catch_up(truncate=True)
+            previous = self._index.get(key)
+            offset = self._append(line)
+            self._index[key] = (offset, len(line))
+            self._live_bytes += len(line) - (previous[1] if previous else 0)
+            self._maybe_compact()
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._file_lock.hold():
+            self._catch_up(truncate=True)
+            previous = self._index.pop(key, None)
+            if previous is None:
+                return
+            self._append(self._encode({"k": key, "del": True}))
+            self._live_bytes -= previous[1]
+            self._maybe_compact()
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def refresh(self) -> list[str] | None:
+        with self._lock:
+            if self._disk_changed():
+                with self._file_lock.hold(exclusive=False):
+                    self._catch_up(truncate=False)
+            if self._reloaded:
+                self._reloaded = False
+                self._changed.clear()
+                return None
+            changed = list(self._changed)
+            self._changed.clear()
+            return changed
+
+    def compact(self) -> None:
+        with self._lock, self._file_lock.hold():
+            self._catch_up(truncate=True)
+            tmp_path = self.path.with_name(self.path.name + ".compact")
+            index: dict[str, tuple[int, int]] = {}
+            offset = 0
+            with tmp_path.open("wb") as out:
+                for key, (start, length) in self._index.items():
+                    self._file.seek(start)
+                    out.write(self._file.read(length))
+                    index[key] = (offset, length)
+                    offset += length
+                out.flush()
+                os.fsync(out.fileno())
+
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = self._open()
+            self._index = index
+            self._size = offset
+            self._live_bytes = offset
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+            self._file_lock.close()
+
+    def _open(self) -> BinaryIO:
+        file = self.path.open("a+b")
+        stat = os.fstat(file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        return file
+
+    def _disk_state(self) -> tuple[tuple[int, int], int] | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_dev, stat.st_ino), stat.st_size
+
+    def _disk_changed(self) -> bool:
+        return self._disk_state() != (self._identity, self._size)
+
+    def _catch_up(self, *, truncate: bool) -> None:
+        state = self._disk_state()
+        if state == (self._identity, self._size):
+            return
+        if state is None or state[0] != self._identity or state[1] < self._size:
+            self._file.close()
+            self._file = self._open()
+            self._index = {}
+            self._size = 0
+            self._live_bytes = 0
+            self._reloaded = True
+            self._replay(0, truncate=truncate)
+        else:
+            self._replay(self._size, truncate=truncate)
+
+    def _replay(self, start: int, *, truncate: bool) -> None:
+        self._file.seek(start)
+        offset = start
+        for line in self._file:
+            if not line.endswith(b"\n"):
+                if truncate:
+                    self._file.truncate(offset)
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                continue
+
+            key = record.get("k") if isinstance(record, dict) else None
+            if isinstance(key, str):
+                self._changed.add(key)
+                previous = self._index.pop(key, None)
+                if previous is not None:
+                    self._live_bytes -= previous[1]
+                if not record.get("del"):
+                    self._index[key] = (offset, len(line))
+                    self._live_bytes += len(line)
+            offset += len(line)
+        self._size = offset
+
+    def _append(self, line: bytes) -> int:
+        offset = self._size
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(line)
+        return offset
+
+    def _read_record(self, offset: int, length: int) -> dict[str, Any]:
+        self._file.seek(offset)
+        return json.loads(self._file.read(length))
+
+    def _maybe_compact(self) -> None:
+        garbage = self._size - self._live_bytes
+        if self._size >= self.COMPACT_MIN_BYTES and garbage > self._size * self.compact_ratio:
+            self.compact()
+
+    @staticmethod
+    def _encode(record: dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
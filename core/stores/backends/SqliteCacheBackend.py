@@ -0,0 +1,67 @@
+import json
+import sqlite3
+import threading
+
+from pathlib import Path
+from typing import Any, Iterator
+
+from core.interfaces import ICacheBackend
+
+
+class SqliteCacheBackend(ICacheBackend):
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._data_version = self._read_data_version()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, payload),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM cache")]
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM cache").fetchall()
+        for key, payload in rows:
+            yield key, json.loads(payload)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0])
+
+    def refresh(self) -> list[str] | None:
+        with self._lock:
+            version = self._read_data_version()
+            if version == self._data_version:
+                return []
+            self._data_version = version
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _read_data_version(self) -> int:
+        return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
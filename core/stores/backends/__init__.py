@@ -0,0 +1,9 @@
+from core.stores.backends.FileLock import FileLock
+from core.stores.backends.LogCacheBackend import LogCacheBackend
+from core.stores.backends.SqliteCacheBackend import SqliteCacheBackend
+
+__all__ = [
+    "FileLock",
+    "LogCacheBackend",
+    "SqliteCacheBackend",
+]
@@ -3,7 +3,7 @@ from typing import Any, Callable, Dict, Literal, Tuple, Type
 from core.providers import BaseAIProvider
 
 AllowedAIToolTypes = Literal['normal', 'flat']
-AllowedAIProviders = Literal['openrouter', 'ollama']
+AllowedAIProviders = Literal['openrouter', 'ollama', 'replay']
 
 AIProviderRecord = Tuple[
     str,
@@ -1,4 +1,4 @@
-from typing import Any, NotRequired, TypedDict, TypeAlias
+from typing import Any, Iterator, Mapping, NotRequired, TypedDict, TypeAlias
 
 from openai.types.responses import ResponseStreamEvent
 from ollama import ChatResponse
@@ -26,6 +26,8 @@ class OpenRouterAIResponseChunk(TypedDict, total=False):
 
     tool_event: NotRequired[dict]
 
+    response_id: NotRequired[str]
+
 
 class OllamaAIResponseChunk(TypedDict, total=False):
     event: ChatResponse | Any
@@ -39,4 +41,170 @@ class OllamaAIResponseChunk(TypedDict, total=False):
     tool_event: NotRequired[dict]
 
 
-AIResponseChunk: TypeAlias = OpenRouterAIResponseChunk | OllamaAIResponseChunk
\ No newline at end of file
+class AIChunk:
+    KIND_CONTENT = "content"
+    KIND_TOOL_CALL = "tool_call"
+    KIND_TOOL_ARGUMENTS_DELTA = "tool_arguments_delta"
+    KIND_TOOL_ARGUMENTS = "tool_arguments"
+    KIND_TOOL_EVENT = "tool_event"
+    KIND_DONE = "done"
+    KIND_EVENT = "event"
+
+    TOOL_CALL_KINDS = frozenset({KIND_TOOL_CALL, KIND_TOOL_ARGUMENTS_DELTA, KIND_TOOL_ARGUMENTS})
+
+    FIELDS = (
+        "event",
+        "event_type",
+        "ai_content_part",
+        "tool_call",
+        "tool_call_index",
+        "tool_call_id",
+        "tool_call_arguments_delta",
+        "tool_call_arguments",
+        "tool_event",
+        "response_id",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = (
+        "kind",
+        "event_type",
+        "ai_content_part",
+        "tool_call",
+        "tool_call_index",
+        "tool_call_id",
+        "tool_call_arguments_delta",
+        "tool_call_arguments",
+        "tool_event",
+        "response_id",
+        "_event",
+    )
+
+    def __init__(self, kind: str, event_type: str = "", ai_content_part: str | None = None, event: Any = None) -> None:
+        self.kind = kind
+        self.event_type = event_type
+        self.ai_content_part = ai_content_part
+        self.tool_call = None
+        self.tool_call_index = None
+        self.tool_call_id = None
+        self.tool_call_arguments_delta = None
+        self.tool_call_arguments = None
+        self.tool_event = None
+        self.response_id = None
+        self._event = event
+
+    @classmethod
+    def for_tool_call(
+        cls,
+        kind: str,
+        event_type: str,
+        *,
+        tool_call: FunctionCallItem | dict[str, Any] | None = None,
+        tool_call_index: int | None = None,
+        tool_call_id: str | None = None,
+        tool_call_arguments_delta: str | None = None,
+        tool_call_arguments: str | None = None,
+        event: Any = None,
+    ) -> "AIChunk":
+        chunk = cls(kind, event_type, event=event)
+        chunk.tool_call = tool_call
+        chunk.tool_call_index = tool_call_index
+        chunk.tool_call_id = tool_call_id
+        chunk.tool_call_arguments_delta = tool_call_arguments_delta
+        chunk.tool_call_arguments = tool_call_arguments
+        return chunk
+
+    @classmethod
+    def from_tool_event(cls, ev: dict) -> "AIChunk":
+        chunk = cls(cls.KIND_TOOL_EVENT, str(ev.get("type") or "tool_event"), event=ev)
+        chunk.tool_event = ev
+        return chunk
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AIChunk":
+        if data.get("tool_event") is not None:
+            kind = cls.KIND_TOOL_EVENT
+        elif data.get("tool_call") is not None:
+            kind = cls.KIND_TOOL_CALL
+        elif data.get("tool_call_arguments") is not None:
+            kind = cls.KIND_TOOL_ARGUMENTS
+        elif data.get("tool_call_arguments_delta") is not None:
+            kind = cls.KIND_TOOL_ARGUMENTS_DELTA
+        elif data.get("ai_content_part") is not None:
+            kind = cls.KIND_CONTENT
+        elif data.get("response_id") is not None:
+            kind = cls.KIND_DONE
+        else:
+            kind = cls.KIND_EVENT
+
+        chunk = cls.for_tool_call(
+            kind,
+            str(data.get("event_type") or ""),
+            tool_call=data.get("tool_call"),
+            tool_call_index=data.get("tool_call_index"),
+            tool_call_id=data.get("tool_call_id"),
+            tool_call_arguments_delta=data.get("tool_call_arguments_delta"),
+            tool_call_arguments=data.get("tool_call_arguments"),
+            event=data.get("event"),
+        )
+        chunk.ai_content_part = data.get("ai_content_part")
+        chunk.tool_event = data.get("tool_event")
+        chunk.response_id = data.get("response_id")
+        return chunk
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> "AIChunk":
+        chunk = cls.from_dict(record)
+        kind = record.get("kind")
+        if isinstance(kind, str) and kind:
+            chunk.kind = kind
+        return chunk
+
+    @classmethod
+    def coerce(cls, chunk: "AIChunk | Mapping[str, Any]") -> "AIChunk":
+        if isinstance(chunk, AIChunk):
+            return chunk
+        return cls.from_dict(chunk)
+
+    @property
+    def event(self) -> Any:
+        return self._event
+
+    def attach_event(self, event: Any) -> "AIChunk":
+        self._event = event
+        return self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._FIELD_SET:
+            return default
+        value = self._event if key == "event" else getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return (key for key in self.FIELDS if self.get(key) is not None)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: self.get(key) for key in self.keys()}
+
+    def to_record(self) -> dict[str, Any]:
+        record: dict[str, Any] = {"kind": self.kind}
+        for key in self.keys():
+            if key != "event":
+                record[key] = self.get(key)
+        return record
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={self.get(key)!r}" for key in self.keys() if key != "event")
+        return f"AIChunk(kind={self.kind!r}, {fields})"
+
+
+AIResponseChunk: TypeAlias = AIChunk
@@ -0,0 +1,50 @@
+import hashlib
+import json
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+
+@dataclass(slots=True)
+class ResponseChain:
+    response_id: str = ""
+    covered: int = 0
+    digest: str = ""
+
+    MODEL_ITEM_TYPES = frozenset({"function_call", "reasoning", "message"})
+
+    @property
+    def active(self) -> bool:
+        return bool(self.response_id)
+
+    def advance(self, response_id: str, messages: Sequence[Mapping[str, Any]], covered: int | None = None) -> None:
+        self.response_id = response_id
+        self.covered = len(messages) if covered is None else covered
+        self.digest = self.digest_of(messages, self.covered)
+
+    def reset(self) -> None:
+        self.response_id = ""
+        self.covered = 0
+        self.digest = ""
+
+    def copy(self) -> "ResponseChain":
+        return ResponseChain(self.response_id, self.covered, self.digest)
+
+    def matches(self, messages: Sequence[Mapping[str, Any]]) -> bool:
+        if not self.active or self.covered > len(messages):
+            return False
+        return self.digest == self.digest_of(messages, self.covered)
+
+    def pending_items(self, messages: Sequence[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        return [item for item in messages[self.covered:] if not self.is_model_item(item)]
+
+    @classmethod
+    def is_model_item(cls, item: Mapping[str, Any]) -> bool:
+        return item.get("role") == "assistant" or item.get("type") in cls.MODEL_ITEM_TYPES
+
+    @staticmethod
+    def digest_of(messages: Sequence[Mapping[str, Any]], covered: int) -> str:
+        if covered <= 0:
+            return ""
+        last = json.dumps(messages[covered - 1], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(f"{covered}:{last}".encode("utf-8")).hexdigest()[:16]
@@ -1,4 +1,5 @@
-from typing import Dict, List, Protocol, TypedDict, Callable, NotRequired, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Literal, Protocol, Sequence, TypedDict, Callable, NotRequired, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.general.agent.ToolBuilder import ToolBuilder
@@ -29,6 +30,17 @@ class FlatToolObject(TypedDict, total=False):
     strict: NotRequired[bool]
 
 
+class ToolOptions(TypedDict, total=False):
+    parallel: bool
+    read_only: bool
+    isolated: bool
+    timeout_seconds: int
+    cacheable: bool
+    cache_ttl_seconds: int
+    cache_key_args: list[str] | None
+    keywords: list[str]
+
+
 class ToolClassSetupObject(TypedDict):
     name: str
     handler: Callable
@@ -40,3 +52,26 @@ class ToolClassProtocol(Protocol):
 
     @staticmethod
     def get_commands() -> List[ToolClassSetupObject]: ...
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    name: str
+    flavor: Literal['normal', 'flat']
+    definition: Dict[str, Any]
+    content_hash: str
+    options: ToolOptions
+    handler: Callable | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSet:
+    flavor: Literal['normal', 'flat']
+    specs: tuple[ToolSpec, ...]
+    definitions: Sequence[Dict[str, Any]]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.definitions)
+
+    def __len__(self) -> int:
+        return len(self.specs)
@@ -1,12 +1,16 @@
-from core.types.ai.AIChunk import AIResponseChunk, OllamaAIResponseChunk, OpenRouterAIResponseChunk
+from core.types.ai.AIChunk import AIChunk, AIResponseChunk, OllamaAIResponseChunk, OpenRouterAIResponseChunk
 from core.types.ai.AIRequest import AIRequest
+from core.types.ai.AIResponseChain import ResponseChain
 from core.types.ai.AITools import (
     ToolFunctionParamsObject,
     ToolFunctionObject,
     ToolObject,
     ToolClassSetupObject,
     ToolClassProtocol,
-    FlatToolObject
+    FlatToolObject,
+    ToolOptions,
+    ToolSpec,
+    ToolSet
 )
 from core.types.ai.AIAssistant import (
     AllowedAIToolTypes,
@@ -16,16 +20,21 @@ from core.types.ai.AIAssistant import (
 )
 
 __all__ = [
+    "AIChunk",
     "AIResponseChunk",
     "OllamaAIResponseChunk",
     "OpenRouterAIResponseChunk",
     "AIRequest",
+    "ResponseChain",
     "ToolFunctionParamsObject",
     "ToolFunctionObject",
     "ToolObject",
     "ToolClassSetupObject",
     "ToolClassProtocol",
     "FlatToolObject",
+    "ToolOptions",
+    "ToolSpec",
+    "ToolSet",
     "AllowedAIToolTypes",
     "AllowedAIProviders",
     "AIProviderRecord",
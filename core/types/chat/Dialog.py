@@ -1,4 +1,4 @@
-from typing import Literal, TypedDict, Optional
+from typing import Literal, NotRequired, TypedDict, Optional
 
 from rich.text import Text
 
@@ -12,6 +12,9 @@ class ChatEntry(TypedDict):
     render_mode: Literal["markdown", "markup"]
     build_to_llm: bool
     build_to_ui: bool
+    entry_id: NotRequired[int]
+    token_estimate: NotRequired[int]
+    token_estimate_len: NotRequired[int]
 
 
 class ChatDialog(TypedDict):
@@ -1,7 +1,8 @@
 import asyncio
 import json
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, cast
 import inspect
 
 from openai import APIStatusError
@@ -9,16 +10,20 @@ from openai.types.responses import ResponseInputParam
 from rich.text import Text
 
 from textual.app import App, ComposeResult
+from textual.binding import Binding
 from textual.containers import Container, VerticalScroll
 from textual.widgets import Footer, Header, Input
 from textual import events
 
 from core.general.agent.Assistant import Assistant
+from core.general.agent.AsyncAssistant import AsyncAssistant
+from core.general.agent.services import DialogSearchService
 from core.ui.components.general import ASCIIDrawer
 from core.ui.components.modal import ConfirmDeleteDialogModal, RenameDialogModal
 from core.ui.components.sidebar import DialogSidebar
 from core.types.chat import ChatEntry, ChatDialog
-from core.stores import DialogStore
+from core.general import Config
+from core.stores import DialogStore, SqliteDialogStore
 
 from core.ui.components.chat import ChatBubble
 from core.ui.components.chat.CommandPalette import CommandPalette
@@ -40,6 +45,8 @@ class CharlieChatApp(App):
         ("ctrl+n", "new_dialog", "Новый диалог"),
         ("ctrl+e", "rename_dialog", "Переименовать"),
         ("ctrl+d", "delete_dialog", "Удалить"),
+        ("ctrl+o", "load_older", "Ранее"),
+        Binding("ctrl+k", "cancel_tools", "Прервать инструменты", priority=True),
         ("ctrl+c", "quit", "Quit"),
     ]
 
@@ -51,9 +58,16 @@ class CharlieChatApp(App):
         super().__init__()
         self.assistant = assistant
         self._system_prompt = SYSTEM_PROMPT_BASE.format(assistant_name="Чарли")
-        self._store = DialogStore()
+        self._store = self._create_store()
+        DialogSearchService.bind(self._store)
         self._busy: bool = False
 
+    @staticmethod
+    def _create_store() -> DialogStore:
+        if Config.DIALOG_STORE == "sqlite":
+            return SqliteDialogStore(Config.DIALOG_STORE_PATH, page_size=Config.DIALOG_STORE_PAGE_SIZE)
+        return DialogStore()
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with Container(id="root"):
@@ -80,10 +94,19 @@ class CharlieChatApp(App):
     def on_mount(self) -> None:
         self.title = "Чарли"
         self.sub_title = "ИИ Ассистент"
-        dialog = self._create_dialog(title="Диалог 1", make_active=True)
-        self._seed_dialog(dialog_id=dialog["id"])
+        dialogs = self._store.list_dialogs()
+        if dialogs:
+            for dialog in dialogs:
+                self._sidebar.add_dialog(dialog_id=dialog["id"], title=dialog["title"])
+            self._set_active_dialog(self._store.active_dialog_id or dialogs[-1]["id"])
+        else:
+            dialog = self._create_dialog(title="Диалог 1", make_active=True)
+            self._seed_dialog(dialog_id=dialog["id"])
         self._input.focus()
 
+    def on_unmount(self) -> None:
+        self._store.close()
+
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id != "chat_input":
             return
@@ -250,13 +273,15 @@ class CharlieChatApp(App):
 
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         self._input.value = ""
-        await self._handle_submitted_text((event.value or "").strip())
+        text = (event.value or "").strip()
+        if text:
+            self.run_worker(self._handle_submitted_text(text), group="reply")
 
     def send_as_user(self, message: str) -> None:
         text = (message or "").strip()
         if not text:
             return
-        self.run_worker(self._handle_submitted_text(text), exclusive=True)
+        self.run_worker(self._handle_submitted_text(text), group="reply")
 
     def apply_theme_css(self, css: str) -> None:
         self.__class__.CSS = css
@@ -385,57 +410,137 @@ class CharlieChatApp(App):
     async def _stream_ai_reply(self, *, dialog_id: str, user_text: str, bubble: ChatBubble, entry: ChatEntry) -> None:
         accumulated = ""
 
-        tool_events: list[dict] = []
+        tool_runs: dict[str, dict] = {}
 
-        def update_tools_view() -> None:
-            if not tool_events:
-                return
+        in_worker_thread = False
+
+        tracer = self.assistant.tracer
+        turn_span = tracer.start_span(
+            "chat.turn",
+            parent=None,
+            dialog_id=dialog_id,
+            provider=type(self.assistant.provider).__name__,
+            model=self.assistant.provider.model_name,
+        )
+        tracing = turn_span.recording
+        ui_apply = {"calls": 0, "ms": 0.0, "max_ms": 0.0}
+
+        def apply_ui(fn, *args, **kwargs) -> None:
+            started = time.monotonic() if tracing else 0.0
+            if in_worker_thread:
+                self.call_from_thread(fn, *args, **kwargs)
+            else:
+                fn(*args, **kwargs)
+            if tracing:
+                elapsed = (time.monotonic() - started) * 1000
+                ui_apply["calls"] += 1
+                ui_apply["ms"] += elapsed
+                ui_apply["max_ms"] = max(ui_apply["max_ms"], elapsed)
 
-            used = [ev for ev in tool_events if ev.get("type") == "tool_result"]
-            if not used:
+        def update_tools_view() -> None:
+            if not tool_runs:
                 return
 
             total_ms = 0
             tools_view = Text()
             tools_view.append("Использованные инструменты", style="bold yellow")
 
-            for ev in used:
-                name = ev.get("name") or ""
-                ms = int(ev.get("duration_ms") or 0)
-                total_ms += ms
+            for run in tool_runs.values():
+                state = run.get("state")
+                ms = int(run.get("ms") or 0)
                 tools_view.append("\n• ", style="dim")
-                tools_view.append(name, style="cyan")
+                tools_view.append(run.get("name") or "", style="red" if state == "error" else "cyan")
+
+                if state == "running":
+                    tools_view.append(f" — выполняется {ms} ms", style="italic dim")
+                    continue
+
+                total_ms += ms
                 tools_view.append(f" — {ms} ms", style="dim")
+                if state == "error":
+                    tools_view.append(" (ошибка)", style="red")
+                if run.get("cached"):
+                    tools_view.append(" (кэш)", style="dim")
 
             tools_view.append("\n\nИтого: ", style="dim")
             tools_view.append(f"{total_ms} ms", style="bold")
-            self.call_from_thread(bubble.set_tool_renderable, tools_view)
+            apply_ui(bubble.set_tool_renderable, tools_view)
 
         def on_tool_event(ev: dict) -> None:
-            tool_events.append(ev)
+            ev_type = ev.get("type")
+            run_key = str(ev.get("run_id") or ev.get("id") or ev.get("name") or "")
+            run = tool_runs.setdefault(run_key, {"name": ev.get("name") or "", "state": "running", "ms": 0})
+
+            if ev_type == "tool_progress":
+                if run["state"] == "running":
+                    run["ms"] = int(ev.get("elapsed_ms") or 0)
+            elif ev_type in {"tool_result", "tool_error"}:
+                run["state"] = "error" if ev_type == "tool_error" else "done"
+                run["ms"] = int(ev.get("duration_ms") or 0)
+                run["cached"] = bool((ev.get("cache") or {}).get("hit"))
+            elif ev_type != "tool_call":
+                return
+
             update_tools_view()
 
-        messages = self._store.build_llm_messages(dialog_id)
+        def on_chunk(chunk) -> None:
+            nonlocal accumulated
+            tool_ev = chunk.get("tool_event")
+            if isinstance(tool_ev, dict) and tool_ev:
+                on_tool_event(tool_ev)
+
+            content_chunk_data = chunk.get("ai_content_part") or ""
+            if not content_chunk_data:
+                return
+            if tracing and not accumulated:
+                turn_span.set_attribute("ttft_ms", round(turn_span.elapsed_ms(), 3))
+            accumulated += content_chunk_data
+            entry["content"] += content_chunk_data
+            apply_ui(bubble.append_text, content_chunk_data)
+            apply_ui(self._chat_scroll.scroll_end, animate=False)
+
+        with tracer.span("ui.build_messages", parent=turn_span) as build_span:
+            context = await asyncio.to_thread(
+                self._store.build_context,
+                dialog_id,
+                provider=self.assistant.provider_id,
+                model=self.assistant.provider.model_name,
+            )
+            messages = cast(ResponseInputParam, context.messages)
+            build_span.set_attributes(
+                messages=len(messages),
+                tokens=context.tokens,
+                budget=context.budget,
+                dropped_tokens=context.dropped_tokens,
+                dropped_messages=context.dropped_messages,
+            )
+
+        chain = await asyncio.to_thread(self._store.get_response_chain, dialog_id)
+        if context.trimmed:
+            chain.reset()
 
         def run_sync_stream() -> str:
-            nonlocal accumulated
-            for chunk in self.assistant.generate_response(messages=messages, user_text=user_text):
-                tool_ev = chunk.get("tool_event")
-                if isinstance(tool_ev, dict) and tool_ev:
-                    on_tool_event(tool_ev)
+            for chunk in self.assistant.generate_response(messages=messages, user_text=user_text, chain=chain):
+                on_chunk(chunk)
+            return accumulated
 
-                content_chunk_data = chunk.get("ai_content_part") or ""
-                if not content_chunk_data:
-                    continue
-                accumulated += content_chunk_data
-                entry["content"] += content_chunk_data
-                self.call_from_thread(bubble.append_text, content_chunk_data)
-                self.call_from_thread(self._chat_scroll.scroll_end, animate=False)
+        async def run_async_stream() -> str:
+            async for chunk in self.assistant.generate_response(messages=messages, user_text=user_text, chain=chain):
+                on_chunk(chunk)
             return accumulated
-            
+
         try:
-            await asyncio.to_thread(run_sync_stream)
+            with tracer.activate(turn_span):
+                if isinstance(self.assistant, AsyncAssistant):
+                    await run_async_stream()
+                else:
+                    in_worker_thread = True
+                    await asyncio.to_thread(run_sync_stream)
+            await asyncio.to_thread(self._store.complete_entry, dialog_id, entry)
+            await asyncio.to_thread(self._store.set_response_chain, dialog_id, chain.response_id)
         except Exception as exc:
+            turn_span.set_error(exc)
+            await asyncio.to_thread(self._store.clear_response_chain, dialog_id)
             if isinstance(exc, APIStatusError):
                 http_error_content = json.loads(exc.response.content.decode('utf-8'))
                 error_text = f"\n\n**Ошибка:** {http_error_content['error']['message']}"
@@ -444,6 +549,16 @@ class CharlieChatApp(App):
 
             entry["content"] += error_text
             bubble.append_text(error_text)
+            await asyncio.to_thread(self._store.complete_entry, dialog_id, entry)
+        finally:
+            turn_span.set_attributes(
+                content_chars=len(accumulated),
+                tools=len(tool_runs),
+                ui_apply_calls=ui_apply["calls"],
+                ui_apply_ms=round(ui_apply["ms"], 3),
+                ui_apply_max_ms=round(ui_apply["max_ms"], 3),
+            )
+            turn_span.end()
 
     def _ensure_active_dialog(self) -> str:
         active_id = self._store.active_dialog_id
@@ -457,10 +572,29 @@ class CharlieChatApp(App):
         sidebar = self.query_one("#sidebar", Container)
         sidebar.toggle_class("collapsed")
 
+    def action_cancel_tools(self) -> None:
+        if self._busy:
+            self.assistant.cancel_tools()
+
     def action_new_dialog(self) -> None:
         dialog = self._create_dialog()
         self._seed_dialog(dialog_id=dialog["id"])
 
+    def action_load_older(self) -> None:
+        active_id = self._store.active_dialog_id
+        if not active_id:
+            return
+        older = [entry for entry in self._store.load_older_entries(active_id) if entry.get("build_to_ui", True)]
+        if not older:
+            return
+        first = self._chat_scroll.children[0] if self._chat_scroll.children else None
+        for entry in older:
+            if first is None:
+                self._chat_scroll.mount(self._build_bubble(entry))
+            else:
+                self._chat_scroll.mount(self._build_bubble(entry), before=first)
+        self._chat_scroll.scroll_home(animate=False)
+
     def on_dialog_sidebar_dialog_selected(self, event: DialogSidebar.DialogSelected) -> None:
         self._set_active_dialog(event.dialog_id)
 
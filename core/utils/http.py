@@ -0,0 +1,29 @@
+import threading
+
+from urllib.request import Request, urlopen
+
+from core.exeptions import RequestCancelledError
+
+
+def read_url(
+    request: Request,
+    *,
+    timeout: float,
+    cancel_event: threading.Event | None = None,
+    chunk_size: int = 64 * 1024,
+) -> bytes:
+    if cancel_event is not None and cancel_event.is_set():
+        raise RequestCancelledError(request.full_url)
+
+    chunks: list[bytes] = []
+    with urlopen(request, timeout=timeout) as resp:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise RequestCancelledError(request.full_url)
+            chunk = resp.read(chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+__all__ = ["read_url"]